@@ -0,0 +1,268 @@
+"""
+Interface en ligne de commande non interactive du CRM Epic Events.
+
+Les listes sont écrites sur la sortie standard ( JSON lines ou CSV ), sans affichage rich, pour être utilisées
+par des scripts. L'utilisateur est celui du token enregistré par la dernière connexion à l'application.
+
+Exemples ( depuis la racine du projet ) :
+    python -m app.cli events list --no-support --format jsonl
+    python -m app.cli contracts list --mine --not-payed --format csv
+    python -m app.cli contracts export --output contracts.csv.gz
+    python -m app.cli customers import --input customers.csv --chunk-size 500
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from sqlalchemy import false
+
+from app.controllers.authentication import AuthenticationManager
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee
+from app.models.event import Event
+from app.permissions.permissions import Permissions
+from app.permissions.scopes import Scopes
+from app.utils.bulk_import import BulkImporter, open_input
+from app.utils.export import FORMATS, export_model, model_columns, model_select, stream_chunks, write_chunks
+from app.utils.logger_config import LoggerConfig
+
+RESOURCES = {"customers": Customer, "contracts": Contract, "events": Event}
+# droit de création de chaque ressource, vérifié avant un import
+CAN_CREATE = {
+    "customers": Permissions.can_create_delete_customer,
+    "contracts": Permissions.can_create_delete_contract,
+    "events": Permissions.can_create_delete_event,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construit l'analyseur des arguments :
+    `<ressource> list [filtres] [--format jsonl|csv]`, `<ressource> export --output fichier [--format csv|jsonl]`
+    et `<ressource> import --input fichier [--chunk-size N]`.
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur des arguments.
+    """
+
+    parser = argparse.ArgumentParser(prog="epic-events", description="CRM Epic Events en ligne de commande.")
+    resources = parser.add_subparsers(dest="resource", required=True)
+
+    for name, description, filters in (
+        ("customers", "Clients", []),
+        ("contracts", "Contrats", [("--not-signed", "contrats non signés"), ("--not-payed", "contrats non payés")]),
+        ("events", "Évènements", [("--no-support", "évènements sans support")]),
+    ):
+        commands = resources.add_parser(name, help=description).add_subparsers(dest="command", required=True)
+        command = commands.add_parser("list", help=f"Liste des {description.lower()}")
+        command.add_argument("--mine", action="store_true", help="seulement les éléments de votre périmètre")
+        for flag, help_text in filters:
+            command.add_argument(flag, action="store_true", help=help_text)
+        command.add_argument("--format", choices=FORMATS, default="jsonl", help="format de sortie ( jsonl )")
+
+        command = commands.add_parser("export", help=f"Export des {description.lower()} de votre périmètre")
+        command.add_argument("--output", required=True, help="fichier d'export ( compressé en gzip si .gz )")
+        command.add_argument("--format", choices=FORMATS, default="csv", help="format du fichier ( csv )")
+        command.add_argument("--gzip", action="store_true", default=None, help="compresse le fichier en gzip")
+
+        command = commands.add_parser("import", help=f"Import des {description.lower()} depuis un fichier CSV")
+        command.add_argument("--input", required=True, help="fichier CSV ( décompressé si .gz )")
+        command.add_argument("--chunk-size", type=int, help="nombre de lignes insérées par lot ( IMPORT_CHUNK_SIZE )")
+
+    return parser
+
+
+def build_statement(employee: Employee, args: argparse.Namespace):
+    """
+    Construit la requête d'une liste, avec les mêmes critères que les listes des menus.
+
+    - Sans --mine : tous les éléments, comme « Liste des clients / contrats / évènements ».
+    - Avec --mine : les éléments du périmètre de l'utilisateur ( Scopes ), comme « Liste de vos ... ».
+
+    Args:
+        employee (Employee): L'employé authentifié.
+        args (argparse.Namespace): Les arguments de la commande.
+
+    Returns:
+        Select: La requête des colonnes du modèle, triée par Id.
+    """
+
+    model = RESOURCES[args.resource]
+    criteria = []
+
+    if args.mine:
+        criteria.append(Scopes(employee.RoleRel, employee.Id).criterion(model))
+
+    if model is Contract:
+        if args.not_signed:
+            criteria.append(Contract.ContractSigned == false())
+        if args.not_payed:
+            criteria.append(Contract.AmountOutstanding != 0)
+    elif model is Event and args.no_support:
+        criteria.append(Event.EmployeeSupportId.is_(None))
+
+    return model_select(model, *criteria)
+
+
+def list_rows(session, employee: Employee, args: argparse.Namespace, stream) -> int:
+    """
+    Écrit une liste sur un flux au fur et à mesure de sa lecture ( curseur côté serveur, lots de lignes ).
+
+    Args:
+        session (Session): La session SQLAlchemy.
+        employee (Employee): L'employé authentifié.
+        args (argparse.Namespace): Les arguments de la commande.
+        stream (TextIO): Le flux de sortie.
+
+    Returns:
+        int: Le nombre de lignes écrites.
+    """
+
+    chunks = stream_chunks(session, build_statement(employee, args))
+    return write_chunks(chunks, stream, model_columns(RESOURCES[args.resource]), args.format)
+
+
+def export_rows(session, employee: Employee, args: argparse.Namespace) -> int:
+    """
+    Exporte dans un fichier les éléments du périmètre de l'utilisateur.
+
+    Args:
+        session (Session): La session SQLAlchemy.
+        employee (Employee): L'employé authentifié.
+        args (argparse.Namespace): Les arguments de la commande.
+
+    Returns:
+        int: Le nombre de lignes exportées.
+    """
+
+    scopes = Scopes(employee.RoleRel, employee.Id)
+    return export_model(session, RESOURCES[args.resource], scopes, args.output, args.format, args.gzip)
+
+
+def import_rows(session, employee: Employee, args: argparse.Namespace, stderr) -> int:
+    """
+    Importe un fichier CSV, les lignes rejetées étant écrites sur le flux d'erreur avec leur numéro de ligne.
+
+    Les règles des menus s'appliquent ( voir BulkImporter ) : les clients et contrats référencés doivent être dans
+    le périmètre de l'utilisateur et les clients d'un commercial lui sont toujours affectés. Pour les autres rôles,
+    les clients sans commercial sont affectés à l'utilisateur.
+
+    Args:
+        session (Session): La session SQLAlchemy.
+        employee (Employee): L'employé authentifié.
+        args (argparse.Namespace): Les arguments de la commande.
+        stderr (TextIO): Le flux des erreurs.
+
+    Returns:
+        int: Le nombre de lignes insérées.
+
+    Raises:
+        PermissionError: Si l'utilisateur n'a pas le droit de créer ces éléments.
+    """
+
+    if not CAN_CREATE[args.resource](employee.RoleRel):
+        raise PermissionError(f"Vous n'avez pas le droit de créer des {args.resource}.")
+
+    scopes = Scopes(employee.RoleRel, employee.Id)
+    defaults, overrides = None, None
+    if args.resource == "customers":
+        if scopes.permissions.role_name(employee.RoleRel) == "Commercial":
+            overrides = {"CommercialId": employee.Id}
+        else:
+            defaults = {"CommercialId": employee.Id}
+    importer = BulkImporter(
+        session, RESOURCES[args.resource], args.chunk_size, defaults, scopes=scopes, overrides=overrides
+    )
+    with open_input(args.input) as stream:
+        report = importer.run(stream)
+
+    for line, message in report.errors:
+        print(f"ligne {line} : {message}", file=stderr)
+    print(f"{report.inserted} lignes importées, {len(report.errors)} lignes rejetées.", file=stderr)
+    return report.inserted
+
+
+def authenticated_employee(session, auth_manager: AuthenticationManager) -> Optional[Employee]:
+    """
+    Retourne l'employé du token enregistré, None si le token est absent, expiré ou si l'employé n'existe plus.
+
+    Args:
+        session (Session): La session SQLAlchemy.
+        auth_manager (AuthenticationManager): Le gestionnaire d'authentification.
+
+    Returns:
+        Optional[Employee]: L'employé authentifié.
+    """
+
+    payload = auth_manager.verify_and_decode_jwt_token()
+    if not payload:
+        return None
+    return session.get(Employee, payload["user_id"])
+
+
+def run(argv: Optional[List[str]] = None, stdout=None) -> int:
+    """
+    Exécute une commande.
+
+    Args:
+        argv (List[str], optional): Les arguments ( par défaut, ceux de la ligne de commande ).
+        stdout (TextIO, optional): Le flux de sortie ( par défaut, la sortie standard ).
+
+    Returns:
+        int: Le code de sortie, 0 si la commande a réussi.
+    """
+
+    args = build_parser().parse_args(argv)
+    stdout = stdout if stdout is not None else sys.stdout
+
+    logger = LoggerConfig().get_logger()
+    auth_manager = AuthenticationManager(None, logger)
+
+    # le token est vérifié avant toute connexion à la base
+    if not auth_manager.verify_and_decode_jwt_token():
+        print("Token absent ou expiré : connectez-vous avec l'application ( python main.py ).", file=sys.stderr)
+        return 1
+
+    session = DatabaseConfig(logger).db_session_local()
+    try:
+        employee = authenticated_employee(session, auth_manager)
+        if employee is None:
+            print("Utilisateur du token introuvable.", file=sys.stderr)
+            return 1
+        # lu avant l'import : le commit des lots expire l'employé, détaché à la fermeture de la session
+        email = employee.Email
+
+        if args.command == "export":
+            count = export_rows(session, employee, args)
+        elif args.command == "import":
+            count = import_rows(session, employee, args, sys.stderr)
+        else:
+            count = list_rows(session, employee, args, stdout)
+            stdout.flush()
+    except BrokenPipeError:
+        # sortie fermée par le lecteur ( head ... ) : les écritures restantes sont ignorées
+        if stdout is sys.stdout:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (PermissionError, ValueError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+
+    logger.info(f"CLI {args.resource} {args.command} : {count} lignes ({email})")
+    return 0
+
+
+def main() -> None:
+    """Point d'entrée de la commande `epic-events`."""
+
+    sys.exit(run())
+
+
+if __name__ == "__main__":
+    main()
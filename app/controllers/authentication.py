@@ -1,14 +1,15 @@
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple, Dict
 
-import jwt
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 
-from app.models.employee import Employee
+from app.models.employee import Employee, bcrypt_rounds, hash_password, hash_rounds
 from app.models.role import Role
-from app.utils.token_manage_json import delete_token, load_token_from_json, save_token_to_json
+from app.utils.metrics import LOGIN_ATTEMPTS, LOGIN_DURATION, TOKEN_VALIDATIONS
+from app.utils.token_manage_json import delete_token, file_path_global, load_token_from_json, save_token_to_json
 
 
 class AuthenticationManager:
@@ -20,6 +21,9 @@ class AuthenticationManager:
         logger: Objet logger pour enregistrer les messages de log.
         SECRET_KEY (str): Clé secrète pour signer les tokens JWT.
         TOKEN_EXPIRY (int): Durée de validité des tokens JWT en minutes.
+        token_file_path (str): Chemin du fichier JSON contenant le token.
+        token_cache (dict): Dernier token validé : contenu décodé, date d'expiration et signature du fichier
+            ( date de modification, taille ). None si aucun token n'est validé.
     """
 
     def __init__(self, view, logger):
@@ -28,6 +32,8 @@ class AuthenticationManager:
         self.SECRET_KEY = os.environ.get("SECRET_KEY")
         self.TOKEN_EXPIRY = int(os.environ.get("TOKEN_EXPIRY"))
         self.logger = logger
+        self.token_file_path = file_path_global
+        self.token_cache = None
 
     def authenticate(
         self, email: str, password: str, session: Session
@@ -36,6 +42,9 @@ class AuthenticationManager:
         Authentifie un utilisateur en vérifiant les informations d'identification dans la base de données et
         récupère le rôle associé.
 
+        Si le hash du mot de passe a été calculé avec un autre coût que celui de la configuration ( BCRYPT_ROUNDS ),
+        le mot de passe est hashé à nouveau avec le coût configuré et enregistré.
+
         Args:
             email (str): Adresse e-mail de l'utilisateur.
             password (str): Mot de passe de l'utilisateur.
@@ -48,19 +57,46 @@ class AuthenticationManager:
         Exceptions:
             Affiche un message d'erreur en cas d'exception et retourne (False, None, None).
         """
+        result = "error"
+        start = time.perf_counter()
         try:
             self.view.display_green_message("Authentification en cours ...")
             with session.begin():
                 employee = session.query(Employee).filter_by(Email=email).first()
                 if employee and employee.verify_password(password):
+                    if employee.needs_rehash():
+                        self.rehash_password(employee, password)
                     role = session.query(Role).filter_by(Id=employee.RoleId).one()
+                    result = "success"
                     return True, employee, role
                 else:
+                    result = "failure"
                     return False, None, None
         except Exception as e:
             self.view.display_red_message(f"Une erreur s'est produite : {e}")
             session.close()
             return False, None, None
+        finally:
+            LOGIN_ATTEMPTS.inc(result)
+            LOGIN_DURATION.observe(time.perf_counter() - start)
+
+    def rehash_password(self, employee: Employee, password: str) -> None:
+        """
+        Hashe à nouveau le mot de passe d'un employé authentifié avec le coût configuré.
+
+        Le hash est affecté sans repasser par les règles du mot de passe : un ancien mot de passe qui ne les
+        respecte pas reste valide. Il est enregistré par la transaction de l'authentification.
+
+        Args:
+            employee (Employee): L'employé authentifié.
+            password (str): Le mot de passe vérifié.
+        """
+
+        old_rounds = hash_rounds(employee.PasswordHash)
+        employee.PasswordHash = hash_password(password)
+        self.logger.info(
+            f"Mot de passe de {employee.Email} hashé à nouveau ( coût {old_rounds} -> {bcrypt_rounds()} )"
+        )
 
     def generate_jwt_token(self, user_id: int) -> None:
         """
@@ -68,7 +104,7 @@ class AuthenticationManager:
 
         Cette méthode crée un jeton JWT avec l'ID de l'utilisateur et une date
         d'expiration. Le jeton est ensuite sauvegardé dans un fichier JSON à l'aide
-        de la fonction save_token_to_json.
+        de la fonction save_token_to_json, et mis en cache comme jeton validé.
 
         Args:
             user_id (int): L'ID de l'utilisateur.
@@ -77,33 +113,86 @@ class AuthenticationManager:
             None
         """
 
+        import jwt  # import différé : chargé à la première connexion et non au lancement
+
         expiration_time = datetime.now() + timedelta(minutes=self.TOKEN_EXPIRY)
         payload = {"user_id": user_id, "exp": expiration_time}
         token = jwt.encode(payload, self.SECRET_KEY, algorithm="HS256")
-        save_token_to_json(token)
+        save_token_to_json(token, self.token_file_path)
+        self.cache_token(jwt.decode(token, self.SECRET_KEY, algorithms=["HS256"]))
+
+    def token_file_signature(self) -> Optional[Tuple[int, int]]:
+        """
+        Retourne la signature du fichier du token ( date de modification en ns, taille ).
+
+        Returns:
+            Optional[Tuple[int, int]]: La signature du fichier, None si le fichier n'existe pas.
+        """
+
+        try:
+            stat = os.stat(self.token_file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def cache_token(self, decoded_payload: Dict) -> None:
+        """
+        Met en cache un token validé avec sa date d'expiration et la signature actuelle du fichier.
+
+        Args:
+            decoded_payload (Dict): Le contenu décodé du token.
+        """
+
+        self.token_cache = {
+            "payload": decoded_payload,
+            "expiry": datetime.fromtimestamp(decoded_payload["exp"], tz=timezone.utc).replace(tzinfo=None),
+            "signature": self.token_file_signature(),
+        }
 
     def verify_and_decode_jwt_token(self) -> Optional[Dict]:
         """
         Vérifie et décode un jeton JWT.
         Efface le jeton s'il n'est plus valide.
 
+        Le jeton n'est relu et décodé que si le fichier a été modifié depuis la dernière validation ( nouvelle
+        connexion, déconnexion ) ou si la date d'expiration est dépassée : sinon la vérification se limite à
+        une comparaison de dates et à la lecture des attributs du fichier.
+
         Returns:
             Optional[Dict]: Le contenu décodé du jeton JWT s'il est valide et non expiré, sinon None.
         """
 
+        cache = self.token_cache
+        if (
+            cache is not None
+            and datetime.now() <= cache["expiry"]
+            and cache["signature"] == self.token_file_signature()
+        ):
+            TOKEN_VALIDATIONS.inc("cached")
+            return cache["payload"]
+
+        self.token_cache = None
+
+        import jwt  # import différé : chargé à la première connexion et non au lancement
+
         try:
-            token = load_token_from_json()
+            token = load_token_from_json(self.token_file_path)
             decoded_payload = jwt.decode(token, self.SECRET_KEY, algorithms=["HS256"])
 
             if datetime.now() > datetime.fromtimestamp(decoded_payload["exp"], tz=timezone.utc).replace(tzinfo=None):
-                delete_token()
+                TOKEN_VALIDATIONS.inc("expired")
+                delete_token(self.token_file_path)
                 return None
 
+            self.cache_token(decoded_payload)
+            TOKEN_VALIDATIONS.inc("valid")
             return decoded_payload
 
         except jwt.ExpiredSignatureError:
-            delete_token()
+            TOKEN_VALIDATIONS.inc("expired")
+            delete_token(self.token_file_path)
             return None
         except jwt.InvalidTokenError:
-            delete_token()
+            TOKEN_VALIDATIONS.inc("invalid")
+            delete_token(self.token_file_path)
             return None
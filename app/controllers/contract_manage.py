@@ -1,3 +1,4 @@
+from functools import partial
 from typing import List, Optional
 
 from rich.console import Console
@@ -6,10 +7,11 @@ from rich.table import Table
 from app.models.contract import Contract
 from app.models.customer import Customer
 from app.permissions.permissions import Permissions
+from app.permissions.scopes import Scopes
 from app.utils.sentry_logger import SentryLogger
 from app.views.views import View
 
-from .utils_manage import UtilsManage
+from .utils_manage import OperResult, UtilsManage
 
 
 class ContractManage:
@@ -27,6 +29,7 @@ class ContractManage:
         self.user_connected_id = employee.Id
         self.sentry = SentryLogger()
         self.utils = UtilsManage(self.employee)
+        self.scopes = Scopes(role, self.user_connected_id)
 
     def get_permissions_contracts(self) -> List[Contract]:
         """
@@ -40,23 +43,9 @@ class ContractManage:
             List[Contract]: Une liste de contrats autorisés. La liste est vide si aucun contrat n'est autorisé.
         """
 
-        if self.permissions.all_contract(self.role):
-            contracts = self.utils.filter(self.session, "All", None, Contract)
+        return self.scopes.query(self.session, Contract).options(*self.utils.load_options(Contract)).all()
 
-        elif self.permissions.role_name(self.role) == "Commercial":
-            contracts = (
-                self.session.query(Contract)
-                .join(Customer, Contract.CustomerId == Customer.Id)
-                .filter(Customer.CommercialId == self.user_connected_id)
-                .all()
-            )
-
-        else:
-            contracts = []
-
-        return contracts
-
-    def get_permissions_customers(self) -> Optional[List[Customer]]:
+    def get_permissions_customers(self) -> List[Customer]:
         """
         Récupère la liste des clients autorisés en fonction des permissions de l'utilisateur connecté.
 
@@ -65,39 +54,23 @@ class ContractManage:
         tandis que les utilisateurs avec des permissions globales voient tous les clients.
 
         Returns:
-            Optional[List[Customer]]: Une liste de clients autorisés ou None si aucun client n'est autorisé.
+            List[Customer]: Une liste de clients autorisés. La liste est vide si aucun client n'est autorisé.
         """
 
-        if self.permissions.all_customer(self.role):
-            customers = self.utils.filter(self.session, "All", None, Customer)
-
-        elif self.permissions.role_name(self.role) == "Commercial":
-            customers = (
-                self.session.query(Customer)
-                .join(Contract, Customer.CommercialId == Contract.CustomerId)
-                .filter(Customer.CommercialId == self.user_connected_id)
-                .all()
-            )
-
-        else:
-            return None
-
-        return customers
+        return self.scopes.query(self.session, Customer).all()
 
     def list(self) -> None:
         """
         Affiche une liste de tous les contrats.
 
-        Cette méthode récupère tous les contrats en utilisant la méthode `filter` avec les paramètres appropriés,
-        crée un tableau avec les événements récupérés en utilisant `table_event_create`, et affiche ce tableau via
-        la vue.
+        Cette méthode récupère les contrats page par page en utilisant la méthode `filter` avec les paramètres
+        appropriés, et les affiche dans le pager de la vue.
 
         Returns:
             None
         """
-        contracts = self.utils.filter(self.session, "All", None, Contract)
-        table = self.utils.table_create("contract", contracts)
-        self.view.display_table(table, "Liste des Contrats")
+        fetch_page = partial(self.utils.filter, self.session, "All", None, Contract)
+        self.utils.display_list("contract", fetch_page, "Liste des Contrats")
 
     def list_yours_contracts(self):
 
@@ -110,6 +83,7 @@ class ContractManage:
 
         contracts_not_signed = (
             self.session.query(Contract)
+            .options(*self.utils.load_options(Contract))
             .join(Customer, Contract.CustomerId == Customer.Id)
             .filter(Customer.CommercialId == self.user_connected_id)
             .filter(Contract.ContractSigned == False)
@@ -122,6 +96,7 @@ class ContractManage:
     def list_yours_contracts_not_payed(self):
         contracts_not_payed = (
             self.session.query(Contract)
+            .options(*self.utils.load_options(Contract))
             .join(Customer, Contract.CustomerId == Customer.Id)
             .filter(Customer.CommercialId == self.user_connected_id)
             .filter(Contract.AmountOutstanding != 0)
@@ -201,7 +176,7 @@ class ContractManage:
             None
         """
 
-        contracts = self.get_permissions_contracts()
+        contracts = self.scopes.query(self.session, Contract)
 
         customers = self.get_permissions_customers()
         if not customers:
@@ -210,7 +185,7 @@ class ContractManage:
 
         self.view.display_title_panel_color_fit("Modification d'un contrat", "yellow")
 
-        if not contracts:
+        if not self.utils.has_rows(self.session, contracts):
             self.view.display_red_message("Vous n'avez aucuns contrats à modifier !!!")
             return
 
@@ -223,28 +198,31 @@ class ContractManage:
         if not self.utils.confirm_table_recap("contract", contract, "Modification", "yellow"):
             return
 
-        self.view.display_title_panel_color_fit("Modification d'un contrat", "yellow", True)
+        # nouvelle saisie si l'élément a été modifié par un autre utilisateur entre-temps
+        while True:
+            self.view.display_title_panel_color_fit("Modification d'un contrat", "yellow", True)
 
-        contract.Title = self.view.return_choice("Titre", False, f"{contract.Title}")
-        contract.Amount = self.validation_amount("Montant du contrat", "amount", contract.Amount)
-        contract.AmountOutstanding = self.validation_amount(
-            "Montant restant du", "amount_outstanding", contract.AmountOutstanding
-        )
+            contract.Title = self.view.return_choice("Titre", False, f"{contract.Title}")
+            contract.Amount = self.validation_amount("Montant du contrat", "amount", contract.Amount)
+            contract.AmountOutstanding = self.validation_amount(
+                "Montant restant du", "amount_outstanding", contract.AmountOutstanding
+            )
 
-        contract.ContractSigned = self.utils.str_to_bool(
-            self.view.return_choice(
-                "Contrat signé", False, f"{'oui' if contract.ContractSigned else 'non'}", ("oui", "non")
+            contract.ContractSigned = self.utils.str_to_bool(
+                self.view.return_choice(
+                    "Contrat signé", False, f"{'oui' if contract.ContractSigned else 'non'}", ("oui", "non")
+                )
             )
-        )
 
-        if self.permissions.role_name(self.role) == "Gestion":
+            if self.permissions.role_name(self.role) == "Gestion":
 
-            # validation du client lié au contrat
-            contract.CustomerId = self.valid_customer(customers, contract.CustomerId)
-            if not contract.CustomerId:
-                return
+                # validation du client lié au contrat
+                contract.CustomerId = self.valid_customer(customers, contract.CustomerId)
+                if not contract.CustomerId:
+                    return
 
-        self.utils.valid_oper(self.session, "contract", "update", contract)
+            if self.utils.valid_oper(self.session, "contract", "update", contract) is not OperResult.STALE:
+                break
 
     def delete(self) -> None:
         """
@@ -261,7 +239,7 @@ class ContractManage:
             Exception: Pour toute autre erreur lors de la suppression du contrat.
         """
 
-        contracts = self.get_permissions_contracts()
+        contracts = self.scopes.query(self.session, Contract)
 
         self.view.display_title_panel_color_fit("Suppression d'un contrat", "red")
 
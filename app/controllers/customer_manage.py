@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import partial
 from typing import Optional
 
 from rich.console import Console
@@ -7,7 +8,7 @@ from app.models.customer import Customer
 from app.permissions.permissions import Permissions
 from app.views.views import View
 
-from .utils_manage import UtilsManage
+from .utils_manage import OperResult, UtilsManage
 
 
 class CustomerManage:
@@ -29,15 +30,14 @@ class CustomerManage:
         """
         Affiche la liste de tous les clients.
 
-        Charge tous les clients depuis la base de données et les affiche dans un tableau.
+        Charge les clients depuis la base de données page par page et les affiche dans le pager de la vue.
 
         Returns:
             None
         """
 
-        customers = self.utils.filter(self.session, "All", None, Customer)
-        table = self.utils.table_create("customer", customers)
-        self.view.display_table(table, "Liste des Clients")
+        fetch_page = partial(self.utils.filter, self.session, "All", None, Customer)
+        self.utils.display_list("customer", fetch_page, "Liste des Clients")
 
     def list_yours_customers(self):
         """
@@ -115,7 +115,7 @@ class CustomerManage:
         """
         self.view.display_title_panel_color_fit("Modification d'un client", "yellow")
 
-        customers = self.employee.CustomersRel
+        customers = self.session.query(Customer).filter(Customer.CommercialId == self.user_connected_id)
 
         # Validation du client à modifier par son Id
         customer = self.utils.valid_id(self.session, Customer, "client à modifier", customers)
@@ -126,15 +126,18 @@ class CustomerManage:
         if not self.utils.confirm_table_recap("customer", customer, "Modification", "yellow"):
             return
 
-        self.view.display_title_panel_color_fit("Modification d'un client", "yellow", True)
-        customer.FirstName = self.view.return_choice("Prénom", False, f"{customer.FirstName}")
-        customer.LastName = self.view.return_choice("Nom", False, f"{customer.LastName}")
-        customer.Email = self.view.return_choice("Email", False, f"{customer.Email}")
-        customer.PhoneNumber = self.view.return_choice("Numéro de Téléphone", False, f"{customer.PhoneNumber}")
-        customer.Company = self.view.return_choice("Entreprise", False, f"{customer.Company}")
-        customer.DateLastUpdate = datetime.now()
+        # nouvelle saisie si l'élément a été modifié par un autre utilisateur entre-temps
+        while True:
+            self.view.display_title_panel_color_fit("Modification d'un client", "yellow", True)
+            customer.FirstName = self.view.return_choice("Prénom", False, f"{customer.FirstName}")
+            customer.LastName = self.view.return_choice("Nom", False, f"{customer.LastName}")
+            customer.Email = self.view.return_choice("Email", False, f"{customer.Email}")
+            customer.PhoneNumber = self.view.return_choice("Numéro de Téléphone", False, f"{customer.PhoneNumber}")
+            customer.Company = self.view.return_choice("Entreprise", False, f"{customer.Company}")
+            customer.DateLastUpdate = datetime.now()
 
-        self.utils.valid_oper(self.session, "customer", "update", customer)
+            if self.utils.valid_oper(self.session, "customer", "update", customer) is not OperResult.STALE:
+                break
 
     def delete(self) -> None:
         """
@@ -154,7 +157,7 @@ class CustomerManage:
 
         self.view.display_title_panel_color_fit("Suppression d'un client", "red")
 
-        customers = self.employee.CustomersRel
+        customers = self.session.query(Customer).filter(Customer.CommercialId == self.user_connected_id)
 
         # Validation du client à supprimer par son Id
         customer = self.utils.valid_id(self.session, Customer, "client à supprimer", customers)
@@ -1,4 +1,6 @@
+from functools import partial
 from typing import Optional
+
 from rich.console import Console
 from rich.table import Table
 
@@ -26,9 +28,8 @@ class EmployeeManage:
         self.utils = UtilsManage(self.employee)
 
     def list(self):
-        employees = self.utils.filter(self.session, "All", None, Employee)
-        table = self.utils.table_create("employee", employees)
-        self.view.display_table(table, "Liste des Employés")
+        fetch_page = partial(self.utils.filter, self.session, "All", None, Employee)
+        self.utils.display_list("employee", fetch_page, "Liste des Employés")
 
     def create(self) -> None:
         """
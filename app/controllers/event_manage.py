@@ -1,17 +1,18 @@
+from functools import partial
 from typing import List, Optional
 
 from rich.console import Console
 from rich.table import Table
 
 from app.models.contract import Contract
-from app.models.customer import Customer
 from app.models.employee import Employee
 from app.models.event import Event
 from app.models.role import Role
 from app.permissions.permissions import Permissions
+from app.permissions.scopes import Scopes
 from app.views.views import View
 
-from .utils_manage import UtilsManage
+from .utils_manage import OperResult, UtilsManage
 
 
 class EventManage:
@@ -28,6 +29,7 @@ class EventManage:
         self.role = role
         self.user_connected_id = employee.Id
         self.utils = UtilsManage(self.employee)
+        self.scopes = Scopes(role, self.user_connected_id)
 
     def get_permissions_events(self) -> List[Event]:
         """
@@ -37,25 +39,7 @@ class EventManage:
             List[Event]: Liste des événements autorisés.
         """
 
-        if self.permissions.all_event(self.role):
-            events = self.utils.filter(self.session, "All", None, Event)
-
-        elif self.permissions.role_name(self.role) == "Commercial":
-            events = (
-                self.session.query(Event)
-                .join(Contract, Event.ContractId == Contract.Id)
-                .join(Customer, Contract.CustomerId == Customer.Id)
-                .filter(Customer.CommercialId == self.user_connected_id)
-                .all()
-            )
-
-        elif self.permissions.role_name(self.role) == "Support":
-             events = self.session.query(Event).filter(Event.EmployeeSupportRel.has(Id=self.user_connected_id)).all()
-
-        else:
-            events = []
-
-        return events
+        return self.scopes.query(self.session, Event).options(*self.utils.load_options(Event)).all()
 
     def get_permissions_contracts_signed(self) -> List[Contract]:
         """
@@ -65,51 +49,33 @@ class EventManage:
             List[Contract]: Liste des contrats signés autorisés.
         """
 
-        if self.permissions.all_contract(self.role):
-            contracts_signed = self.utils.filter(self.session, "ContractSigned", True, Contract)
-
-        elif self.permissions.role_name(self.role) == "Commercial":
-            contracts_signed = (
-                self.session.query(Contract)
-                .join(Customer, Contract.CustomerId == Customer.Id)
-                .filter(Customer.CommercialId == self.user_connected_id)
-                .filter(Contract.ContractSigned == True)
-                .all()
-            )
-        else:
-            contracts_signed = []
-
-        return contracts_signed
+        return self.scopes.query(self.session, Contract).filter(Contract.ContractSigned == True).all()
 
     def list(self) -> None:
         """
         Affiche une liste de tous les événements.
 
-        Cette méthode récupère tous les événements en utilisant la méthode `filter` avec les paramètres appropriés,
-        crée un tableau avec les événements récupérés en utilisant `table_event_create`, et affiche ce tableau via
-        la vue.
+        Cette méthode récupère les événements page par page en utilisant la méthode `filter` avec les paramètres
+        appropriés, et les affiche dans le pager de la vue.
 
         Returns:
             None
         """
-        events = self.utils.filter(self.session, "All", None, Event)
-        table = self.utils.table_create("event", events)
-        self.view.display_table(table, "Liste des Evènements")
+        fetch_page = partial(self.utils.filter, self.session, "All", None, Event)
+        self.utils.display_list("event", fetch_page, "Liste des Evènements")
 
     def list_no_support(self) -> None:
         """
         Affiche une liste des événements sans support.
 
-        Cette méthode récupère tous les événements qui n'ont pas de support en utilisant la méthode `filter` avec les
-        paramètres appropriés, crée un tableau avec les événements récupérés en utilisant `table_event_create`, et
-        affiche ce tableau via la vue.
+        Cette méthode récupère page par page les événements qui n'ont pas de support en utilisant la méthode `filter`
+        avec les paramètres appropriés, et les affiche dans le pager de la vue.
 
         Returns:
             None
         """
-        events = self.utils.filter(self.session, "EmployeeSupportId", None, Event)
-        table = self.utils.table_create("event", events)
-        self.view.display_table(table, "Liste des Evènements sans support")
+        fetch_page = partial(self.utils.filter, self.session, "EmployeeSupportId", None, Event)
+        self.utils.display_list("event", fetch_page, "Liste des Evènements sans support")
 
     def list_yours_events(self) -> None:
 
@@ -196,7 +162,7 @@ class EventManage:
 
         Cette méthode permet à l'utilisateur de modifier les détails d'un évènement existant.
         Elle effectue les opérations suivantes :
-        1. Récupère les évènements autorisés à modifier et les contrats signés.
+        1. Construit la requête des évènements autorisés à modifier.
         2. Vérifie s'il y a des évènements à modifier.
         3. Valide l'existence de l'évènement à modifier et demande confirmation à l'utilisateur.
         4. Affiche les détails de l'évènement à modifier.
@@ -209,10 +175,9 @@ class EventManage:
             Exception: Pour toute autre erreur rencontrée lors de la modification de l'évènement.
         """
 
-        events = self.get_permissions_events()
-        contracts_signed = self.get_permissions_contracts_signed()
+        events = self.scopes.query(self.session, Event)
 
-        if not events:
+        if not self.utils.has_rows(self.session, events):
             self.view.display_red_message("Vous n'avez aucuns évènements à modifier !!!")
             return
 
@@ -227,31 +192,35 @@ class EventManage:
         if not self.utils.confirm_table_recap("event", event, "Modification", "yellow"):
             return
 
-        self.view.display_title_panel_color_fit("Modification d'un évènement", "yellow", True)
+        # nouvelle saisie si l'élément a été modifié par un autre utilisateur entre-temps
+        while True:
+            self.view.display_title_panel_color_fit("Modification d'un évènement", "yellow", True)
 
-        event.Title = self.view.return_choice("Entrez le Titre de l'évènement", False, event.Title)
-        event.Notes = self.view.return_choice("Description", False, event.Notes)
-        event.Location = self.view.return_choice("Lieu", False, event.Location)
+            event.Title = self.view.return_choice("Entrez le Titre de l'évènement", False, event.Title)
+            event.Notes = self.view.return_choice("Description", False, event.Notes)
+            event.Location = self.view.return_choice("Lieu", False, event.Location)
 
-        # validation des places
-        event.Attendees = self.validation_attendees("Attendees", "Nb de places", event.Attendees)
+            # validation des places
+            event.Attendees = self.validation_attendees("Attendees", "Nb de places", event.Attendees)
 
-        # validation des dates
-        event.DateStart = self.validation_date("date_start", "Date de début au format jj-mm-aaaa", event.DateStart)
-        event.DateEnd = self.validation_date("date_end", "Date de fin au format jj-mm-aaaa", event.DateEnd)
+            # validation des dates
+            event.DateStart = self.validation_date("date_start", "Date de début au format jj-mm-aaaa", event.DateStart)
+            event.DateEnd = self.validation_date("date_end", "Date de fin au format jj-mm-aaaa", event.DateEnd)
 
-        # validation du contrat
-        if self.permissions.role_name(self.role) != "Support":
-            event.ContractId = self.valid_contract(contracts_signed, event.ContractId)
+            # validation du contrat
+            if self.permissions.role_name(self.role) != "Support":
+                contracts_signed = self.get_permissions_contracts_signed()
+                event.ContractId = self.valid_contract(contracts_signed, event.ContractId)
 
-        # validation du support pour l'évènement
-        if self.permissions.can_access_support(self.role):
+            # validation du support pour l'évènement
+            if self.permissions.can_access_support(self.role):
 
-            role = self.session.query(Role).filter_by(RoleName="Support").one()
-            employees_support = role.EmployeesRel
-            event.EmployeeSupportId = self.valid_list(employees_support, event.EmployeeSupportId)
+                role = self.session.query(Role).filter_by(RoleName="Support").one()
+                employees_support = role.EmployeesRel
+                event.EmployeeSupportId = self.valid_list(employees_support, event.EmployeeSupportId)
 
-        self.utils.valid_oper(self.session, "event", "update", event)
+            if self.utils.valid_oper(self.session, "event", "update", event) is not OperResult.STALE:
+                break
 
     def delete(self) -> None:
         """
@@ -270,11 +239,11 @@ class EventManage:
             Exception: Pour toute autre erreur rencontrée lors de la suppression de l'événement.
         """
 
-        events = self.get_permissions_events()
+        events = self.scopes.query(self.session, Event)
 
         self.view.display_title_panel_color_fit("Suppression d'un évènement", "red")
 
-        if not events:
+        if not self.utils.has_rows(self.session, events):
             self.view.display_red_message("Vous n'avez aucuns évènements à supprimer !!!")
             return
 
@@ -1,4 +1,7 @@
+from contextlib import ExitStack
+
 from app.permissions.permissions import Permissions
+from app.permissions.role_cache import RoleCache
 
 from .contract_manage import ContractManage
 from .customer_manage import CustomerManage
@@ -6,6 +9,9 @@ from .employee_manage import EmployeeManage
 from .event_manage import EventManage
 from .role_manage import RoleManage
 
+# clé du menu principal dans la pile de navigation
+MENU_MAIN = "main"
+
 
 class MenuManage:
     """
@@ -22,9 +28,17 @@ class MenuManage:
         event_manage: L'instance de la gestion des événements.
         role_manage: L'instance de la gestion des rôles.
         permissions: L'instance de la gestion des permissions.
+        role_cache: Le cache des permissions du rôle de l'utilisateur connecté.
+        menus: Les menus déjà composés, par clé de menu ( recomposés si le rôle est modifié ).
+        menus_revision: La révision du rôle pour laquelle les menus ont été composés.
+        user_connected: Le nom de l'utilisateur connecté affiché dans l'entête.
+        query_stats: Les statistiques des requêtes SQL par action de menu ( None si désactivées ).
+        profiler: Le profileur des actions de menu ( None hors mode profilage ).
     """
 
-    def __init__(self, view, verify_jwt, delete_token, session, employee, role, logger):
+    def __init__(
+        self, view, verify_jwt, delete_token, session, employee, role, logger, query_stats=None, profiler=None
+    ):
         self.view = view
         self.session = session
         self.verify_jwt = verify_jwt
@@ -41,6 +55,20 @@ class MenuManage:
         self.show_intro = False
         self.logger = logger
         self.is_logout = False
+        self.user_connected = f"{employee.FirstName} {employee.LastName}"
+        self.role_cache = RoleCache(session, role)
+        self.menu_builders = {
+            MENU_MAIN: self.menu_main,
+            "customer": self.menu_customer,
+            "contract": self.menu_contract,
+            "event": self.menu_event,
+            "employee": self.menu_employee,
+            "role": self.menu_role,
+        }
+        self.menus = {}
+        self.menus_revision = None
+        self.query_stats = query_stats
+        self.profiler = profiler
 
     def run(self) -> None:
         """
@@ -57,38 +85,41 @@ class MenuManage:
         # validation de l'authentification par rapport à l'utilisateur connecté
         if self.user_connected_id == decoded_payload["user_id"]:
             # affiche le menu principal
-            self.menu_main()
+            self.run_menu()
         else:
             self.view.display_red_message("Authentification invalide pour cet utilisateur.")
             self.view.prompt_wait_enter()
             self.logout()
 
-    def menu_main(self) -> None:
+    def menu_main(self) -> list:
         """
         Composition du menu principal selon les permissions de l'utilisateur.
-        """
 
-        self.show_intro = True
-        self.view.clear_screen()
+        Returns:
+            list: Le titre du menu et le dictionnaire des éléments du menu ( nom: clé d'un sous-menu ou méthode ).
+        """
 
         menu_items = ["Menu principal : ", {}]
-        menu_items[1]["Gestion des clients"] = self.menu_customer
-        menu_items[1]["Gestion des contrats"] = self.menu_contract
-        menu_items[1]["Gestion des évènements"] = self.menu_event
+        menu_items[1]["Gestion des clients"] = "customer"
+        menu_items[1]["Gestion des contrats"] = "contract"
+        menu_items[1]["Gestion des évènements"] = "event"
 
         if self.permissions.can_read_employee(self.role):
-            menu_items[1]["Gestion des employés"] = self.menu_employee
+            menu_items[1]["Gestion des employés"] = "employee"
 
         if self.permissions.can_read_role(self.role):
-            menu_items[1]["Gestion des permissions"] = self.menu_role
+            menu_items[1]["Gestion des permissions"] = "role"
 
         menu_items[1]["Deconnexion"] = self.logout
 
-        self.run_menu(menu_items, main=True)
+        return menu_items
 
-    def menu_customer(self) -> None:
+    def menu_customer(self) -> list:
         """
         Composition du menu client selon les permissions de l'utilisateur.
+
+        Returns:
+            list: Le titre du menu et le dictionnaire des éléments du menu.
         """
 
         menu_items = ["Gestion des Clients : ", {}]
@@ -105,11 +136,14 @@ class MenuManage:
             menu_items[1]["Créer un client"] = self.customer_manage.create
             menu_items[1]["Supprimer un client"] = self.customer_manage.delete
 
-        self.run_menu(menu_items, main=False)
+        return menu_items
 
-    def menu_contract(self) -> None:
+    def menu_contract(self) -> list:
         """
         Composition du menu contrat selon les permissions de l'utilisateur..
+
+        Returns:
+            list: Le titre du menu et le dictionnaire des éléments du menu.
         """
 
         menu_items = ["Gestion des Contrats : ", {}]
@@ -128,11 +162,14 @@ class MenuManage:
             menu_items[1]["Créer un contrat"] = self.contract_manage.create
             menu_items[1]["Supprimer un contrat"] = self.contract_manage.delete
 
-        self.run_menu(menu_items, main=False)
+        return menu_items
 
-    def menu_event(self) -> None:
+    def menu_event(self) -> list:
         """
         Composition du menu évènement selon les permissions de l'utilisateur.
+
+        Returns:
+            list: Le titre du menu et le dictionnaire des éléments du menu.
         """
 
         menu_items = ["Gestion des Evènements : ", {}]
@@ -149,11 +186,14 @@ class MenuManage:
             menu_items[1]["Créer un évènement"] = self.event_manage.create
             menu_items[1]["Supprimer un évènement"] = self.event_manage.delete
 
-        self.run_menu(menu_items, main=False)
+        return menu_items
 
-    def menu_employee(self) -> None:
+    def menu_employee(self) -> list:
         """
         Composition du menu employé selon les permissions de l'utilisateur.
+
+        Returns:
+            list: Le titre du menu et le dictionnaire des éléments du menu.
         """
 
         menu_items = ["Gestion des Employés : ", {}]
@@ -168,11 +208,14 @@ class MenuManage:
             menu_items[1]["Créer un employé"] = self.employee_manage.create
             menu_items[1]["Supprimer un employé"] = self.employee_manage.delete
 
-        self.run_menu(menu_items, main=False)
+        return menu_items
 
-    def menu_role(self) -> None:
+    def menu_role(self) -> list:
         """
         Composition du menu role selon les permissions de l'utilisateur.
+
+        Returns:
+            list: Le titre du menu et le dictionnaire des éléments du menu.
         """
 
         menu_items = ["Gestion des Permissions : ", {}]
@@ -187,62 +230,124 @@ class MenuManage:
             menu_items[1]["Créer une permission"] = self.role_manage.create
             menu_items[1]["Supprimer une permission"] = self.role_manage.delete
 
-        self.run_menu(menu_items, main=False)
+        return menu_items
 
-    def run_menu(self, menu_items: list, main: bool) -> None:
+    def get_menu(self, key: str) -> list:
         """
-        Gère l'affichage du menu et le choix de l'utilisateur.
-        Lance la méthode associée à chaque menu.
-        Déconnecte l'utilisateur si la session est expirée.
+        Retourne un menu composé selon les permissions de l'utilisateur.
+
+        Les menus sont composés une seule fois puis réutilisés ; ils sont recomposés si le rôle de l'utilisateur
+        a été modifié ( nouvelle révision du rôle ).
 
         Args:
-            menu_items (list): Une liste contenant le titre du menu et une liste de tuples contenant
-            les éléments du menu sous forme de paires (index, nom_du_menu: méthode).
-            main (bool): Indique si c'est le menu principal ou non.
+            key (str): La clé du menu ( MENU_MAIN, "customer", "contract", "event", "employee" ou "role" ).
+
+        Returns:
+            list: Le titre du menu et le dictionnaire des éléments du menu.
         """
 
-        title = menu_items[0]
+        if self.menus_revision != self.role_cache.revision:
+            self.menus.clear()
+            self.menus_revision = self.role_cache.revision
 
-        # ajoute la ligne de retour selon le menu
-        if not main:
-            menu_items[1]["Retour au menu principal"] = self.menu_main
+        if key not in self.menus:
+            menu_items = self.menu_builders[key]()
 
-        # Crée la liste du menu indexée
-        menu_list = []
-        for index, menu in enumerate(menu_items[1], start=1):
-            menu_list.append((index, menu))
+            # ajoute la ligne de retour selon le menu
+            if key != MENU_MAIN:
+                menu_items[1]["Retour au menu principal"] = MENU_MAIN
 
-        # vérifie la validité de la session
-        while self.verify_jwt():
+            self.menus[key] = menu_items
+
+        return self.menus[key]
+
+    def run_menu(self) -> None:
+        """
+        Gère la navigation dans les menus et le choix de l'utilisateur.
+        Lance la méthode associée à chaque menu.
+        Déconnecte l'utilisateur si la session est expirée.
 
-            self.session.refresh(self.role)
+        La navigation est une boucle sur une pile de menus ( menu principal puis sous-menu ) : aller dans un
+        sous-menu empile sa clé et le retour au menu principal dépile, sans appel récursif. La mémoire utilisée
+        est donc constante quelle que soit la durée de la session.
+        """
+
+        stack = [MENU_MAIN]
+        self.enter_main()
+
+        # vérifie la validité de la session
+        while not self.is_logout and self.verify_jwt():
 
-            user_connected = f"{self.employee.FirstName} {self.employee.LastName}"
-            user_connected_status = self.employee.RoleRel.RoleName
+            # recharge les permissions si le rôle a été modifié
+            if not self.role_cache.check(self.session):
+                self.view.display_red_message("Votre rôle a été supprimé.")
+                self.logout()
+                break
 
             self.view.pass_n_lines()
 
             # affiche l'entete de l'application
             if self.show_intro:
-                self.view.show_intro(user_connected, user_connected_status)
+                self.view.show_intro(self.user_connected, self.role.RoleName)
                 self.show_intro = False
 
+            title, items = self.get_menu(stack[-1])
+
             # analyse du choix utilisateur
-            choice = self.view.display_menu(title, menu_list)
-            if choice.isdigit():
-                choice = int(choice)
-                for menu in menu_list:
-                    if menu[0] == choice:
-                        # Envoie vers la méthode choisie
-                        menu_items[1][menu[1]]()
+            choice = self.view.display_menu(title, list(enumerate(items, start=1)))
+            if not choice.isdigit():
+                self.view.invalid_choice()
+                continue
 
+            choice = int(choice)
+            if not 1 <= choice <= len(items):
+                continue
+
+            name = list(items)[choice - 1]
+            target = items[name]
+
+            if target == MENU_MAIN:
+                del stack[1:]
+                self.enter_main()
+            elif isinstance(target, str):
+                stack.append(target)
             else:
-                self.view.invalid_choice()
+                # Envoie vers la méthode choisie
+                self.dispatch(name, target)
 
-        if not self.verify_jwt() and not self.is_logout:
+        if not self.is_logout:
             self.logger.info(f"Session Expirée: {self.employee.Email}")
             self.logout()
 
+    def enter_main(self) -> None:
+        """Prépare l'affichage du menu principal : efface l'écran et réaffiche l'entête."""
+
+        self.show_intro = True
+        self.view.clear_screen()
+
+    def dispatch(self, name: str, action) -> None:
+        """
+        Exécute l'action choisie dans un menu.
+
+        Les requêtes SQL exécutées par l'action lui sont attribuées dans les statistiques des requêtes et, en mode
+        profilage, l'action est profilée.
+
+        Args:
+            name (str): Le nom de l'élément de menu choisi.
+            action (Callable): La méthode associée.
+        """
+
+        if self.query_stats is None and self.profiler is None:
+            action()
+            return
+
+        with ExitStack() as stack:
+            if self.query_stats is not None:
+                stack.enter_context(self.query_stats.action(name))
+            if self.profiler is not None:
+                stack.enter_context(self.profiler.profile(name))
+            action()
+
     def logout(self) -> None:
         """
         Déconnecte l'utilisateur en fermant la session et en supprimant le jeton JWT.
@@ -253,3 +358,5 @@ class MenuManage:
             self.session.close()
         self.delete_token()
         self.logger.info(f"Déconnexion: {self.employee.Email}")
+        if self.query_stats is not None:
+            self.query_stats.log_summary()
@@ -1,7 +1,8 @@
 from app.models.role import Role
+from app.permissions.role_cache import RoleCache
 from app.views.views import View
 
-from .utils_manage import UtilsManage
+from .utils_manage import OperResult, UtilsManage
 
 
 class RoleManage:
@@ -175,7 +176,9 @@ class RoleManage:
             self.view.return_choice("Accés au support des évènements", False, f"{role.Can_access_support_Event}")
         )
 
-        self.utils.valid_oper(self.session, "role", "update", role)
+        # révision incrémentée par la base à l'écriture ( version_id_col ) : les autres processus rechargent le rôle
+        if self.utils.valid_oper(self.session, "role", "update", role) is OperResult.SUCCESS:
+            RoleCache.bump()
 
     def delete(self) -> None:
         """
@@ -192,4 +195,5 @@ class RoleManage:
         if not role:
             return
 
-        self.utils.valid_oper(self.session, "role", "delete", role)
+        if self.utils.valid_oper(self.session, "role", "delete", role) is OperResult.SUCCESS:
+            RoleCache.bump()
@@ -1,16 +1,62 @@
-from typing import List, Type
+import os
+import time
+from enum import Enum
+from functools import partial
+from typing import Callable, Iterator, List, Optional, Tuple, Type
 
 from rich.table import Table
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.models.contract import Contract
 from app.models.customer import Customer
 from app.models.employee import Employee
 from app.models.event import Event
 from app.models.role import Role
+from app.utils.metrics import OPERATION_DURATION, OPERATIONS
 from app.utils.sentry_logger import SentryLogger
 from app.views.views import View
 
+# Profils de chargement des listes : pour chaque modèle, les relations (et uniquement les colonnes) affichées par
+# la méthode table_<modèle> correspondante sont chargées dans la requête principale ou par un SELECT ... IN groupé,
+# afin que le nombre de requêtes SQL ne dépende pas du nombre de lignes affichées.
+LOAD_PROFILES = {
+    Event: (
+        joinedload(Event.ContractRel).load_only(Contract.Title),
+        joinedload(Event.EmployeeSupportRel).load_only(Employee.FirstName),
+    ),
+    Contract: (
+        joinedload(Contract.CustomerRel)
+        .load_only(Customer.LastName, Customer.Email, Customer.CommercialId)
+        .joinedload(Customer.CommercialRel)
+        .load_only(Employee.LastName, Employee.Email),
+    ),
+    Customer: (joinedload(Customer.CommercialRel).load_only(Employee.Email),),
+    Employee: (
+        joinedload(Employee.RoleRel).load_only(Role.RoleName),
+        selectinload(Employee.CustomersRel).load_only(Customer.FirstName),
+        selectinload(Employee.EventsRel).load_only(Event.Title),
+    ),
+    Role: (),
+}
+
+
+class OperResult(Enum):
+    """
+    Résultat de `UtilsManage.valid_oper`.
+
+    Seul SUCCESS est vrai dans un test booléen : `if valid_oper(...)` ne confond pas un refus avec un succès.
+    """
+
+    SUCCESS = "success"
+    FAILED = "failed"
+    # élément modifié par un autre utilisateur depuis sa lecture, rechargé avec ses nouvelles valeurs
+    STALE = "stale"
+
+    def __bool__(self) -> bool:
+        return self is OperResult.SUCCESS
+
 
 class UtilsManage:
     """
@@ -23,13 +69,39 @@ class UtilsManage:
         view (View): Instance de la classe View pour gérer l'affichage.
         sentry (SentryLogger): Instance de la classe SentryLogger pour gérer la journalisation des événements.
         employee (Employee): L'employé qui effectue les opérations.
+        page_size (int): Nombre de lignes par page des listes (variable d'environnement PAGE_SIZE, DEFAULT_PAGE_SIZE si
+            elle n'est pas un entier supérieur ou égal à 1).
 
     """
 
+    DEFAULT_PAGE_SIZE = 50
+
     def __init__(self, employee):
         self.view = View()
         self.sentry = SentryLogger()
         self.employee = employee
+        self.page_size = self.valid_page_size(os.environ.get("PAGE_SIZE"))
+
+    @classmethod
+    def valid_page_size(cls, page_size) -> int:
+        """
+        Retourne une taille de page valide.
+
+        Une taille nulle ou négative produirait une requête `LIMIT 1` ( page vide ) ou `LIMIT -1` ( sans limite
+        sur SQLite ).
+
+        Args:
+            page_size: La taille demandée ( entier ou chaîne, None si absente ).
+
+        Returns:
+            int: La taille demandée si c'est un entier supérieur ou égal à 1, DEFAULT_PAGE_SIZE sinon.
+        """
+
+        try:
+            page_size = int(page_size)
+        except (TypeError, ValueError):
+            return cls.DEFAULT_PAGE_SIZE
+        return page_size if page_size >= 1 else cls.DEFAULT_PAGE_SIZE
 
     def confirm_table_recap(self, model_name: str, model_instance, oper: str, color: str = "white") -> bool:
         """
@@ -367,7 +439,15 @@ class UtilsManage:
             return True
         return False
 
-    def filter(self, session, attribute: str, value: any, model: Type) -> List:
+    def filter(
+        self,
+        session,
+        attribute: str,
+        value: any,
+        model: Type,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List:
         """
         Filtre les instances d'un modèle en fonction d'un attribut et d'une valeur spécifiques.
 
@@ -378,11 +458,13 @@ class UtilsManage:
             value (any): La valeur de l'attribut à filtrer. Si `None`, les instances où l'attribut est `Null`
                         seront récupérées.
             model (Type): La classe du modèle SQLAlchemy à interroger.
+            after_id (int, optional): Curseur de pagination, seules les instances d'Id supérieur sont récupérées.
+            limit (int, optional): Nombre maximum d'instances récupérées, triées par Id.
 
         Returns:
             List: Une liste des instances du modèle qui correspondent aux critères de filtrage spécifiés.
         """
-        query = session.query(model)
+        query = session.query(model).options(*self.load_options(model))
 
         if attribute != "All":
             if value is None:
@@ -390,17 +472,106 @@ class UtilsManage:
             else:
                 query = query.filter(getattr(model, attribute) == value)
 
-        return query.all()
+        return self.keyset(query, model, after_id, limit).all()
+
+    def keyset(self, query, model: Type, after_id: Optional[int] = None, limit: Optional[int] = None):
+        """
+        Applique une pagination par curseur (keyset) sur l'Id à une requête.
+
+        Contrairement à OFFSET, le coût d'une page ne dépend pas de sa position : la base reprend directement
+        après le dernier Id affiché grâce à l'index de la clé primaire.
+
+        Args:
+            query (Query): La requête SQLAlchemy à paginer.
+            model (Type): La classe du modèle interrogé.
+            after_id (int, optional): Id de la dernière instance de la page précédente.
+            limit (int, optional): Nombre maximum d'instances de la page.
+
+        Returns:
+            Query: La requête paginée.
+        """
+        if after_id is not None:
+            query = query.filter(model.Id > after_id)
+        if limit is not None:
+            query = query.order_by(model.Id).limit(limit)
+        return query
+
+    def pages(self, fetch_page: Callable[..., List], page_size: Optional[int] = None) -> Iterator[Tuple[List, bool]]:
+        """
+        Génère les pages d'une liste en ne récupérant chaque page qu'au moment où elle est demandée.
+
+        Une ligne supplémentaire est demandée à chaque récupération pour savoir s'il reste une page suivante,
+        sans requête de comptage.
+
+        Args:
+            fetch_page (Callable): Fonction appelée avec `after_id` et `limit` et retournant une liste triée par Id.
+            page_size (int, optional): Taille des pages. Par défaut `self.page_size`.
+
+        Yields:
+            Tuple[List, bool]: La page et un booléen indiquant s'il existe une page suivante.
+        """
+        page_size = self.valid_page_size(page_size) if page_size is not None else self.page_size
+        after_id = None
+
+        while True:
+            rows = fetch_page(after_id=after_id, limit=page_size + 1)
+            has_more = len(rows) > page_size
+            page = rows[:page_size]
+            yield page, has_more
+
+            if not has_more:
+                return
+            after_id = page[-1].Id
+
+    def display_list(self, model_name: str, fetch_page: Callable[..., List], title: str) -> None:
+        """
+        Affiche une liste page par page dans le pager de la vue.
+
+        Args:
+            model_name (str): Le type d'objet affiché (voir `table_create`).
+            fetch_page (Callable): Fonction de récupération d'une page (voir `pages`).
+            title (str): Le titre du tableau.
+        """
+        self.view.display_pager(self.pages(fetch_page), partial(self.table_create, model_name), title)
+
+    def has_rows(self, session, query) -> bool:
+        """
+        Indique si une requête renvoie au moins une ligne, par une requête EXISTS sans charger les lignes.
+
+        Args:
+            session (Session): La session SQLAlchemy.
+            query (Query): La requête à tester.
+
+        Returns:
+            bool: True si la requête renvoie au moins une ligne, False sinon.
+        """
+        return bool(session.query(query.exists()).scalar())
+
+    def load_options(self, model: Type) -> tuple:
+        """
+        Retourne les options de chargement à appliquer aux requêtes de liste d'un modèle.
+
+        Args:
+            model (Type): La classe du modèle SQLAlchemy à interroger.
+
+        Returns:
+            tuple: Les options `joinedload` / `selectinload` du profil de chargement du modèle (vide si aucun).
+        """
+        return LOAD_PROFILES.get(model, ())
 
-    def valid_id(self, session, model, message: str, auhtorized_list: List = None):
+    def valid_id(self, session, model, message: str, scoped_query=None):
         """
         Valide l'identifiant d'un élément en vérifiant qu'il existe dans la base de données et qu'il est autorisé.
 
+        L'autorisation est vérifiée par la base : l'identifiant est recherché directement dans la requête limitée au
+        périmètre de l'utilisateur (voir `Scopes.query`), sans charger la liste des éléments autorisés.
+
         Args:
             session (Session): La session SQLAlchemy à utiliser pour interagir avec la base de données.
             model (Type): Le modèle de base de données SQLAlchemy à interroger.
             message (str): Le message à afficher pour demander l'identifiant.
-            authorized_list (List): La liste des éléments autorisés pour cette opération.
+            scoped_query (Query, optional): La requête des éléments autorisés pour cette opération.
+                Si None, tous les éléments du modèle sont autorisés.
 
         Returns:
             object or None: L'élément correspondant à l'identifiant s'il est valide et autorisé, sinon None.
@@ -409,6 +580,8 @@ class UtilsManage:
             Affiche un message d'erreur en cas d'identifiant invalide ou si l'opération n'est pas autorisée.
         """
 
+        query = scoped_query if scoped_query is not None else session.query(model)
+
         while True:
             element_id = self.view.return_choice(f"Entrez l'Id: {message}  ( vide pour annuler )", False)
 
@@ -416,23 +589,28 @@ class UtilsManage:
                 return None
 
             try:
-                element = session.query(model).filter_by(Id=int(element_id)).one()
-
-                # vérifie que le contrat est dans la liste autorisée.
-                if not auhtorized_list or element in auhtorized_list:
+                element = query.filter(model.Id == int(element_id)).one_or_none()
+                if element is not None:
                     return element
-                self.view.display_red_message("Opération non autorisée")
+
+                # distingue un identifiant hors périmètre d'un identifiant inexistant
+                if scoped_query is not None and session.get(model, int(element_id)) is not None:
+                    self.view.display_red_message("Opération non autorisée")
+                else:
+                    self.view.display_red_message("Identifiant non valide !")
 
             except Exception as e:
                 self.view.display_red_message(f"Identifiant non valide ! {e}")
 
-    def valid_oper(self, session, model_name, oper: str, model_instance):
+    def valid_oper(self, session, model_name, oper: str, model_instance) -> OperResult:
         """
         Effectue une opération de base de données sur une instance de modèle donnée dans une session.
 
         Cette méthode prend en charge la création, la mise à jour et la suppression d'instances d'un modèle donné.
-        Après avoir tenté l'opération spécifiée, elle confirme l'action avec l'utilisateur et gère la validation ou
-        l'annulation de la transaction si nécessaire. Elle journalise également l'événement à l'aide de Sentry.
+        L'opération se fait en deux temps : le récapitulatif est affiché à partir de l'instance en mémoire ( aucune
+        écriture en base ), puis, seulement après la confirmation de l'utilisateur, l'opération est écrite et validée
+        dans une transaction courte. Aucune ligne n'est donc verrouillée pendant la saisie de la confirmation.
+        Elle journalise également l'événement à l'aide de Sentry.
 
         Paramètres:
         ----------
@@ -444,7 +622,7 @@ class UtilsManage:
             L'opération à effectuer. Doit être 'create', 'update' ou 'delete'.
         model_instance : sqlalchemy.ext.declarative.api.Base
             L'instance du modèle sur laquelle effectuer l'opération.
-        
+
         Exceptions:
         ----------
         IntegrityError: Si une contrainte d'intégrité est violée pendant l'opération.
@@ -453,30 +631,50 @@ class UtilsManage:
 
         Remarques:
         -----
-        - Si l'opération est réussie et confirmée, la transaction est validée.
+        - Si l'opération est confirmée et réussie, la transaction est validée.
         - Si l'opération échoue ou n'est pas confirmée, la transaction est annulée.
+        - Les contraintes d'intégrité ( unicité ... ) sont vérifiées par la base à l'écriture, après la confirmation.
         - Un message indiquant le succès ou l'échec est affiché à l'utilisateur.
         - Un événement est envoyé à Sentry pour journalisation.
+        - L'opération est comptée par modèle, opération et résultat et la durée de son écriture est mesurée
+          ( app/utils/metrics.py ).
+        - Les clients, contrats et évènements ont un numéro de version : si l'élément a été modifié ou supprimé par
+          un autre utilisateur depuis sa lecture, l'écriture est refusée et l'élément est rechargé.
+
+        Retourne:
+        -----
+        OperResult.SUCCESS si l'opération est validée, OperResult.STALE si l'élément a été modifié entre-temps
+        ( il est rechargé avec ses nouvelles valeurs et la saisie peut être reprise ), OperResult.FAILED sinon.
         """
 
+        result = "error"
         try:
+            if oper not in ("create", "update", "delete"):
+                raise ValueError("Invalid operation. Supported operations: 'create', 'update', 'delete'.")
+
+            # les relations d'une nouvelle instance sont chargées depuis ses clés étrangères pour le récapitulatif,
+            # sans l'ajouter à la session
+            if oper == "create":
+                session.enable_relationship_loading(model_instance)
+
+            # Affichage et confirmation de l'opération
+            if not self.confirm_table_recap(model_name, model_instance, oper, "green"):
+                result = "cancelled"
+                session.rollback()
+                return OperResult.FAILED
+
+            # écriture après confirmation ( durée mesurée hors saisie )
+            start = time.perf_counter()
             if oper == "create":
                 session.add(model_instance)
             elif oper == "update":
                 session.merge(model_instance)
             elif oper == "delete":
                 session.delete(model_instance)
-            else:
-                raise ValueError("Invalid operation. Supported operations: 'create', 'update', 'delete'.")
 
-            session.flush()
-
-            # Affichage et confirmation de la création
-            if not self.confirm_table_recap(model_name, model_instance, oper, "green"):
-                session.expunge(model_instance)
-                session.rollback()
-                return
             session.commit()
+            OPERATION_DURATION.observe(time.perf_counter() - start, model_name, oper)
+            result = "success"
             self.view.display_green_message(f"\n{model_name} - {oper} -> Success")
 
             # évènement sentry
@@ -486,13 +684,50 @@ class UtilsManage:
                 "info",
                 f"{model_name}-{oper}",
             )
+            return OperResult.SUCCESS
 
+        except StaleDataError:
+            result = "stale"
+            session.rollback()
+            return self.reload_stale(session, model_name, oper, model_instance)
         except IntegrityError as e:
+            result = "integrity_error"
             session.rollback()
             self.view.display_red_message(f"Erreur d'intégrité : {e.orig}")
         except ValueError as e:
+            result = "validation_error"
             session.rollback()
             self.view.display_red_message(f"Erreur de validation : {e}")
         except Exception as e:
             session.rollback()
             self.view.display_red_message(f"Erreur: {e}")
+        finally:
+            OPERATIONS.inc(model_name, oper, result)
+        return OperResult.FAILED
+
+    def reload_stale(self, session, model_name: str, oper: str, model_instance) -> OperResult:
+        """
+        Recharge un élément modifié ou supprimé par un autre utilisateur depuis sa lecture.
+
+        Args:
+            session (Session): La session SQLAlchemy.
+            model_name (str): Le nom du modèle.
+            oper (str): L'opération refusée ( 'update' ou 'delete' ).
+            model_instance: L'instance dont l'écriture a été refusée.
+
+        Returns:
+            OperResult: STALE si l'élément a été rechargé avec ses nouvelles valeurs, FAILED s'il a été supprimé.
+        """
+
+        try:
+            session.refresh(model_instance)
+        except InvalidRequestError:
+            self.view.display_red_message(f"{model_name} supprimé par un autre utilisateur.")
+            return OperResult.FAILED
+
+        if oper == "delete":
+            message = "il n'a pas été supprimé, vérifiez ses nouvelles valeurs avant de le supprimer à nouveau."
+        else:
+            message = "vos modifications n'ont pas été enregistrées, il a été rechargé avec ses nouvelles valeurs."
+        self.view.display_red_message(f"{model_name} modifié par un autre utilisateur : {message}")
+        return OperResult.STALE
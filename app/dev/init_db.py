@@ -1,11 +1,13 @@
 from sqlalchemy.exc import SQLAlchemyError
+
+from app.dev.migrations import MigrationManager
 from app.models.contract import Contract
 from app.models.customer import Customer
 from app.models.database import DatabaseConfig
-from app.models.employee import Employee
 from app.models.event import Event
 from app.models.role import Role
 from app.utils.logger_config import LoggerConfig
+from app.utils.password_hashing import build_employees
 from app.utils.sentry_logger import SentryLogger
 
 
@@ -27,6 +29,7 @@ class DatabaseInitializer:
         drop_all_tables(): Supprime toutes les tables de la base de données.
         create_all_tables(): Crée toutes les tables dans la base de données.
         init_base(): Réinitialise la base de données et la peuple avec des données prédéfinies.
+        upgrade_base(): Applique les migrations de schéma à une base existante, sans perte de données.
     """
 
     def __init__(self, session, engine, base, logger):
@@ -197,9 +200,8 @@ class DatabaseInitializer:
         """
 
         try:
-            for user_data in self.USERS.values():
-                user = Employee(**user_data)
-                self.session.add(user)
+            # mots de passe hashés en parallèle avant la création des employés
+            self.session.add_all(build_employees(self.USERS.values()))
             self.session.commit()
             self.logger.info("Users have been successfully created!")
         except SQLAlchemyError as e:
@@ -282,6 +284,19 @@ class DatabaseInitializer:
         except SQLAlchemyError as e:
             self.logger.error(f"An error has occurred while creating the tables: {e}", exc_info=False)
 
+    def upgrade_base(self) -> None:
+        """
+        Applique les migrations de schéma ( app/dev/migrations.py ) à une base existante, sans perte de données.
+
+        Raises:
+            SQLAlchemyError: Si une erreur SQLAlchemy se produit lors d'une migration.
+        """
+
+        try:
+            MigrationManager(self.engine, self.logger).upgrade()
+        except SQLAlchemyError as e:
+            self.logger.error(f"An error has occurred while upgrading the base: {e}", exc_info=False)
+
     def init_base(self) -> None:
         """
         Réinitialise la base de données avec des données prédéfinies.
@@ -293,6 +308,8 @@ class DatabaseInitializer:
         try:
             self.drop_all_tables()
             self.create_all_tables()
+            # les tables recréées ont déjà tous les index déclarés sur les modèles
+            MigrationManager(self.engine, self.logger).stamp()
         except Exception as e:
             self.logger.error(f"An error has occurred while resetting the base: {e}", exc_info=False)
         else:
@@ -311,7 +328,7 @@ if __name__ == "__main__":
     sentry_logger = SentryLogger()
 
     # config session
-    session_config = DatabaseConfig(logger)
+    session_config = DatabaseConfig(logger, lazy=False)
     session = session_config.db_session_local()
     engine = session_config.engine
     base = session_config.BASE
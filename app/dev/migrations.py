@@ -0,0 +1,212 @@
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.database import DatabaseConfig
+from app.models.event import Event
+from app.models.schema_version import SchemaVersion
+from app.utils.logger_config import LoggerConfig
+from app.utils.sentry_logger import SentryLogger
+
+
+def create_indexes(*names: str):
+    """
+    Construit une étape de migration créant des index déclarés sur les modèles.
+
+    Les index sont créés à partir de leur déclaration dans `__table_args__`, de sorte qu'une base migrée soit
+    identique à une base créée par `create_all`. Un index déjà présent est ignoré.
+
+    Args:
+        *names (str): Les noms des index à créer.
+
+    Returns:
+        Callable: La fonction appliquant la migration sur une connexion.
+    """
+
+    def upgrade(connection) -> None:
+        indexes = declared_indexes()
+        for name in names:
+            indexes[name].create(connection, checkfirst=True)
+
+    return upgrade
+
+
+def recreate_indexes(*names: str):
+    """
+    Construit une étape de migration recréant des index dont la déclaration a changé ( colonnes, condition ).
+
+    L'index existant est supprimé puis recréé à partir de sa déclaration dans `__table_args__`.
+
+    Args:
+        *names (str): Les noms des index à recréer.
+
+    Returns:
+        Callable: La fonction appliquant la migration sur une connexion.
+    """
+
+    def upgrade(connection) -> None:
+        indexes = declared_indexes()
+        for name in names:
+            indexes[name].drop(connection, checkfirst=True)
+            indexes[name].create(connection)
+
+    return upgrade
+
+
+def declared_indexes() -> dict:
+    """Retourne les index déclarés sur les clients, contrats et évènements, par nom."""
+
+    return {
+        index.name: index
+        for table in (Customer.__table__, Contract.__table__, Event.__table__)
+        for index in table.indexes
+    }
+
+
+def add_role_revision(connection) -> None:
+    """Ajoute la colonne Role.Revision ( cache des permissions )."""
+
+    columns = {column["name"] for column in inspect(connection).get_columns("Role")}
+    if "Revision" not in columns:
+        connection.execute(text('ALTER TABLE "Role" ADD COLUMN "Revision" INTEGER NOT NULL DEFAULT 1'))
+
+
+def add_versions(connection) -> None:
+    """Ajoute la colonne Version ( contrôle des modifications concurrentes ) aux clients, contrats et évènements."""
+
+    for table in ("Customer", "Contract", "Event"):
+        columns = {column["name"] for column in inspect(connection).get_columns(table)}
+        if "Version" not in columns:
+            connection.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "Version" INTEGER NOT NULL DEFAULT 1'))
+
+
+# Migrations ordonnées : (version, description, fonction appliquant la migration sur une connexion)
+MIGRATIONS = [
+    (
+        1,
+        "Index des clés étrangères et des filtres par rôle",
+        create_indexes(
+            "ix_Customer_CommercialId",
+            "ix_Contract_CustomerId",
+            "ix_Contract_ContractSigned",
+            "ix_Contract_CustomerId_not_signed",
+            "ix_Contract_CustomerId_outstanding",
+            "ix_Event_ContractId",
+            "ix_Event_EmployeeSupportId",
+            "ix_Event_no_support",
+        ),
+    ),
+    (2, "Révision des rôles", add_role_revision),
+    (3, "Version des clients, contrats et évènements", add_versions),
+    (4, "Index des évènements sans support sur Id ( liste paginée )", recreate_indexes("ix_Event_no_support")),
+]
+
+
+class MigrationManager:
+    """
+    Classe pour appliquer les migrations de schéma à une base de données existante sans la réinitialiser.
+
+    Les migrations appliquées sont enregistrées dans la table SchemaVersion ; chaque migration est appliquée
+    dans sa propre transaction avec l'enregistrement de sa version.
+
+    Attributs:
+        engine (Engine): Objet engine SQLAlchemy.
+        logger (Logger): Objet logger pour enregistrer les informations.
+        migrations (list): Les migrations connues, triées par version.
+
+    Méthodes:
+        current_version(): Retourne la version du schéma de la base.
+        pending(): Retourne les migrations restant à appliquer.
+        upgrade(): Applique les migrations restant à appliquer.
+        stamp(): Marque toutes les migrations comme appliquées ( base créée par `create_all` ).
+    """
+
+    def __init__(self, engine, logger, migrations: list = None):
+        self.engine = engine
+        self.logger = logger
+        self.migrations = sorted(migrations if migrations is not None else MIGRATIONS, key=lambda m: m[0])
+
+    def current_version(self) -> int:
+        """
+        Retourne la version du schéma de la base.
+
+        Returns:
+            int: La dernière version appliquée, 0 si aucune migration n'a été appliquée.
+        """
+
+        if not inspect(self.engine).has_table(SchemaVersion.__tablename__):
+            return 0
+
+        with self.engine.connect() as connection:
+            return connection.execute(select(func.max(SchemaVersion.Version))).scalar() or 0
+
+    def pending(self) -> list:
+        """
+        Retourne les migrations restant à appliquer.
+
+        Returns:
+            list: Les migrations dont la version est supérieure à celle de la base.
+        """
+
+        current = self.current_version()
+        return [migration for migration in self.migrations if migration[0] > current]
+
+    def upgrade(self) -> int:
+        """
+        Applique les migrations restant à appliquer, dans l'ordre des versions.
+
+        L'application s'arrête à la première migration en erreur, les migrations précédentes restant appliquées.
+
+        Returns:
+            int: La version du schéma après application des migrations.
+
+        Raises:
+            SQLAlchemyError: Si une erreur SQLAlchemy se produit lors d'une migration ( enregistrée puis relancée ).
+        """
+
+        SchemaVersion.__table__.create(self.engine, checkfirst=True)
+
+        for version, description, apply in self.pending():
+            try:
+                with self.engine.begin() as connection:
+                    apply(connection)
+                    connection.execute(
+                        SchemaVersion.__table__.insert().values(Version=version, Description=description)
+                    )
+                self.logger.info(f"Migration {version} applied: {description}")
+            except SQLAlchemyError as e:
+                self.logger.error(f"An error occurred while applying migration {version}: {e}")
+                raise
+
+        return self.current_version()
+
+    def stamp(self) -> None:
+        """
+        Marque toutes les migrations comme appliquées, sans les exécuter.
+
+        À utiliser après `create_all`, les tables étant alors créées avec tous les index déclarés sur les modèles.
+        """
+
+        SchemaVersion.__table__.create(self.engine, checkfirst=True)
+
+        pending = self.pending()
+        if pending:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    SchemaVersion.__table__.insert(),
+                    [{"Version": version, "Description": description} for version, description, _ in pending],
+                )
+            self.logger.info(f"Schema stamped at version {pending[-1][0]}")
+
+
+if __name__ == "__main__":
+    # Config Loggers
+    logger_config = LoggerConfig()
+    logger = logger_config.get_logger()
+    sentry_logger = SentryLogger()
+
+    # config engine
+    session_config = DatabaseConfig(logger, lazy=False)
+    migration_manager = MigrationManager(session_config.engine, logger)
+    migration_manager.upgrade()
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from sqlalchemy import inspect
+
+from app.dev.init_db import DatabaseInitializer
+from app.dev.migrations import MigrationManager
+
+# cache des vérifications de schéma : { base : { révision, signature des tables } }
+SCHEMA_CHECK_FILE = Path(__file__).parent.parent / "data" / "schema_check.json"
+
+
+def check_tables_exist(engine, base):
+    """
+    Vérifie si toutes les tables définies dans les modèles SQLAlchemy existent dans la base de données.
+
+    Args:
+        engine: L'objet engine de SQLAlchemy.
+        base: L'objet base de SQLAlchemy contenant les modèles.
+
+    Returns:
+        bool: True si toutes les tables existent, False sinon.
+        list: Liste des tables manquantes si certaines tables sont absentes.
+    """
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+    expected_tables = base.metadata.tables.keys()
+
+    missing_tables = [table for table in expected_tables if table not in existing_tables]
+
+    if missing_tables:
+        return False, missing_tables
+    return True, []
+
+
+class StartupCheck:
+    """
+    Vérifie la connexion et le schéma de la base au lancement de l'application.
+
+    En démarrage rapide, la vérification est faite par un thread pendant l'affichage de l'écran de connexion ;
+    l'authentification attend son résultat ( `wait` ) avant la première requête.
+
+    Le résultat de la vérification du schéma est mis en cache par base et par révision du schéma ( table
+    SchemaVersion ) : tant que la révision et les tables des modèles sont inchangées, le lancement suivant
+    ne lit que la révision, sans inspecter les tables ni rechercher de migrations.
+
+    Attributs:
+        session_config (DatabaseConfig): La configuration de la base de données.
+        logger (Logger): Objet logger pour enregistrer les informations.
+        cache_path (Path): Fichier du cache des vérifications de schéma.
+        error (Exception): L'erreur de la vérification, None si la vérification a réussi.
+    """
+
+    def __init__(self, session_config, logger, cache_path: Path = SCHEMA_CHECK_FILE):
+        self.session_config = session_config
+        self.logger = logger
+        self.cache_path = Path(cache_path)
+        self.error = None
+        self.thread = None
+
+    def start(self) -> None:
+        """Lance la vérification dans un thread."""
+
+        self.thread = threading.Thread(target=self.run, name="db-startup-check", daemon=True)
+        self.thread.start()
+
+    def run(self) -> bool:
+        """
+        Effectue la vérification en enregistrant son erreur éventuelle.
+
+        Returns:
+            bool: True si la base est accessible et son schéma à jour, False sinon.
+        """
+
+        try:
+            self.check()
+        except Exception as e:
+            self.error = e
+            self.logger.error(f"An error occurred while checking the database: {e}")
+        return self.error is None
+
+    def wait(self) -> bool:
+        """
+        Attend la fin de la vérification lancée par `start`.
+
+        Returns:
+            bool: True si la base est accessible et son schéma à jour, False sinon.
+        """
+
+        if self.thread is not None:
+            self.thread.join()
+        return self.error is None
+
+    def check(self) -> None:
+        """
+        Vérifie la connexion, crée les tables manquantes et applique les migrations en attente.
+
+        Raises:
+            SQLAlchemyError: Si la base n'est pas accessible.
+        """
+
+        engine = self.session_config.engine
+        base = self.session_config.BASE
+        migration_manager = MigrationManager(engine, self.logger)
+        latest = migration_manager.migrations[-1][0]
+
+        # première requête : vérifie aussi la connexion
+        revision = migration_manager.current_version()
+        self.logger.info("Database connection successful")
+
+        key = engine.url.render_as_string(hide_password=True)
+        expected = {"revision": revision, "tables": self.tables_signature(base)}
+        cache = self.load_cache()
+        if revision == latest and cache.get(key) == expected:
+            self.logger.info(f"Schéma de la base vérifié ( révision {revision}, cache )")
+            return
+
+        session = self.session_config.db_session_local()
+        try:
+            init_db = DatabaseInitializer(session, engine, base, self.logger)
+
+            check_table, missed_tables = check_tables_exist(engine, base)
+            if not check_table:
+                self.logger.error(f"Table(s) non trouvée(s) : {missed_tables}")
+                # Création des tables manquantes
+                init_db.create_all_tables()
+
+            # Migrations de schéma ( index ... ) non encore appliquées
+            init_db.upgrade_base()
+        finally:
+            session.close()
+
+        # seul un schéma complet et à jour est mis en cache
+        check_table, _ = check_tables_exist(engine, base)
+        if check_table and migration_manager.current_version() == latest:
+            cache[key] = dict(expected, revision=latest)
+            self.save_cache(cache)
+
+    @staticmethod
+    def tables_signature(base) -> str:
+        """Retourne une empreinte des tables et colonnes des modèles ( le cache est invalidé si elles changent )."""
+
+        description = sorted(
+            (name, sorted(column.name for column in table.columns)) for name, table in base.metadata.tables.items()
+        )
+        return hashlib.sha256(json.dumps(description).encode()).hexdigest()
+
+    def load_cache(self) -> dict:
+        """Retourne le cache des vérifications de schéma, vide s'il n'existe pas ou est illisible."""
+
+        try:
+            with open(self.cache_path, encoding="utf-8") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def save_cache(self, cache: dict) -> None:
+        """Enregistre le cache des vérifications de schéma."""
+
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as file:
+                json.dump(cache, file, indent=4)
+        except OSError as e:
+            self.logger.warning(f"Cache de vérification du schéma non enregistré : {e}")
@@ -0,0 +1,267 @@
+"""
+Génération de données synthétiques pour les tests de charge ( 10k, 100k, 1M lignes ... ).
+
+Usage ( depuis la racine du projet ) :
+    python -m app.dev.synthetic_data 100000 --seed 42
+    python -m app.dev.synthetic_data 1000000 --url sqlite:///app/data/charge.db
+"""
+
+import argparse
+import bisect
+import itertools
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.dev.init_db import DatabaseInitializer
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee, hash_password
+from app.models.event import Event
+from app.models.role import Role
+from app.utils.bulk_import import BulkImporter
+from app.utils.logger_config import LoggerConfig
+
+# mot de passe des employés générés
+SYNTHETIC_PASSWORD = "Password123"
+# répartition des lignes d'un volume total entre les tables
+TABLE_SHARES = {"employees": 0.01, "customers": 0.29, "contracts": 0.40, "events": 0.30}
+# répartition des employés générés entre les rôles
+ROLE_SHARES = {"Commercial": 0.4, "Support": 0.4, "Gestion": 0.2}
+# exposants de la loi de Zipf : plus l'exposant est grand, plus quelques employés / clients concentrent les lignes
+COMMERCIAL_SKEW = 1.2
+SUPPORT_SKEW = 1.0
+CUSTOMER_SKEW = 0.8
+# part des contrats signés ( beaucoup de contrats non signés ) et des contrats signés entièrement payés
+SIGNED_RATIO = 0.3
+PAID_RATIO = 0.5
+# part des évènements sans support affecté
+NO_SUPPORT_RATIO = 0.25
+
+FIRST_NAMES = ("Alice", "Bruno", "Chloé", "David", "Emma", "François", "Gabrielle", "Hugo", "Inès", "Jules", "Léa")
+LAST_NAMES = ("Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau")
+LOCATIONS = ("Paris", "Lyon", "Marseille", "Bordeaux", "Lille", "Nantes", "Toulouse", "Nice", "Strasbourg")
+FIRST_EVENT_DATE = date(2023, 1, 1)
+
+
+def zipf_weights(count: int, skew: float) -> List[float]:
+    """
+    Retourne les poids cumulés d'une loi de Zipf sur `count` éléments ( le rang 1 est le plus choisi ).
+
+    Args:
+        count (int): Le nombre d'éléments.
+        skew (float): L'exposant de la loi ( 0 : répartition uniforme ).
+
+    Returns:
+        List[float]: Les poids cumulés, pour `random.choices(cum_weights=...)`.
+    """
+
+    return list(itertools.accumulate(1 / rank**skew for rank in range(1, count + 1)))
+
+
+class SyntheticDataGenerator(DatabaseInitializer):
+    """
+    Réinitialise la base avec les données prédéfinies de DatabaseInitializer puis ajoute des employés, clients,
+    contrats et évènements générés, reproductibles d'une exécution à l'autre pour une même graine.
+
+    La répartition est volontairement déséquilibrée, comme en production : quelques commerciaux possèdent la
+    plupart des clients ( loi de Zipf ), la plupart des contrats ne sont pas signés, les évènements ne concernent
+    que des contrats signés et une partie d'entre eux n'a pas de support.
+
+    Les lignes sont insérées par lots ( voir BulkImporter.write : COPY sur PostgreSQL, executemany sinon ), sans
+    passer par les objets du modèle. Les employés générés partagent un seul hash du mot de passe
+    SYNTHETIC_PASSWORD : un hash bcrypt par employé prendrait plusieurs minutes à 10k employés.
+
+    Attributs:
+        counts (dict): Le nombre de lignes générées par table ( employees, customers, contracts, events ).
+        seed (int): La graine du générateur aléatoire.
+        chunk_size (int): Le nombre de lignes insérées par lot.
+    """
+
+    def __init__(self, session, engine, base, logger, counts: Dict[str, int], seed: int = 0, chunk_size: int = 10000):
+        super().__init__(session, engine, base, logger)
+        self.counts = counts
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.random = random.Random(seed)
+
+    @staticmethod
+    def scale(rows: int) -> Dict[str, int]:
+        """
+        Répartit un volume total de lignes entre les tables ( voir TABLE_SHARES ).
+
+        Args:
+            rows (int): Le nombre total de lignes générées.
+
+        Returns:
+            dict: Le nombre de lignes par table, au moins un employé de chaque rôle.
+        """
+
+        counts = {table: round(rows * share) for table, share in TABLE_SHARES.items()}
+        counts["employees"] = max(counts["employees"], len(ROLE_SHARES))
+        return counts
+
+    def generate(self) -> None:
+        """Réinitialise la base et la peuple avec les données prédéfinies puis les données générées."""
+
+        self.init_base()
+        start = time.perf_counter()
+
+        roles = dict(self.session.execute(select(Role.RoleName, Role.Id)).all())
+        self.insert(Employee, self.employee_rows(roles))
+        employees = self.employee_ids(roles)
+
+        self.insert(Customer, self.customer_rows(employees["Commercial"]))
+        customer_ids = self.session.scalars(select(Customer.Id).order_by(Customer.Id)).all()
+
+        self.insert(Contract, self.contract_rows(customer_ids))
+        signed_ids = self.session.scalars(
+            select(Contract.Id).where(Contract.ContractSigned.is_(True)).order_by(Contract.Id)
+        ).all()
+
+        self.insert(Event, self.event_rows(signed_ids, employees["Support"]))
+        self.session.close()
+
+        self.logger.info(
+            f"Synthetic data generated in {time.perf_counter() - start:.1f} s "
+            f"(seed {self.seed}, {sum(self.counts.values())} rows)"
+        )
+
+    def insert(self, model, rows: Iterable[Dict]) -> None:
+        """Insère des lignes générées par lots de `chunk_size`, une transaction par lot."""
+
+        writer = BulkImporter(self.session, model, self.chunk_size)
+        start = time.perf_counter()
+        inserted = 0
+        for chunk in iter(lambda: list(itertools.islice(rows, self.chunk_size)), []):
+            writer.write(chunk)
+            self.session.commit()
+            inserted += len(chunk)
+
+        elapsed = time.perf_counter() - start
+        self.logger.info(
+            f"{inserted} {model.__tablename__} rows inserted in {elapsed:.1f} s "
+            f"({inserted / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+
+    def employee_ids(self, roles: Dict[str, int]) -> Dict[str, List[int]]:
+        """Retourne les identifiants des employés par rôle, prédéfinis compris, dans l'ordre de création."""
+
+        ids = {role_name: [] for role_name in roles}
+        names = {role_id: role_name for role_name, role_id in roles.items()}
+        for employee_id, role_id in self.session.execute(
+            select(Employee.Id, Employee.RoleId).order_by(Employee.Id)
+        ).all():
+            ids[names[role_id]].append(employee_id)
+        return ids
+
+    def employee_rows(self, roles: Dict[str, int]) -> Iterator[Dict]:
+        password_hash = str(hash_password(SYNTHETIC_PASSWORD))
+        role_names = list(ROLE_SHARES)
+        role_weights = list(itertools.accumulate(ROLE_SHARES.values()))
+
+        for index in range(1, self.counts["employees"] + 1):
+            # les premiers employés couvrent tous les rôles, quel que soit le volume
+            if index <= len(role_names):
+                role_name = role_names[index - 1]
+            else:
+                role_name = self.random.choices(role_names, cum_weights=role_weights)[0]
+            yield {
+                "FirstName": self.random.choice(FIRST_NAMES),
+                "LastName": self.random.choice(LAST_NAMES),
+                "Email": f"{role_name.lower()}_s{index}@email.com",
+                "PasswordHash": password_hash,
+                "RoleId": roles[role_name],
+            }
+
+    def customer_rows(self, commercial_ids: List[int]) -> Iterator[Dict]:
+        weights = zipf_weights(len(commercial_ids), COMMERCIAL_SKEW)
+
+        for index in range(1, self.counts["customers"] + 1):
+            yield {
+                "CommercialId": self.choose(commercial_ids, weights),
+                "FirstName": self.random.choice(FIRST_NAMES),
+                "LastName": self.random.choice(LAST_NAMES),
+                "Email": f"customer_s{index}@email.com",
+                "PhoneNumber": f"06{self.random.randrange(10**8):08d}",
+                "Company": f"Company_{self.random.randrange(1, self.counts['customers'] // 10 + 2)}",
+            }
+
+    def contract_rows(self, customer_ids: List[int]) -> Iterator[Dict]:
+        weights = zipf_weights(len(customer_ids), CUSTOMER_SKEW)
+
+        for index in range(1, self.counts["contracts"] + 1):
+            amount = float(self.random.randrange(500, 50000, 50))
+            signed = self.random.random() < SIGNED_RATIO
+            if not signed:
+                outstanding = amount
+            elif self.random.random() < PAID_RATIO:
+                outstanding = 0.0
+            else:
+                outstanding = float(self.random.randrange(0, int(amount), 50))
+            yield {
+                "CustomerId": self.choose(customer_ids, weights),
+                "Title": f"Contract_s{index}",
+                "Amount": amount,
+                "AmountOutstanding": outstanding,
+                "ContractSigned": signed,
+            }
+
+    def event_rows(self, signed_ids: List[int], support_ids: List[int]) -> Iterator[Dict]:
+        if not signed_ids:
+            return
+        weights = zipf_weights(len(support_ids), SUPPORT_SKEW)
+
+        for index in range(1, self.counts["events"] + 1):
+            date_start = FIRST_EVENT_DATE + timedelta(days=self.random.randrange(3 * 365))
+            support_id = None
+            if support_ids and self.random.random() >= NO_SUPPORT_RATIO:
+                support_id = self.choose(support_ids, weights)
+            yield {
+                "ContractId": self.random.choice(signed_ids),
+                "EmployeeSupportId": support_id,
+                "Title": f"Event_s{index}",
+                "Notes": None,
+                "Location": self.random.choice(LOCATIONS),
+                "Attendees": self.random.randrange(10, 500),
+                "DateStart": date_start,
+                "DateEnd": date_start + timedelta(days=self.random.randrange(1, 4)),
+            }
+
+    def choose(self, ids: List[int], cum_weights: List[float]) -> int:
+        # random.choices recalcule les poids cumulés à chaque appel : recherche directe dans les poids cumulés
+        return ids[bisect.bisect(cum_weights, self.random.random() * cum_weights[-1], 0, len(ids) - 1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère des données synthétiques ( la base est réinitialisée ).")
+    parser.add_argument("rows", type=int, help="nombre total de lignes générées")
+    parser.add_argument("--seed", type=int, default=0, help="graine du générateur ( par défaut 0 )")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="lignes insérées par lot")
+    parser.add_argument("--url", help="URL d'une autre base que celle du fichier .env ( ex : sqlite:///charge.db )")
+    args = parser.parse_args()
+
+    logger = LoggerConfig().get_logger()
+    if args.url:
+        engine = create_engine(args.url)
+        session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    else:
+        session_config = DatabaseConfig(logger, lazy=False)
+        session = session_config.db_session_local()
+        engine = session_config.engine
+
+    generator = SyntheticDataGenerator(
+        session,
+        engine,
+        DatabaseConfig.BASE,
+        logger,
+        SyntheticDataGenerator.scale(args.rows),
+        args.seed,
+        args.chunk_size,
+    )
+    generator.generate()
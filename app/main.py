@@ -1,15 +1,16 @@
+import sys
 from typing import Tuple, Union
 
 from dotenv import load_dotenv
-from sqlalchemy import inspect
 
 from app.controllers.authentication import AuthenticationManager
-from app.controllers.menu_manage import MenuManage
-from app.dev.init_db import DatabaseInitializer
+from app.dev.startup_check import StartupCheck
 from app.models.database import DatabaseConfig
 from app.models.employee import Employee
 from app.models.role import Role
+from app.utils.action_profiler import ActionProfiler, profiling_enabled
 from app.utils.logger_config import LoggerConfig
+from app.utils.metrics import start_exporter
 from app.utils.sentry_logger import SentryLogger
 from app.utils.token_manage_json import delete_token
 from app.views.views import View
@@ -18,7 +19,7 @@ load_dotenv()
 
 
 def authenticate(
-    view: View, auth_manager: AuthenticationManager, session
+    view: View, auth_manager: AuthenticationManager, session, database_ready=None
 ) -> Tuple[Union[bool, None], Union[Employee, None], Union[Role, None]]:
     """
     Demande l'email et le mot de passe et Authentifie l'utilisateur.
@@ -27,10 +28,13 @@ def authenticate(
         view (View): L'objet de vue utilisé pour obtenir l'email et le mot de passe de l'utilisateur.
         auth_manager (AuthenticationManager): L'objet de gestion de l'authentification utilisé pour authentifier l'utilisateur.
         session: L'objet de session utilisé pour accéder à la base de données.
+        database_ready (Callable, optional): Attend la fin de la vérification de la base ( démarrage rapide ) et
+            retourne True si la base est utilisable. Appelé après la saisie, avant la première requête.
 
     Returns:
         Tuple[Union[bool, None], Union[Employee, None], Union[Role, None]]: Un tuple contenant le succès de l'authentification, l'objet Employee correspondant à l'utilisateur authentifié (s'il réussit) et le rôle de l'utilisateur (s'il réussit).
-            - Si l'utilisateur quitte en entrant un email vide, retourne ("quit", None, None).
+            - Si l'utilisateur quitte en entrant un email vide ou si la base n'est pas utilisable, retourne
+              ("quit", None, None).
             - Si l'utilisateur quitte en entrant un mot de passe vide, retourne ("retry", None, None).
             - Si l'authentification réussit, retourne (True, employee, role), où employee est l'objet Employee correspondant à l'utilisateur et role est son rôle.
             - Si l'authentification échoue, retourne (False, None, None).
@@ -42,13 +46,24 @@ def authenticate(
     password = view.return_choice("Entrez votre mot de passe ( vide pour annuler )", True)
 
     if password:
+        if database_ready is not None and not database_ready():
+            return "quit", None, None
         auth_success, employee, role = auth_manager.authenticate(email, password, session)
         return auth_success, employee, role
     else:
         return "retry", None, None
 
 
-def run_menu(view: View, auth_manager: AuthenticationManager, session, employee: Employee, role: Role, logger) -> None:
+def run_menu(
+    view: View,
+    auth_manager: AuthenticationManager,
+    session,
+    employee: Employee,
+    role: Role,
+    logger,
+    query_stats=None,
+    profiler=None,
+) -> None:
     """
     Lance le menu principale et génère le token de la session.
 
@@ -58,39 +73,33 @@ def run_menu(view: View, auth_manager: AuthenticationManager, session, employee:
         session : L'objet de session utilisé pour accéder à la base de données.
         employee (Employee): L'objet Employee représentant l'utilisateur actuellement connecté.
         role (Role): L'objet Role représentant le rôle de l'utilisateur actuellement connecté.
+        query_stats (QueryStats, optional): Les statistiques des requêtes SQL par action de menu.
+        profiler (ActionProfiler, optional): Le profileur des actions de menu ( mode profilage ).
     """
+    # import différé : les contrôleurs ne sont chargés qu'après la connexion
+    from app.controllers.menu_manage import MenuManage
+
     auth_manager.generate_jwt_token(employee.Id)
     logger.info(f"Connexion: {employee.Email}", exc_info=False)
-    app = MenuManage(view, auth_manager.verify_and_decode_jwt_token, delete_token, session, employee, role, logger)
+    app = MenuManage(
+        view,
+        auth_manager.verify_and_decode_jwt_token,
+        delete_token,
+        session,
+        employee,
+        role,
+        logger,
+        query_stats,
+        profiler,
+    )
     app.run()
 
 
-def check_tables_exist(engine, base):
-    """
-    Vérifie si toutes les tables définies dans les modèles SQLAlchemy existent dans la base de données.
-
-    Args:
-        engine: L'objet engine de SQLAlchemy.
-        base: L'objet base de SQLAlchemy contenant les modèles.
-
-    Returns:
-        bool: True si toutes les tables existent, False sinon.
-        list: Liste des tables manquantes si certaines tables sont absentes.
-    """
-    inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
-    expected_tables = base.metadata.tables.keys()
-
-    missing_tables = [table for table in expected_tables if table not in existing_tables]
-
-    if missing_tables:
-        return False, missing_tables
-    return True, []
-
-
-def main(view, logger, session, auth_manager):
+def main(view, logger, session, auth_manager, startup_check=None, query_stats=None, profiler=None):
     """
     Point d'entrée principal pour l'authentification en ligne de commande.
+
+    En démarrage rapide, l'écran de connexion est affiché pendant la vérification de la base ( startup_check ).
     """
     logger.info("Run App")
 
@@ -98,13 +107,15 @@ def main(view, logger, session, auth_manager):
         view.clear_screen()
         view.display_title_panel_color_fit("Connexion Epic-Events", "magenta")
 
-        auth_success, employee, role = authenticate(view, auth_manager, session)
+        auth_success, employee, role = authenticate(
+            view, auth_manager, session, startup_check.wait if startup_check else None
+        )
 
         if auth_success:
             if auth_success == "quit":
                 break
             elif auth_success != "retry":
-                run_menu(view, auth_manager, session, employee, role, logger)
+                run_menu(view, auth_manager, session, employee, role, logger, query_stats, profiler)
 
         else:
             logger.warning("Nom d'utilisateur ou mot de passe incorrect")
@@ -120,24 +131,28 @@ if __name__ == "__main__":
     # Config Loggers
     logger_config = LoggerConfig()
     logger = logger_config.get_logger()
-    sentry_logger = SentryLogger()
+    SentryLogger.init_sdk_background()
 
     view = View()
     auth_manager = AuthenticationManager(view, logger)
 
-    # Config session
+    # Config session ( créée à la première requête : l'écran de connexion s'affiche sans attendre la base )
     session_config = DatabaseConfig(logger)
-    session = session_config.db_session_local()
-    engine = session_config.engine
-    base = session_config.BASE
-
-    # Vérif tables base
-    check_table, missed_tables = check_tables_exist(engine, base)
-    if not check_table:
-        logger.error(f"Table(s) non trouvée(s) : {missed_tables}")
-        # Création des tables manquantes
-        init_db = DatabaseInitializer(session, engine, base, logger)
-        init_db.create_all_tables()
+    session = session_config.lazy_session()
+
+    # Vérif connexion, tables et migrations de schéma ( index ... ) non encore appliquées
+    startup_check = StartupCheck(session_config, logger)
+    if session_config.lazy:
+        # démarrage rapide : vérification pendant l'affichage de l'écran de connexion
+        startup_check.start()
+    elif not startup_check.run():
+        sys.exit(1)
+
+    # Export des métriques ( point d'accès HTTP local ou fichier pour node_exporter )
+    start_exporter(logger)
+
+    # Mode profilage des actions de menu ( python main.py --profile ou PROFILE_ACTIONS )
+    profiler = ActionProfiler(logger) if profiling_enabled(sys.argv[1:]) else None
 
     # Lance l'application
-    main(view, logger, session, auth_manager)
+    main(view, logger, session, auth_manager, startup_check, session_config.query_stats, profiler)
@@ -1,4 +1,4 @@
-from sqlalchemy import TIMESTAMP, Boolean, Column, Float, ForeignKey, Integer, String, func
+from sqlalchemy import TIMESTAMP, Boolean, Column, Float, ForeignKey, Index, Integer, String, false, func
 from sqlalchemy.orm import relationship, validates
 
 from app.models.customer import Customer
@@ -18,6 +18,7 @@ class Contract(DatabaseConfig.BASE):
         AmountOutstanding (float): Montant restant à payer pour le contrat.
         ContractSigned (bool): Indique si le contrat est signé ou non.
         DateCreated (datetime): Date de création du contrat dans la base de données.
+        Version (int): Numéro de version du contrat.
         Customer (Customer): Relation avec le client associé.
     """
 
@@ -30,6 +31,27 @@ class Contract(DatabaseConfig.BASE):
     AmountOutstanding = Column(Float, default=0)
     ContractSigned = Column(Boolean, default=False)
     DateCreated = Column(TIMESTAMP, server_default=func.current_timestamp())
+    # numéro de version incrémenté à chaque écriture : une modification concurrente est détectée ( StaleDataError )
+    Version = Column(Integer, nullable=False, server_default="1")
+
+    # index des filtres par rôle ( voir app/dev/migrations.py pour une base existante )
+    __table_args__ = (
+        Index("ix_Contract_CustomerId", CustomerId),
+        Index("ix_Contract_ContractSigned", ContractSigned),
+        Index(
+            "ix_Contract_CustomerId_not_signed",
+            CustomerId,
+            postgresql_where=ContractSigned == false(),
+            sqlite_where=ContractSigned == false(),
+        ),
+        Index(
+            "ix_Contract_CustomerId_outstanding",
+            CustomerId,
+            postgresql_where=AmountOutstanding != 0,
+            sqlite_where=AmountOutstanding != 0,
+        ),
+    )
+    __mapper_args__ = {"version_id_col": Version}
 
     CustomerRel = relationship("Customer", backref="ContractsRel")
 
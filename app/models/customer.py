@@ -1,7 +1,7 @@
 import re
 from email.utils import parseaddr
 
-from sqlalchemy import TIMESTAMP, Column, ForeignKey, Integer, String, func
+from sqlalchemy import TIMESTAMP, Column, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import relationship, validates
 
 from app.models.employee import Employee
@@ -23,6 +23,7 @@ class Customer(DatabaseConfig.BASE):
         Company (str): Nom de la société du client.
         DateCreated (datetime): Date de création du client dans la base de données.
         DateLastUpdate (datetime): Date de la dernière mise à jour du client dans la base de données.
+        Version (int): Numéro de version du client.
         Commercial (Employee): Relation avec l'employé commercial associé.
     """
 
@@ -41,6 +42,13 @@ class Customer(DatabaseConfig.BASE):
         server_default=func.current_timestamp(),
         onupdate=func.current_timestamp(),
     )
+    # numéro de version incrémenté à chaque écriture : une modification concurrente est détectée ( StaleDataError )
+    Version = Column(Integer, nullable=False, server_default="1")
+
+    # index des filtres par rôle ( voir app/dev/migrations.py pour une base existante )
+    __table_args__ = (Index("ix_Customer_CommercialId", CommercialId),)
+    __mapper_args__ = {"version_id_col": Version}
+
     CommercialRel = relationship("Employee", backref="CustomersRel")  # relation bidirectionnelles entre les classes
 
     @validates("Email")
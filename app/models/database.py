@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -7,6 +8,10 @@ from sqlalchemy import create_engine, exc
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.utils.logger_config import LoggerConfig
+from app.utils.metrics import REGISTRY
+
+from .database_pool import MonitoredQueuePool, PoolMonitor, pool_collector
+from .query_stats import QueryStats
 
 
 class DatabaseConfig:
@@ -23,15 +28,38 @@ class DatabaseConfig:
         db_password (str): Mot de passe de la base de données.
         db_host (str): Hôte de la base de données.
         db_url (str): URL de connexion à la base de données PostgreSQL.
+        lazy (bool): Démarrage rapide, l'engine n'est créé qu'à sa première utilisation et la connexion
+            n'est pas testée à la construction ( voir app/dev/startup_check.py ).
         engine (Engine): Engine SQLAlchemy pour interagir avec la base de données.
         db_session_local (sessionmaker): Sessionmaker pour gérer les sessions de la base de données.
+        pool_monitor (PoolMonitor): Relevé périodique des statistiques du pool de connexions dans data/db_pool.log.
+        query_stats (QueryStats): Statistiques des requêtes SQL par action de menu ( None si désactivées ).
     """
 
     BASE = declarative_base()
 
-    def __init__(self, logger):
+    # valeurs par défaut du pool de connexions si absentes du fichier .env
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_MAX_OVERFLOW = 10
+    DEFAULT_POOL_RECYCLE = 1800
+    DEFAULT_POOL_TIMEOUT = 30
+    DEFAULT_POOL_STATS_INTERVAL = 300
+    DEFAULT_SLOW_QUERY_MS = 200
+
+    def __init__(self, logger, lazy: bool = None):
+        """
+        Args:
+            logger (Logger): Logger pour enregistrer les messages de journalisation.
+            lazy (bool, optional): Démarrage rapide ( par défaut, variable d'environnement DB_FAST_START ou False ).
+        """
         self.logger = logger
+        self._engine = None
+        self._session_local = None
+        self._engine_lock = threading.Lock()
         self._load_env_variables()
+        if lazy is None:
+            lazy = os.environ.get("DB_FAST_START", "false").lower() in ("true", "1", "oui")
+        self.lazy = lazy
         self._configure_database()
 
     def _load_env_variables(self) -> None:
@@ -84,11 +112,16 @@ class DatabaseConfig:
                 raise ValueError("DB_USE must be either 'local' or 'render.com'")
 
             self.db_url = f"postgresql+psycopg2://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}?client_encoding=utf8"
-            self.engine = create_engine(self.db_url)
+            self.engine_options = self._pool_options()
+            self.pool_stats_interval = float(
+                os.environ.get("DB_POOL_STATS_INTERVAL", self.DEFAULT_POOL_STATS_INTERVAL)
+            )
 
-            self._test_connection()
+            self.query_stats = self._query_stats()
 
-            self.db_session_local = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            if not self.lazy:
+                self._create_engine()
+                self._test_connection()
 
         except KeyError as e:
             self.logger.error(f"Missing required environment variable: {e}")
@@ -100,6 +133,99 @@ class DatabaseConfig:
             self.logger.error(f"An unexpected error occurred: {e}")
             sys.exit(1)
 
+    def _create_engine(self) -> None:
+        """Crée l'engine, le relevé des statistiques de son pool, ses métriques et le sessionmaker."""
+
+        self._engine = create_engine(self.db_url, **self.engine_options)
+        if self.query_stats is not None:
+            self.query_stats.attach(self._engine)
+
+        # journal dédié sans console : les relevés du thread ne s'affichent pas au milieu des menus
+        pool_logger = LoggerConfig("epic_events.pool", "db_pool.log", console=False).get_logger()
+        self.pool_monitor = PoolMonitor(self._engine, pool_logger, self.pool_stats_interval)
+        self.pool_monitor.start()
+        REGISTRY.add_collector(pool_collector(self._engine))
+
+        self._session_local = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
+
+    @property
+    def engine(self):
+        """Engine SQLAlchemy, créé à la première utilisation en démarrage rapide."""
+
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._create_engine()
+        return self._engine
+
+    @property
+    def db_session_local(self):
+        """Sessionmaker lié à l'engine, créé avec celui-ci."""
+
+        self.engine  # crée l'engine et le sessionmaker si besoin
+        return self._session_local
+
+    def lazy_session(self) -> "LazySession":
+        """
+        Retourne une session créée à sa première utilisation.
+
+        En démarrage rapide, l'engine, le relevé du pool et les métriques ne sont ainsi créés qu'à la première
+        requête ( après la saisie de l'email et du mot de passe ) ou par la vérification de la base en arrière-plan.
+
+        Returns:
+            LazySession: La session.
+        """
+
+        return LazySession(lambda: self.db_session_local())
+
+    def _pool_options(self) -> dict:
+        """
+        Retourne les paramètres du pool de connexions lus dans les variables d'environnement.
+
+        - DB_POOL_SIZE : nombre de connexions conservées dans le pool.
+        - DB_MAX_OVERFLOW : nombre de connexions supplémentaires autorisées au-delà de DB_POOL_SIZE.
+        - DB_POOL_RECYCLE : âge maximal en secondes d'une connexion avant son remplacement.
+        - DB_POOL_PRE_PING : vérifie la connexion avant chaque utilisation ( connexions fermées par le serveur
+          après une période d'inactivité ).
+        - DB_POOL_TIMEOUT : délai d'attente maximal en secondes d'une connexion libre.
+
+        Returns:
+            dict: Les paramètres à passer à create_engine.
+
+        Raises:
+            ValueError: Si une valeur n'est pas un nombre.
+        """
+
+        return {
+            "poolclass": MonitoredQueuePool,
+            "pool_size": int(os.environ.get("DB_POOL_SIZE", self.DEFAULT_POOL_SIZE)),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", self.DEFAULT_MAX_OVERFLOW)),
+            "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", self.DEFAULT_POOL_RECYCLE)),
+            "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").lower() in ("true", "1", "oui"),
+            "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", self.DEFAULT_POOL_TIMEOUT)),
+        }
+
+    def _query_stats(self):
+        """
+        Crée l'instrumentation des requêtes SQL si elle est activée dans les variables d'environnement.
+
+        - DB_QUERY_STATS : nombre de requêtes et durées par action de menu, résumé dans data/slow_queries.log à la
+          déconnexion ( désactivé par défaut ).
+        - DB_SLOW_QUERY_MS : seuil en millisecondes des requêtes écrites dans data/slow_queries.log ( 0 : aucune ).
+
+        Returns:
+            Optional[QueryStats]: L'instrumentation, None si elle est désactivée.
+
+        Raises:
+            ValueError: Si le seuil n'est pas un nombre.
+        """
+
+        if os.environ.get("DB_QUERY_STATS", "false").lower() not in ("true", "1", "oui"):
+            return None
+        slow_threshold_ms = float(os.environ.get("DB_SLOW_QUERY_MS", self.DEFAULT_SLOW_QUERY_MS))
+        slow_logger = LoggerConfig("epic_events.sql", "slow_queries.log", console=False).get_logger()
+        return QueryStats(slow_logger, slow_threshold_ms)
+
     def _test_connection(self) -> None:
         """
         Teste la connexion à la base de données et enregistre un message de succès ou d'échec.
@@ -117,6 +243,33 @@ class DatabaseConfig:
             sys.exit(1)
 
 
+class LazySession:
+    """
+    Session SQLAlchemy créée à sa première utilisation ( voir `DatabaseConfig.lazy_session` ).
+
+    Les attributs et méthodes sont ceux de la session créée par `factory`. `close` ne crée pas la session.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
 # Utilisation de la classe DatabaseConfig
 if __name__ == "__main__":
     logger_config = LoggerConfig()
@@ -0,0 +1,187 @@
+import atexit
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class MonitoredQueuePool(QueuePool):
+    """
+    Pool de connexions ( QueuePool ) mesurant le temps d'attente pour obtenir une connexion.
+
+    Le temps mesuré comprend l'attente d'une connexion libre quand le pool est plein et la création
+    d'une nouvelle connexion ( dépassement ). Les statistiques d'attente sont remises à zéro à chaque relevé.
+
+    Attributs:
+        checkouts (int): Nombre de connexions obtenues depuis le dernier relevé.
+        wait_total (float): Temps d'attente cumulé en secondes depuis le dernier relevé.
+        wait_max (float): Temps d'attente maximal en secondes depuis le dernier relevé.
+        timeouts (int): Nombre d'attentes ayant dépassé pool_timeout depuis le dernier relevé.
+        totals (dict): Connexions obtenues, temps d'attente en secondes et dépassements de pool_timeout depuis la
+            création du pool ( jamais remis à zéro, voir `pool_collector` ).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats_lock = threading.Lock()
+        self.local = threading.local()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.totals = {"checkouts": 0, "wait_seconds": 0.0, "timeouts": 0}
+
+    def _do_get(self):
+        # QueuePool._do_get est récursif : seul l'appel le plus externe est mesuré
+        if getattr(self.local, "measuring", False):
+            return super()._do_get()
+
+        self.local.measuring = True
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self.stats_lock:
+                self.timeouts += 1
+                self.totals["timeouts"] += 1
+            raise
+        finally:
+            self.local.measuring = False
+
+        wait = time.perf_counter() - start
+        with self.stats_lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.totals["checkouts"] += 1
+            self.totals["wait_seconds"] += wait
+        return connection
+
+    def stats(self, reset: bool = True) -> dict:
+        """
+        Retourne l'état du pool et les statistiques d'attente depuis le dernier relevé.
+
+        Args:
+            reset (bool): Remet à zéro les statistiques d'attente. Par défaut True.
+
+        Returns:
+            dict: Taille, connexions libres, utilisées, en dépassement et statistiques d'attente ( en millisecondes ).
+        """
+
+        with self.stats_lock:
+            stats = {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": self.overflow(),
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+            if reset:
+                self.checkouts = 0
+                self.wait_total = 0.0
+                self.wait_max = 0.0
+                self.timeouts = 0
+        return stats
+
+
+# métriques du pool de connexions : ( nom, type, description )
+POOL_METRICS = {
+    "size": ("epic_events_db_pool_size", "gauge", "Nombre de connexions conservées dans le pool."),
+    "checked_in": ("epic_events_db_pool_checked_in", "gauge", "Connexions libres."),
+    "checked_out": ("epic_events_db_pool_checked_out", "gauge", "Connexions utilisées."),
+    "overflow": ("epic_events_db_pool_overflow", "gauge", "Connexions en dépassement de la taille du pool."),
+    "checkouts": ("epic_events_db_pool_checkouts_total", "counter", "Connexions obtenues du pool."),
+    "wait_seconds": (
+        "epic_events_db_pool_wait_seconds_total",
+        "counter",
+        "Temps d'attente cumulé pour obtenir une connexion.",
+    ),
+    "timeouts": ("epic_events_db_pool_timeouts_total", "counter", "Attentes ayant dépassé pool_timeout."),
+}
+
+
+def pool_collector(engine):
+    """
+    Retourne le collecteur des métriques du pool de connexions d'un engine ( voir MetricsRegistry.add_collector ).
+
+    Args:
+        engine (Engine): L'engine SQLAlchemy.
+
+    Returns:
+        Callable: Le collecteur, sans métrique si le pool n'est pas un MonitoredQueuePool.
+    """
+
+    def collect() -> list:
+        # le pool est recréé par l'engine après une déconnexion ( dispose ) : il est relu à chaque lecture
+        pool = engine.pool
+        if not isinstance(pool, MonitoredQueuePool):
+            return []
+        with pool.stats_lock:
+            values = dict(pool.totals)
+        values.update(
+            size=pool.size(), checked_in=pool.checkedin(), checked_out=pool.checkedout(), overflow=pool.overflow()
+        )
+        return [
+            (name, metric_type, documentation, [({}, values[key])])
+            for key, (name, metric_type, documentation) in POOL_METRICS.items()
+        ]
+
+    return collect
+
+
+class PoolMonitor:
+    """
+    Enregistre périodiquement dans le logger les statistiques du pool de connexions d'un engine.
+
+    Le relevé est fait par un thread dédié ( daemon ), arrêté à la fin du programme.
+
+    Attributs:
+        engine (Engine): L'engine SQLAlchemy dont le pool est surveillé.
+        logger (Logger): Le logger recevant les statistiques.
+        interval (float): Délai en secondes entre deux relevés.
+    """
+
+    def __init__(self, engine, logger, interval: float):
+        self.engine = engine
+        self.logger = logger
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        """Démarre le thread de relevé ( sans effet si le délai est nul ou si le thread est déjà démarré )."""
+
+        if self.interval <= 0 or self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.run, name="db-pool-monitor", daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def run(self) -> None:
+        """Boucle du thread : un relevé à chaque délai jusqu'à l'arrêt."""
+
+        while not self.stopped.wait(self.interval):
+            self.log_stats()
+
+    def log_stats(self) -> None:
+        """Enregistre un relevé des statistiques du pool dans le logger."""
+
+        # le pool est recréé par l'engine après une déconnexion ( dispose ) : il est relu à chaque relevé
+        pool = self.engine.pool
+        if isinstance(pool, MonitoredQueuePool):
+            stats = pool.stats()
+            self.logger.debug("Pool de connexions : " + ", ".join(f"{key}={value}" for key, value in stats.items()))
+        else:
+            self.logger.debug(f"Pool de connexions : {pool.status()}")
+
+    def stop(self) -> None:
+        """Arrête le thread de relevé."""
+
+        self.stopped.set()
+        thread, self.thread = self.thread, None
+        if thread is not None:
+            thread.join()
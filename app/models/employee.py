@@ -1,7 +1,8 @@
+import os
 import re
 from email.utils import parseaddr
+from typing import Optional
 
-import bcrypt
 from sqlalchemy import TIMESTAMP, Column, ForeignKey, Integer, String, func
 from sqlalchemy.orm import relationship, validates
 
@@ -9,6 +10,71 @@ from app.models.role import Role
 
 from .database import DatabaseConfig
 
+# coût de bcrypt par défaut ( 2^12 itérations, celui de bcrypt.gensalt )
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
+def bcrypt_rounds() -> int:
+    """Coût de bcrypt des nouveaux hashs ( variable d'environnement BCRYPT_ROUNDS, de 4 à 31 )."""
+
+    return int(os.environ.get("BCRYPT_ROUNDS", DEFAULT_BCRYPT_ROUNDS))
+
+
+def hash_rounds(password_hash: str) -> int:
+    """Retourne le coût d'un hash bcrypt ( "$2b$12$..." : 12 )."""
+
+    return int(password_hash.split("$")[2])
+
+
+class HashedPassword(str):
+    """Hash bcrypt déjà calculé : affecté à `Employee.PasswordHash`, il est enregistré tel quel."""
+
+
+def check_password(password: str) -> None:
+    """
+    Vérifie les règles du mot de passe.
+
+    Args:
+        password (str): Mot de passe à vérifier.
+
+    Raises:
+        ValueError: Si le mot de passe ne respecte pas une règle.
+    """
+
+    if not password:
+        raise ValueError("Le mot de passe ne peut pas être vide")
+    if len(password) < 8:
+        raise ValueError("Le mot de passe doit contenir au moins 8 caractères")
+    if not re.search(r"[A-Z]", password):
+        raise ValueError("Le mot de passe doit contenir au moins une lettre majuscule")
+    if not re.search(r"[a-z]", password):
+        raise ValueError("Le mot de passe doit contenir au moins une lettre minuscule")
+    if not re.search(r"\d", password):
+        raise ValueError("Le mot de passe doit contenir au moins un chiffre")
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> HashedPassword:
+    """
+    Hashe un mot de passe avec bcrypt.
+
+    Args:
+        password (str): Mot de passe à hasher.
+        rounds (int, optional): Le coût de bcrypt ( par défaut, voir `bcrypt_rounds` ).
+
+    Returns:
+        HashedPassword: Le hash du mot de passe.
+    """
+
+    import bcrypt  # import différé : chargé au premier mot de passe et non au lancement
+
+    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds or bcrypt_rounds()))
+
+    # Postgre : Postgres comme DDBB et son driver, ou le système DDBB, encode toujours une chaîne déjà encodée.
+    # Le deuxième processus d'encodage crée un hash invalide
+    # Décoder d'abord le hash en utf8 avant de l'enregistrer dans le DDBB.
+
+    return HashedPassword(password_hash.decode("utf8"))
+
 
 class Employee(DatabaseConfig.BASE):
     """
@@ -27,7 +93,7 @@ class Employee(DatabaseConfig.BASE):
 
     __tablename__ = "Employee"
 
-    Id = Column(Integer, primary_key=True, autoincrement=True)  # mettre index=True sur les champs ???
+    Id = Column(Integer, primary_key=True, autoincrement=True)
     FirstName = Column(String(100))
     LastName = Column(String(100))
     Email = Column(String(100), unique=True, nullable=False)
@@ -65,7 +131,7 @@ class Employee(DatabaseConfig.BASE):
 
         Args:
             key (str): Clé de validation (password_hash).
-            password (str): Mot de passe à valider et hasher.
+            password (str): Mot de passe à valider et hasher, ou hash déjà calculé ( HashedPassword ).
 
         Returns:
             str: Le hash du mot de passe.
@@ -73,25 +139,12 @@ class Employee(DatabaseConfig.BASE):
             exceptions avec messages d'erreurs
         """
 
-        # régles du mot de passe
-        if not password:
-            raise ValueError("Le mot de passe ne peut pas être vide")
-        if len(password) < 8:
-            raise ValueError("Le mot de passe doit contenir au moins 8 caractères")
-        if not re.search(r"[A-Z]", password):
-            raise ValueError("Le mot de passe doit contenir au moins une lettre majuscule")
-        if not re.search(r"[a-z]", password):
-            raise ValueError("Le mot de passe doit contenir au moins une lettre minuscule")
-        if not re.search(r"\d", password):
-            raise ValueError("Le mot de passe doit contenir au moins un chiffre")
-
-        password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-
-        # Postgre : Postgres comme DDBB et son driver, ou le système DDBB, encode toujours une chaîne déjà encodée.
-        # Le deuxième processus d'encodage crée un hash invalide
-        # Décoder d'abord le hash en utf8 avant de l'enregistrer dans le DDBB.
+        # hash déjà calculé ( création groupée, voir app/utils/password_hashing.py )
+        if isinstance(password, HashedPassword):
+            return str(password)
 
-        return password_hash.decode("utf8")
+        check_password(password)
+        return str(hash_password(password))
 
     def verify_password(self, password):
         """
@@ -103,4 +156,19 @@ class Employee(DatabaseConfig.BASE):
         Returns:
             bool: True si le mot de passe correspond, False sinon.
         """
+        import bcrypt  # import différé : chargé au premier mot de passe et non au lancement
+
         return bcrypt.checkpw(password.encode("utf-8"), self.PasswordHash.encode("utf-8"))
+
+    def needs_rehash(self, rounds: Optional[int] = None) -> bool:
+        """
+        Indique si le hash du mot de passe a été calculé avec un autre coût que celui de la configuration.
+
+        Args:
+            rounds (int, optional): Le coût attendu ( par défaut, voir `bcrypt_rounds` ).
+
+        Returns:
+            bool: True si le mot de passe doit être hashé à nouveau.
+        """
+
+        return hash_rounds(self.PasswordHash) != (rounds or bcrypt_rounds())
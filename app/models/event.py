@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import TIMESTAMP, Column, Date, ForeignKey, Integer, String, Text, func
+from sqlalchemy import TIMESTAMP, Column, Date, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import relationship, validates
 
 from app.models.contract import Contract
@@ -24,6 +24,7 @@ class Event(DatabaseConfig.BASE):
         DateStart (datetime.date): Date de début de l'événement.
         DateEnd (datetime.date): Date de fin de l'événement.
         DateCreated (datetime): Date de création de l'événement dans la base de données.
+        Version (int): Numéro de version de l'événement.
         Contract (Contract): Relation avec le contrat associé.
         EmployeeSupport (Employee): Relation avec l'employé support associé.
     """
@@ -40,6 +41,22 @@ class Event(DatabaseConfig.BASE):
     DateStart = Column(Date)
     DateEnd = Column(Date)
     DateCreated = Column(TIMESTAMP, server_default=func.current_timestamp())
+    # numéro de version incrémenté à chaque écriture : une modification concurrente est détectée ( StaleDataError )
+    Version = Column(Integer, nullable=False, server_default="1")
+
+    # index des filtres par rôle ( voir app/dev/migrations.py pour une base existante )
+    __table_args__ = (
+        Index("ix_Event_ContractId", ContractId),
+        Index("ix_Event_EmployeeSupportId", EmployeeSupportId),
+        # évènements sans support, parcourus par Id ( liste paginée : Id > ? ORDER BY Id )
+        Index(
+            "ix_Event_no_support",
+            Id,
+            postgresql_where=EmployeeSupportId.is_(None),
+            sqlite_where=EmployeeSupportId.is_(None),
+        ),
+    )
+    __mapper_args__ = {"version_id_col": Version}
 
     ContractRel = relationship("Contract", backref="EventsRel")
     EmployeeSupportRel = relationship("Employee", backref="EventsRel")
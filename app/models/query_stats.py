@@ -0,0 +1,173 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+# action des requêtes exécutées hors d'une action de menu ( connexion, composition des menus ... )
+NO_ACTION = "hors menu"
+# bornes supérieures des classes de l'histogramme des durées, en millisecondes
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf"))
+
+
+class ActionStats:
+    """
+    Statistiques des requêtes d'une action de menu.
+
+    Attributs:
+        calls (int): Nombre d'exécutions de l'action.
+        statements (int): Nombre de requêtes.
+        total_ms (float): Durée cumulée des requêtes en millisecondes.
+        max_ms (float): Durée de la requête la plus longue en millisecondes.
+        buckets (list): Nombre de requêtes par classe de durée ( voir LATENCY_BUCKETS_MS ).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.statements = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def add(self, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                break
+
+
+class QueryStats:
+    """
+    Instrumentation des requêtes SQL d'un engine, par action de menu.
+
+    Les évènements before/after_cursor_execute de l'engine mesurent chaque requête et l'attribuent à l'action
+    en cours ( `action`, appelé par `MenuManage.dispatch` ) : nombre de requêtes, durée cumulée, durée maximale et
+    histogramme des durées. Les requêtes dont la durée dépasse le seuil et le résumé des statistiques
+    ( `log_summary` ) sont écrits dans le journal des requêtes lentes.
+
+    Attributs:
+        slow_logger (Logger): Le journal des requêtes lentes et des résumés ( None : non écrit ).
+        slow_threshold_ms (float): Seuil des requêtes lentes en millisecondes ( 0 : aucune requête lente ).
+        actions (dict): Les statistiques par nom d'action ( ActionStats ).
+    """
+
+    def __init__(self, slow_logger=None, slow_threshold_ms: float = 0):
+        self.slow_logger = slow_logger
+        self.slow_threshold_ms = slow_threshold_ms
+        self.actions = {}
+        self.lock = threading.Lock()
+        self.current_action = contextvars.ContextVar("query_stats_action", default=NO_ACTION)
+
+    def attach(self, engine) -> None:
+        """Instrumente les requêtes d'un engine."""
+
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+        event.listen(engine, "handle_error", self.handle_error)
+
+    def detach(self, engine) -> None:
+        """Retire l'instrumentation d'un engine."""
+
+        event.remove(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self.after_cursor_execute)
+        event.remove(engine, "handle_error", self.handle_error)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # début de la requête, conservé par connexion
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_stats_start"].pop()) * 1000
+        action = self.current_action.get()
+
+        with self.lock:
+            stats = self.actions.get(action)
+            if stats is None:
+                stats = self.actions[action] = ActionStats()
+            stats.add(elapsed_ms)
+
+        if self.slow_logger is not None and 0 < self.slow_threshold_ms <= elapsed_ms:
+            # requête sur une ligne, sans ses paramètres ( données personnelles )
+            self.slow_logger.warning(f"{elapsed_ms:.1f} ms [{action}] {' '.join(statement.split())}")
+
+    def handle_error(self, exception_context):
+        # requête en erreur : after_cursor_execute n'est pas appelé
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_stats_start"):
+            conn.info["query_stats_start"].pop()
+
+    @contextmanager
+    def action(self, name: str):
+        """
+        Attribue à une action de menu les requêtes exécutées dans le bloc.
+
+        Args:
+            name (str): Le nom de l'action ( élément de menu choisi ).
+        """
+
+        with self.lock:
+            stats = self.actions.get(name)
+            if stats is None:
+                stats = self.actions[name] = ActionStats()
+            stats.calls += 1
+
+        token = self.current_action.set(name)
+        try:
+            yield
+        finally:
+            self.current_action.reset(token)
+
+    def summary(self, reset: bool = False) -> list:
+        """
+        Retourne les statistiques par action, de la plus coûteuse à la moins coûteuse ( durée cumulée ).
+
+        Args:
+            reset (bool): Remet les statistiques à zéro. Par défaut False.
+
+        Returns:
+            list: Une ligne par action : nom, exécutions, requêtes, requêtes par exécution, durées cumulée,
+                moyenne et maximale en millisecondes, nombre de requêtes par classe de durée ( LATENCY_BUCKETS_MS ).
+        """
+
+        with self.lock:
+            rows = [
+                {
+                    "action": name,
+                    "calls": stats.calls,
+                    "statements": stats.statements,
+                    "statements_per_call": round(stats.statements / stats.calls, 1) if stats.calls else None,
+                    "total_ms": round(stats.total_ms, 1),
+                    "avg_ms": round(stats.total_ms / stats.statements, 2) if stats.statements else 0.0,
+                    "max_ms": round(stats.max_ms, 1),
+                    "buckets": list(stats.buckets),
+                }
+                for name, stats in self.actions.items()
+            ]
+            if reset:
+                self.actions = {}
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def log_summary(self, logger=None, reset: bool = True) -> None:
+        """
+        Enregistre le résumé des statistiques dans un logger ( à la déconnexion ).
+
+        Args:
+            logger (Logger, optional): Le logger. Par défaut, le journal des requêtes lentes : le résumé n'est pas
+                affiché sur la console.
+            reset (bool): Remet les statistiques à zéro. Par défaut True.
+        """
+
+        logger = logger if logger is not None else self.slow_logger
+        rows = self.summary(reset)
+        if not rows or logger is None:
+            return
+        lines = [
+            f"{row['action']} : {row['calls']} exécution(s), {row['statements']} requête(s), "
+            f"{row['total_ms']} ms ( moyenne {row['avg_ms']} ms, max {row['max_ms']} ms )"
+            for row in rows
+        ]
+        logger.info("Requêtes SQL par action :\n  " + "\n  ".join(lines))
@@ -30,6 +30,11 @@ class Role(DatabaseConfig.BASE):
     Can_access_all_Event = Column(Boolean, nullable=False, default=False)
     Can_access_support_Event = Column(Boolean, nullable=False, default=False)
     DateCreated = Column(TIMESTAMP, server_default=func.current_timestamp())
+    # incrémentée à chaque écriture du rôle ( voir app/permissions/role_cache.py ) : une modification concurrente
+    # est détectée ( StaleDataError ) au lieu d'écrire deux fois la même révision
+    Revision = Column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": Revision}
 
     @classmethod
     def get_roles_list(cls, session):
@@ -0,0 +1,20 @@
+from sqlalchemy import TIMESTAMP, Column, Integer, String, func
+
+from .database import DatabaseConfig
+
+
+class SchemaVersion(DatabaseConfig.BASE):
+    """
+    Représente une migration appliquée à la base de données ( voir app/dev/migrations.py ).
+
+    Attributes:
+        Version (int): Numéro de la migration.
+        Description (str): Description de la migration.
+        DateApplied (datetime): Date d'application de la migration.
+    """
+
+    __tablename__ = "SchemaVersion"
+
+    Version = Column(Integer, primary_key=True, autoincrement=False)
+    Description = Column(String(200), nullable=False)
+    DateApplied = Column(TIMESTAMP, server_default=func.current_timestamp())
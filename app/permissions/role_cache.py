@@ -0,0 +1,79 @@
+import os
+import time
+
+from app.models.role import Role
+
+DEFAULT_ROLE_CACHE_TTL = 60
+
+
+class RoleCache:
+    """
+    Cache des permissions du rôle de l'utilisateur connecté, rafraîchi uniquement quand le rôle a changé.
+
+    Le rôle est détaché de la session : ses permissions restent lisibles sans requête après les commits.
+    La révision du rôle ( Role.Revision, incrémentée à chaque modification ) est comparée :
+    - immédiatement après une modification de rôle dans ce processus ( compteur `generation` ),
+    - au plus tard toutes les `ttl` secondes pour les modifications faites par un autre utilisateur.
+    Les permissions ne sont rechargées que si la révision a changé.
+
+    Attributs:
+        generation (int): Compteur des modifications de rôles dans le processus ( attribut de classe ).
+        role (Role): Le rôle de l'utilisateur connecté, détaché de la session.
+        revision (int): La révision du rôle en cache.
+        ttl (float): Délai maximal en secondes entre deux vérifications de la révision.
+    """
+
+    generation = 0
+
+    def __init__(self, session, role, ttl: float = None):
+        self.role = role
+        self.revision = role.Revision
+        self.ttl = ttl if ttl is not None else float(os.environ.get("ROLE_CACHE_TTL", DEFAULT_ROLE_CACHE_TTL))
+        self.known_generation = RoleCache.generation
+        self.checked_at = time.monotonic()
+        session.expunge(role)
+
+    @classmethod
+    def bump(cls) -> None:
+        """Signale la modification ou la suppression d'un rôle dans ce processus."""
+        cls.generation += 1
+
+    def check(self, session) -> bool:
+        """
+        Vérifie la révision du rôle si nécessaire et recharge ses permissions si elle a changé.
+
+        Args:
+            session (Session): La session SQLAlchemy.
+
+        Returns:
+            bool: True si le rôle est à jour, False si le rôle n'existe plus.
+        """
+
+        if self.known_generation == RoleCache.generation and time.monotonic() - self.checked_at < self.ttl:
+            return True
+
+        self.known_generation = RoleCache.generation
+        self.checked_at = time.monotonic()
+
+        revision = session.query(Role.Revision).filter(Role.Id == self.role.Id).scalar()
+        if revision is None:
+            return False
+
+        if revision != self.revision:
+            self.reload(session)
+        return True
+
+    def reload(self, session) -> None:
+        """
+        Recharge les permissions du rôle depuis la base de données dans l'instance en cache.
+
+        L'instance est mise à jour sur place : les gestionnaires qui la partagent voient les nouvelles permissions.
+
+        Args:
+            session (Session): La session SQLAlchemy.
+        """
+
+        fresh = session.get(Role, self.role.Id, populate_existing=True)
+        for column in Role.__table__.columns:
+            setattr(self.role, column.key, getattr(fresh, column.key))
+        self.revision = fresh.Revision
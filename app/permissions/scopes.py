@@ -0,0 +1,105 @@
+from sqlalchemy import false
+
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+
+from .permissions import Permissions
+
+
+class Scopes:
+    """
+    Construit les requêtes limitées aux éléments accessibles par l'utilisateur connecté selon son rôle.
+
+    Le périmètre est exprimé par un critère SQL (WHERE / EXISTS) ajouté aux requêtes, de sorte que la base
+    ne renvoie que les éléments autorisés : vérifier l'accès à un identifiant revient à une seule requête indexée
+    au lieu de charger toute la liste des éléments autorisés.
+
+    - Rôles avec accès total (Can_access_all_*) : aucun filtre.
+    - Commercial : éléments liés à ses clients (Customer.CommercialId).
+    - Support : évènements qui lui sont attribués (Event.EmployeeSupportId).
+    - Autres rôles : aucun élément.
+
+    Attributs:
+        role (Role): Le rôle de l'utilisateur connecté.
+        user_id (int): L'Id de l'utilisateur connecté.
+        permissions (Permissions): Instance de la classe Permissions.
+    """
+
+    def __init__(self, role, user_id: int):
+        self.role = role
+        self.user_id = user_id
+        self.permissions = Permissions()
+
+    def criterion(self, model):
+        """
+        Retourne le critère SQL limitant un modèle au périmètre de l'utilisateur.
+
+        Args:
+            model (Type): La classe du modèle (Event, Contract ou Customer).
+
+        Returns:
+            ColumnElement ou None: Le critère à ajouter à la requête, None si l'accès n'est pas restreint.
+
+        Raises:
+            ValueError: Si le modèle n'a pas de périmètre défini.
+        """
+
+        if model is Event:
+            return self.event_criterion()
+        elif model is Contract:
+            return self.contract_criterion()
+        elif model is Customer:
+            return self.customer_criterion()
+        else:
+            raise ValueError(f"Unknown model: {model}")
+
+    def event_criterion(self):
+        """Critère des évènements accessibles."""
+
+        if self.permissions.all_event(self.role):
+            return None
+        elif self.permissions.role_name(self.role) == "Commercial":
+            return Event.ContractRel.has(Contract.CustomerRel.has(Customer.CommercialId == self.user_id))
+        elif self.permissions.role_name(self.role) == "Support":
+            return Event.EmployeeSupportId == self.user_id
+        return false()
+
+    def contract_criterion(self):
+        """Critère des contrats accessibles."""
+
+        if self.permissions.all_contract(self.role):
+            return None
+        elif self.permissions.role_name(self.role) == "Commercial":
+            return Contract.CustomerRel.has(Customer.CommercialId == self.user_id)
+        return false()
+
+    def customer_criterion(self):
+        """Critère des clients accessibles."""
+
+        if self.permissions.all_customer(self.role):
+            return None
+        elif self.permissions.role_name(self.role) == "Commercial":
+            return Customer.CommercialId == self.user_id
+        return false()
+
+    def query(self, session, model):
+        """
+        Retourne une requête sur un modèle limitée au périmètre de l'utilisateur.
+
+        La requête n'est pas exécutée : elle peut être complétée (filtres, options de chargement, pagination)
+        ou passée à `UtilsManage.valid_id` pour vérifier un identifiant.
+
+        Args:
+            session (Session): La session SQLAlchemy.
+            model (Type): La classe du modèle (Event, Contract ou Customer).
+
+        Returns:
+            Query: La requête limitée au périmètre de l'utilisateur.
+        """
+
+        query = session.query(model)
+        criterion = self.criterion(model)
+        if criterion is not None:
+            query = query.filter(criterion)
+        return query
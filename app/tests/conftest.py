@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.event  # noqa: F401  (enregistre tous les modèles dans la metadata)
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee
+from app.models.role import Role
+
+
+@pytest.fixture()
+def sqlite_engine():
+    """
+    Fixture fournissant un engine SQLite en mémoire avec toutes les tables du modèle.
+
+    Permet d'exécuter de vraies requêtes SQL sans dépendre de la base PostgreSQL distante.
+
+    Yields:
+        sqlalchemy.engine.Engine: L'engine SQLite.
+    """
+    engine = create_engine("sqlite://")
+    DatabaseConfig.BASE.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def sqlite_session(sqlite_engine):
+    """
+    Fixture fournissant une session SQLAlchemy liée à la base SQLite en mémoire.
+
+    Yields:
+        sqlalchemy.orm.Session: Une session SQLAlchemy.
+    """
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture()
+def base_data(sqlite_session):
+    """
+    Crée un rôle commercial, un rôle support et un employé de chaque rôle.
+
+    Returns:
+        tuple: (commercial_id, support_id)
+    """
+    commercial_role = Role(RoleName="Commercial", Can_ru_Event=True)
+    support_role = Role(RoleName="Support", Can_ru_Event=True)
+    sqlite_session.add_all([commercial_role, support_role])
+    sqlite_session.flush()
+
+    commercial = Employee(
+        FirstName="commercial",
+        LastName="c",
+        Email="c@email.com",
+        PasswordHash="Password123",
+        RoleId=commercial_role.Id,
+    )
+    support = Employee(
+        FirstName="support", LastName="s", Email="s@email.com", PasswordHash="Password123", RoleId=support_role.Id
+    )
+    sqlite_session.add_all([commercial, support])
+    sqlite_session.commit()
+    return commercial.Id, support.Id
@@ -0,0 +1,32 @@
+"""Fonctions partagées par les tests d'intégration et de performance."""
+
+from sqlalchemy import event
+
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+
+
+def add_rows(session, commercial_id, support_id, start, stop):
+    """Ajoute un client, un contrat et un évènement par indice de [start, stop[."""
+    for i in range(start, stop):
+        customer = Customer(FirstName=f"customer_{i}", Email=f"customer_{i}@email.com", CommercialId=commercial_id)
+        contract = Contract(Title=f"contract_{i}", CustomerRel=customer, ContractSigned=True)
+        session.add(Event(Title=f"event_{i}", ContractRel=contract, EmployeeSupportId=support_id))
+    session.commit()
+    session.expunge_all()
+
+
+def count_statements(engine, func):
+    """Exécute `func` et retourne le nombre de requêtes SQL émises."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
@@ -0,0 +1,194 @@
+import io
+from datetime import date
+
+import pytest
+
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.employee import Employee
+from app.models.event import Event
+from app.permissions.scopes import Scopes
+from app.tests.helpers import add_rows, count_statements
+from app.utils.bulk_import import BulkImporter
+
+
+def run_import(session, model, text, **kwargs):
+    importer = BulkImporter(session, model, **kwargs)
+    return importer.run(io.StringIO(text))
+
+
+def test_customers_invalid_rows_are_reported(sqlite_session, base_data):
+    commercial_id, _ = base_data
+    text = (
+        "FirstName,Email,CommercialId\n"
+        f"Jean,JEAN@email.com,{commercial_id}\n"
+        f"Paul,pas-un-email,{commercial_id}\n"
+        "Marie,marie@email.com,\n"
+        f"Luc,luc@email.com,{commercial_id}\n"
+    )
+
+    report = run_import(sqlite_session, Customer, text)
+
+    assert report.inserted == 2
+    assert report.errors == [(3, "Adresse email invalide"), (4, "CommercialId est obligatoire.")]
+    emails = [customer.Email for customer in sqlite_session.query(Customer).order_by(Customer.Id)]
+    assert emails == ["jean@email.com", "luc@email.com"]
+
+
+def test_customers_default_commercial(sqlite_session, base_data):
+    commercial_id, _ = base_data
+
+    report = run_import(sqlite_session, Customer, "Email\na@email.com\n", defaults={"CommercialId": commercial_id})
+
+    assert report.inserted == 1
+    assert sqlite_session.query(Customer).one().CommercialId == commercial_id
+
+
+def test_contracts_amounts_and_references(sqlite_session, base_data):
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 1)
+    customer_id = sqlite_session.query(Customer.Id).scalar()
+    text = (
+        "Title,CustomerId,Amount,AmountOutstanding,ContractSigned\n"
+        f"c1,{customer_id},100,50,oui\n"
+        f"c2,{customer_id},100,150,non\n"
+        f"c3,{customer_id},-5,,non\n"
+        "c4,999,100,0,non\n"
+        f"c5,{customer_id},,,\n"
+    )
+
+    report = run_import(sqlite_session, Contract, text)
+
+    assert report.inserted == 2
+    assert report.errors == [
+        (3, "AmountOutstanding ne peut pas être supérieur à Amount."),
+        (4, "Amount doit être positif."),
+        (5, "CustomerId : aucun élément Customer d'Id 999."),
+    ]
+    c1 = sqlite_session.query(Contract).filter_by(Title="c1").one()
+    assert (c1.Amount, c1.AmountOutstanding, c1.ContractSigned) == (100.0, 50.0, True)
+    c5 = sqlite_session.query(Contract).filter_by(Title="c5").one()
+    assert (c5.Amount, c5.AmountOutstanding, c5.ContractSigned, c5.Version) == (0, 0, False, 1)
+
+
+def test_events_dates_and_attendees(sqlite_session, base_data):
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 1)
+    contract_id = sqlite_session.query(Contract.Id).scalar()
+    text = (
+        "Title,ContractId,Attendees,DateStart,DateEnd\n"
+        f"e1,{contract_id},10,01-06-2025,03-06-2025\n"
+        f"e2,{contract_id},10,03-06-2025,01-06-2025\n"
+        f"e3,{contract_id},beaucoup,,\n"
+        f"e4,{contract_id},10,2025-06-01,\n"
+    )
+
+    report = run_import(sqlite_session, Event, text)
+
+    assert report.inserted == 1
+    assert [line for line, _ in report.errors] == [3, 4, 5]
+    assert report.errors[0][1] == "La date de fin doit être après la date de début"
+    event = sqlite_session.query(Event).filter_by(Title="e1").one()
+    assert (event.DateStart, event.DateEnd, event.Attendees) == (date(2025, 6, 1), date(2025, 6, 3), 10)
+
+
+@pytest.fixture()
+def commercial_scopes(sqlite_session, base_data):
+    """
+    Ajoute un second commercial avec un client, un contrat signé et un évènement, ainsi qu'un contrat non signé du
+    commercial de `base_data`.
+
+    Returns:
+        tuple: ( périmètre du commercial de `base_data`, ses identifiants, ceux du second commercial )
+    """
+    commercial_id, support_id = base_data
+    commercial = sqlite_session.get(Employee, commercial_id)
+    other = Employee(FirstName="other", Email="other@email.com", PasswordHash="Password123", RoleId=commercial.RoleId)
+    sqlite_session.add(other)
+    sqlite_session.commit()
+    other_id = other.Id
+
+    add_rows(sqlite_session, commercial_id, support_id, 0, 1)
+    add_rows(sqlite_session, other_id, support_id, 1, 2)
+    own_customer = sqlite_session.query(Customer).filter_by(CommercialId=commercial_id).one()
+    sqlite_session.add(Contract(Title="unsigned", CustomerId=own_customer.Id, ContractSigned=False))
+    sqlite_session.commit()
+
+    def ids(owner_id):
+        customer = sqlite_session.query(Customer).filter_by(CommercialId=owner_id).one()
+        contract = sqlite_session.query(Contract).filter_by(CustomerId=customer.Id, ContractSigned=True).one()
+        return {"customer": customer.Id, "contract": contract.Id}
+
+    own = ids(commercial_id)
+    own["unsigned"] = sqlite_session.query(Contract.Id).filter_by(Title="unsigned").scalar()
+    scopes = Scopes(sqlite_session.get(Employee, commercial_id).RoleRel, commercial_id)
+    return scopes, own, ids(other_id)
+
+
+def test_contracts_outside_scope_are_rejected(sqlite_session, commercial_scopes):
+    scopes, own, other = commercial_scopes
+    text = f"Title,CustomerId\nmine,{own['customer']}\ntheirs,{other['customer']}\n"
+
+    report = run_import(sqlite_session, Contract, text, scopes=scopes)
+
+    assert report.inserted == 1
+    assert report.errors == [(3, f"CustomerId : élément Customer d'Id {other['customer']} non autorisé.")]
+    assert sqlite_session.query(Contract).filter_by(Title="theirs").count() == 0
+
+
+def test_events_on_unsigned_or_other_contracts_are_rejected(sqlite_session, base_data, commercial_scopes):
+    _, support_id = base_data
+    scopes, own, other = commercial_scopes
+    text = (
+        "Title,ContractId,EmployeeSupportId\n"
+        f"signed,{own['contract']},\n"
+        f"unsigned,{own['unsigned']},\n"
+        f"theirs,{other['contract']},\n"
+        f"support,{own['contract']},{support_id}\n"
+    )
+
+    report = run_import(sqlite_session, Event, text, scopes=scopes)
+
+    assert report.inserted == 1
+    assert report.errors == [
+        (5, "EmployeeSupportId : vous n'avez pas le droit d'affecter le support d'un évènement."),
+        (3, f"ContractId : élément Contract d'Id {own['unsigned']} non autorisé."),
+        (4, f"ContractId : élément Contract d'Id {other['contract']} non autorisé."),
+    ]
+    titles = [title for (title,) in sqlite_session.query(Event.Title)]
+    assert "signed" in titles
+    assert not {"unsigned", "theirs", "support"} & set(titles)
+
+
+def test_unknown_column_is_rejected(sqlite_session, base_data):
+    with pytest.raises(ValueError, match="Colonnes inconnues : Nom"):
+        run_import(sqlite_session, Customer, "Nom,Email\nx,x@email.com\n")
+
+
+def test_duplicates_rejected_row_by_row(sqlite_session, base_data):
+    """Un lot refusé par la base est inséré à nouveau ligne par ligne : seuls les doublons sont rejetés."""
+
+    commercial_id, _ = base_data
+    run_import(sqlite_session, Customer, f"Email,CommercialId\nold@email.com,{commercial_id}\n")
+    text = "Email,CommercialId\n" + "".join(
+        f"{email}@email.com,{commercial_id}\n" for email in ("a", "old", "b", "a", "c")
+    )
+
+    report = run_import(sqlite_session, Customer, text, chunk_size=10)
+
+    assert report.inserted == 3
+    assert [line for line, _ in report.errors] == [3, 5]
+    assert sqlite_session.query(Customer).count() == 4
+
+
+def test_rows_are_inserted_in_chunks(sqlite_engine, sqlite_session, base_data):
+    """Une requête executemany par lot et une requête par clé étrangère et par lot, sans requête par ligne."""
+
+    commercial_id, _ = base_data
+    text = "Email,CommercialId\n" + "".join(f"c{i}@email.com,{commercial_id}\n" for i in range(250))
+
+    statements = count_statements(sqlite_engine, lambda: run_import(sqlite_session, Customer, text, chunk_size=100))
+
+    assert sqlite_session.query(Customer).count() == 250
+    # 3 lots : vérification du commercial, point de sauvegarde, insertion, fin du point de sauvegarde
+    assert statements == 3 * 4
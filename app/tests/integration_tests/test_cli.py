@@ -0,0 +1,160 @@
+import csv
+import gzip
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app import cli
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.employee import Employee
+from app.models.event import Event
+from app.tests.helpers import add_rows, count_statements
+
+
+def list_output(session, employee_id, argv):
+    """Exécute une liste et retourne sa sortie."""
+    stream = io.StringIO()
+    employee = session.get(Employee, employee_id)
+    cli.list_rows(session, employee, cli.build_parser().parse_args(argv), stream)
+    return stream.getvalue()
+
+
+def test_events_no_support_jsonl(sqlite_session, base_data):
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 3)
+    add_rows(sqlite_session, commercial_id, None, 3, 5)
+
+    output = list_output(sqlite_session, commercial_id, ["events", "list", "--no-support", "--format", "jsonl"])
+
+    rows = [json.loads(line) for line in output.splitlines()]
+    assert [row["Title"] for row in rows] == ["event_3", "event_4"]
+    assert set(rows[0]) == {column.key for column in Event.__table__.columns}
+
+
+def test_contracts_mine_not_signed_csv(sqlite_session, base_data):
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 2)
+    add_rows(sqlite_session, support_id, support_id, 2, 4)
+    sqlite_session.query(Contract).filter(Contract.Title.in_(["contract_1", "contract_3"])).update(
+        {Contract.ContractSigned: False}
+    )
+    sqlite_session.commit()
+
+    output = list_output(
+        sqlite_session, commercial_id, ["contracts", "list", "--mine", "--not-signed", "--format", "csv"]
+    )
+
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert [row["Title"] for row in rows] == ["contract_1"]
+
+
+def test_list_statement_count_is_constant(sqlite_engine, sqlite_session, base_data):
+    """Les lignes sont lues par lots, sans requête par ligne ( relations non chargées )."""
+
+    commercial_id, support_id = base_data
+    employee = sqlite_session.get(Employee, commercial_id)
+    args = cli.build_parser().parse_args(["events", "list"])
+
+    add_rows(sqlite_session, commercial_id, support_id, 0, 3)
+    small = count_statements(sqlite_engine, lambda: cli.list_rows(sqlite_session, employee, args, io.StringIO()))
+
+    add_rows(sqlite_session, commercial_id, support_id, 3, 40)
+    large = count_statements(sqlite_engine, lambda: cli.list_rows(sqlite_session, employee, args, io.StringIO()))
+
+    assert small == large == 1
+
+
+def test_export_command_gzip(sqlite_session, base_data, tmp_path):
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 2)
+    add_rows(sqlite_session, support_id, support_id, 2, 4)
+    path = tmp_path / "customers.jsonl"
+    args = cli.build_parser().parse_args(["customers", "export", "--output", str(path), "--format", "jsonl", "--gzip"])
+
+    count = cli.export_rows(sqlite_session, sqlite_session.get(Employee, commercial_id), args)
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        rows = [json.loads(line) for line in file]
+    assert count == 2
+    assert [row["FirstName"] for row in rows] == ["customer_0", "customer_1"]
+
+
+def test_import_command(sqlite_session, base_data, tmp_path):
+    commercial_id, _ = base_data
+    employee = sqlite_session.get(Employee, commercial_id)
+    path = tmp_path / "customers.csv"
+    path.write_text("FirstName,Email\nJean,jean@email.com\nPaul,pas-un-email\n", encoding="utf-8")
+    args = cli.build_parser().parse_args(["customers", "import", "--input", str(path)])
+    stderr = io.StringIO()
+
+    with pytest.raises(PermissionError):
+        cli.import_rows(sqlite_session, employee, args, stderr)
+
+    employee.RoleRel.Can_crud_Customer = True
+    count = cli.import_rows(sqlite_session, employee, args, stderr)
+
+    assert count == 1
+    assert "ligne 3 : Adresse email invalide" in stderr.getvalue()
+    assert sqlite_session.query(Customer).filter_by(Email="jean@email.com").one().CommercialId == commercial_id
+
+
+def test_import_command_forces_commercial(sqlite_session, base_data, tmp_path):
+    """Un commercial ne peut pas affecter les clients importés à un autre employé."""
+
+    commercial_id, support_id = base_data
+    employee = sqlite_session.get(Employee, commercial_id)
+    employee.RoleRel.Can_crud_Customer = True
+    path = tmp_path / "customers.csv"
+    path.write_text(f"Email,CommercialId\njean@email.com,{support_id}\n", encoding="utf-8")
+    args = cli.build_parser().parse_args(["customers", "import", "--input", str(path)])
+
+    assert cli.import_rows(sqlite_session, employee, args, io.StringIO()) == 1
+    assert sqlite_session.query(Customer).filter_by(Email="jean@email.com").one().CommercialId == commercial_id
+
+
+def test_run_import(sqlite_session, base_data, tmp_path):
+    """Le journal de fin de commande ne relit pas l'employé expiré par les commits de l'import."""
+
+    commercial_id, _ = base_data
+    sqlite_session.get(Employee, commercial_id).RoleRel.Can_crud_Customer = True
+    sqlite_session.commit()
+    path = tmp_path / "customers.csv"
+    path.write_text("FirstName,Email\nJean,jean@email.com\n", encoding="utf-8")
+
+    with patch.object(
+        cli.AuthenticationManager, "verify_and_decode_jwt_token", return_value={"user_id": commercial_id}
+    ), patch.object(cli, "DatabaseConfig") as mock_database_config:
+        mock_database_config.return_value.db_session_local.return_value = sqlite_session
+        assert cli.run(["customers", "import", "--input", str(path)], io.StringIO()) == 0
+
+    assert sqlite_session.query(Customer).filter_by(Email="jean@email.com").one().CommercialId == commercial_id
+
+
+def test_run_without_token():
+    with patch.object(cli.AuthenticationManager, "verify_and_decode_jwt_token", return_value=None), patch.object(
+        cli, "DatabaseConfig"
+    ) as mock_database_config:
+        assert cli.run(["events", "list"], io.StringIO()) == 1
+
+    mock_database_config.assert_not_called()
+
+
+def test_cli_does_not_import_rich():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, app.cli; print(any(m.startswith('rich') for m in sys.modules))"],
+        cwd=Path(__file__).parents[3],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+if __name__ == "__main__":
+    pytest.main(["--cov=app/", "--cov-report=html", __file__])
@@ -0,0 +1,92 @@
+import csv
+import gzip
+import json
+import tracemalloc
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.permissions.scopes import Scopes
+from app.tests.helpers import add_rows
+from app.utils.export import export_model
+
+
+def add_events_bulk(session, commercial_id, support_id, count):
+    """Ajoute un client, un contrat signé et `count` évènements ( insertions groupées )."""
+    customer = Customer(FirstName="bulk", Email="bulk@email.com", CommercialId=commercial_id)
+    contract = Contract(Title="bulk", CustomerRel=customer, ContractSigned=True)
+    session.add(contract)
+    session.flush()
+    session.execute(
+        Event.__table__.insert(),
+        [
+            {"Title": f"bulk_{i}", "ContractId": contract.Id, "EmployeeSupportId": support_id, "Notes": "x" * 50}
+            for i in range(count)
+        ],
+    )
+    session.commit()
+
+
+def commercial_scopes(commercial_id):
+    role = Mock(RoleName="Commercial", Can_access_all_Contract=False, Can_access_all_Event=False)
+    return Scopes(role, commercial_id)
+
+
+def test_export_csv_gzip_is_scoped(sqlite_session, base_data, tmp_path):
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 3)
+    add_rows(sqlite_session, support_id, support_id, 3, 5)
+    path = tmp_path / "contracts.csv.gz"
+
+    count = export_model(sqlite_session, Contract, commercial_scopes(commercial_id), str(path))
+
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert count == 3
+    assert [row["Title"] for row in rows] == ["contract_0", "contract_1", "contract_2"]
+    assert list(rows[0]) == [column.key for column in Contract.__table__.columns]
+
+
+def test_export_jsonl(sqlite_session, base_data, tmp_path):
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 2)
+    path = tmp_path / "events.jsonl"
+
+    export_model(sqlite_session, Event, commercial_scopes(commercial_id), str(path), "jsonl")
+
+    with open(path, encoding="utf-8") as file:
+        rows = [json.loads(line) for line in file]
+    assert [row["Title"] for row in rows] == ["event_0", "event_1"]
+    assert rows[0]["DateCreated"]
+
+
+def test_export_memory_is_constant(sqlite_session, base_data, tmp_path):
+    """La mémoire utilisée par l'export ne dépend pas du nombre de lignes exportées."""
+
+    commercial_id, support_id = base_data
+    scopes = commercial_scopes(commercial_id)
+
+    def peak_memory(count):
+        add_events_bulk(sqlite_session, commercial_id, support_id, count)
+        tracemalloc.start()
+        try:
+            assert export_model(sqlite_session, Event, scopes, str(tmp_path / "events.csv.gz")) == count
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            sqlite_session.query(Event).delete()
+            sqlite_session.query(Contract).delete()
+            sqlite_session.query(Customer).delete()
+            sqlite_session.commit()
+
+    small = peak_memory(2_000)
+    large = peak_memory(20_000)
+
+    assert large < small * 1.5
+
+
+if __name__ == "__main__":
+    pytest.main(["--cov=app/utils/", "--cov-report=html", __file__])
@@ -0,0 +1,84 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.controllers.contract_manage import ContractManage
+from app.controllers.event_manage import EventManage
+from app.controllers.utils_manage import UtilsManage
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.employee import Employee
+from app.models.event import Event
+from app.tests.helpers import add_rows, count_statements
+
+
+@pytest.mark.parametrize("model, model_name", [(Event, "event"), (Contract, "contract"), (Customer, "customer")])
+def test_filter_statement_count_is_constant(sqlite_engine, sqlite_session, base_data, model, model_name):
+    """Le nombre de requêtes d'une liste ne dépend pas du nombre de lignes affichées."""
+
+    commercial_id, support_id = base_data
+    utils = UtilsManage(Mock())
+
+    def list_and_render():
+        rows = utils.filter(sqlite_session, "All", None, model)
+        utils.table_create(model_name, rows)
+
+    add_rows(sqlite_session, commercial_id, support_id, 0, 3)
+    small = count_statements(sqlite_engine, list_and_render)
+    sqlite_session.expunge_all()
+
+    add_rows(sqlite_session, commercial_id, support_id, 3, 40)
+    large = count_statements(sqlite_engine, list_and_render)
+
+    assert small == large == 1
+
+
+def test_employee_statement_count_is_constant(sqlite_engine, sqlite_session, base_data):
+    """Les collections des employés sont chargées par un nombre fixe de requêtes groupées."""
+
+    commercial_id, support_id = base_data
+    utils = UtilsManage(Mock())
+
+    def list_and_render():
+        rows = utils.filter(sqlite_session, "All", None, Employee)
+        utils.table_create("employee", rows)
+
+    add_rows(sqlite_session, commercial_id, support_id, 0, 3)
+    small = count_statements(sqlite_engine, list_and_render)
+    sqlite_session.expunge_all()
+
+    add_rows(sqlite_session, commercial_id, support_id, 3, 40)
+    large = count_statements(sqlite_engine, list_and_render)
+
+    assert small == large
+
+
+def test_permission_queries_statement_count_is_constant(sqlite_engine, sqlite_session, base_data):
+    """Les requêtes de permissions appliquent le même profil de chargement que `filter`."""
+
+    commercial_id, support_id = base_data
+    commercial = Mock(Id=commercial_id)
+    support = Mock(Id=support_id)
+    commercial_role = Mock(RoleName="Commercial", Can_access_all_Event=False, Can_access_all_Contract=False)
+    support_role = Mock(RoleName="Support", Can_access_all_Event=False, Can_access_all_Contract=False)
+    event_manage_commercial = EventManage(sqlite_session, commercial, commercial_role)
+    event_manage_support = EventManage(sqlite_session, support, support_role)
+    contract_manage = ContractManage(sqlite_session, commercial, commercial_role)
+
+    def list_and_render():
+        utils = contract_manage.utils
+        utils.table_create("event", event_manage_commercial.get_permissions_events())
+        utils.table_create("event", event_manage_support.get_permissions_events())
+        utils.table_create("contract", contract_manage.get_permissions_contracts())
+
+    add_rows(sqlite_session, commercial_id, support_id, 0, 3)
+    small = count_statements(sqlite_engine, list_and_render)
+
+    add_rows(sqlite_session, commercial_id, support_id, 3, 40)
+    large = count_statements(sqlite_engine, list_and_render)
+
+    assert small == large == 3
+
+
+if __name__ == "__main__":
+    pytest.main(["--cov=app/controllers/", "--cov-report=html", __file__])
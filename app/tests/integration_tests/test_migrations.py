@@ -0,0 +1,116 @@
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.dev.migrations import MIGRATIONS, MigrationManager
+from app.models.database import DatabaseConfig
+from app.models.role import Role
+
+
+def index_names(engine, table: str) -> set:
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+@pytest.fixture
+def legacy_engine():
+    """
+    Fixture fournissant une base SQLite créée sans les index ni la table SchemaVersion, comme une base existante.
+
+    Yields:
+        sqlalchemy.engine.Engine: L'engine SQLite.
+    """
+    engine = create_engine("sqlite://")
+    tables = [table for name, table in DatabaseConfig.BASE.metadata.tables.items() if name != "SchemaVersion"]
+    for table in tables:
+        table.create(engine)
+        for index in table.indexes:
+            index.drop(engine)
+    with engine.begin() as connection:
+        connection.execute(Role.__table__.insert().values(RoleName="Commercial"))
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_adds_indexes(legacy_engine):
+    """Les migrations ajoutent les index à une base existante sans toucher aux données."""
+
+    migration_manager = MigrationManager(legacy_engine, Mock())
+    assert migration_manager.current_version() == 0
+    assert "ix_Contract_CustomerId_not_signed" not in index_names(legacy_engine, "Contract")
+
+    version = migration_manager.upgrade()
+
+    assert version == MIGRATIONS[-1][0]
+    assert migration_manager.pending() == []
+    assert index_names(legacy_engine, "Customer") >= {"ix_Customer_CommercialId"}
+    assert index_names(legacy_engine, "Contract") >= {
+        "ix_Contract_CustomerId",
+        "ix_Contract_ContractSigned",
+        "ix_Contract_CustomerId_not_signed",
+        "ix_Contract_CustomerId_outstanding",
+    }
+    assert index_names(legacy_engine, "Event") >= {
+        "ix_Event_ContractId",
+        "ix_Event_EmployeeSupportId",
+        "ix_Event_no_support",
+    }
+    with legacy_engine.connect() as connection:
+        assert connection.execute(text('SELECT COUNT(*) FROM "Role"')).scalar() == 1
+
+
+def test_upgrade_recreates_no_support_index(legacy_engine):
+    """L'index des évènements sans support créé sur ContractId par la version 1 est recréé sur Id."""
+
+    migration_manager = MigrationManager(legacy_engine, Mock(), MIGRATIONS[:3])
+    migration_manager.upgrade()
+    with legacy_engine.begin() as connection:
+        connection.execute(text('DROP INDEX "ix_Event_no_support"'))
+        connection.execute(
+            text('CREATE INDEX "ix_Event_no_support" ON "Event" ("ContractId") WHERE "EmployeeSupportId" IS NULL')
+        )
+
+    migration_manager.migrations = MIGRATIONS
+    migration_manager.upgrade()
+
+    indexes = {index["name"]: index for index in inspect(legacy_engine).get_indexes("Event")}
+    assert indexes["ix_Event_no_support"]["column_names"] == ["Id"]
+
+
+def test_upgrade_is_idempotent(legacy_engine):
+    migration_manager = MigrationManager(legacy_engine, Mock())
+    migration_manager.upgrade()
+
+    apply = Mock()
+    migration_manager.migrations = MIGRATIONS + [(MIGRATIONS[-1][0] + 1, "test", apply)]
+    migration_manager.upgrade()
+    migration_manager.upgrade()
+
+    apply.assert_called_once()
+
+
+def test_upgrade_stops_on_error(legacy_engine):
+    """Une migration en erreur n'est pas enregistrée et les suivantes ne sont pas appliquées."""
+
+    def failing(connection):
+        connection.execute(text("CREATE INDEX ix_fail ON Unknown (Id)"))
+
+    after = Mock()
+    migrations = [(1, "ok", Mock()), (2, "fail", failing), (3, "after", after)]
+    migration_manager = MigrationManager(legacy_engine, Mock(), migrations)
+
+    with pytest.raises(Exception):
+        migration_manager.upgrade()
+
+    assert migration_manager.current_version() == 1
+    after.assert_not_called()
+
+
+def test_stamp_after_create_all(sqlite_engine):
+    """Une base créée par `create_all` a déjà les index : elle est marquée à jour sans rejouer les migrations."""
+
+    migration_manager = MigrationManager(sqlite_engine, Mock())
+    migration_manager.stamp()
+
+    assert migration_manager.current_version() == MIGRATIONS[-1][0]
+    assert migration_manager.pending() == []
@@ -0,0 +1,57 @@
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+
+from app.controllers.utils_manage import UtilsManage
+from app.models.customer import Customer
+from app.models.employee import Employee
+from app.models.role import Role
+
+
+@pytest.fixture
+def customers(sqlite_session):
+    """
+    Crée un commercial et 7 clients.
+
+    Returns:
+        list: Les Id des clients créés, triés.
+    """
+    role = Role(RoleName="Commercial")
+    sqlite_session.add(role)
+    sqlite_session.flush()
+    commercial = Employee(Email="c@email.com", PasswordHash="Password123", RoleId=role.Id)
+    sqlite_session.add(commercial)
+    sqlite_session.flush()
+
+    rows = [Customer(Email=f"customer_{i}@email.com", CommercialId=commercial.Id) for i in range(7)]
+    sqlite_session.add_all(rows)
+    sqlite_session.commit()
+    return sorted(customer.Id for customer in rows)
+
+
+def test_filter_keyset(sqlite_session, customers):
+    """`filter` reprend après le curseur et limite le nombre de lignes."""
+
+    utils = UtilsManage(Mock())
+
+    page = utils.filter(sqlite_session, "All", None, Customer, after_id=customers[2], limit=3)
+
+    assert [customer.Id for customer in page] == customers[3:6]
+
+
+def test_pages_cover_all_rows_once(sqlite_session, customers):
+    """Les pages successives couvrent toutes les lignes une seule fois, dans l'ordre des Id."""
+
+    utils = UtilsManage(Mock())
+    fetch_page = partial(utils.filter, sqlite_session, "All", None, Customer)
+
+    pages = list(utils.pages(fetch_page, page_size=3))
+
+    assert [len(page) for page, _ in pages] == [3, 3, 1]
+    assert [has_more for _, has_more in pages] == [True, True, False]
+    assert [customer.Id for page, _ in pages for customer in page] == customers
+
+
+if __name__ == "__main__":
+    pytest.main(["--cov=app/controllers/", "--cov-report=html", __file__])
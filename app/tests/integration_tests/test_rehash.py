@@ -0,0 +1,60 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.controllers.authentication import AuthenticationManager
+from app.models.employee import Employee, hash_password, hash_rounds
+from app.utils.metrics import LOGIN_ATTEMPTS
+
+
+@pytest.fixture()
+def low_cost_employee(sqlite_session, base_data):
+    """Employé dont le mot de passe ( court : antérieur aux règles ) est hashé avec le coût 4."""
+
+    commercial_id, _ = base_data
+    employee = sqlite_session.get(Employee, commercial_id)
+    employee.PasswordHash = hash_password("court", rounds=4)
+    sqlite_session.commit()
+    return employee.Email
+
+
+def authenticate(session, email, password, rounds):
+    """Authentifie un employé avec le coût de bcrypt `rounds` ( après le chargement du .env par le manager )."""
+    auth_manager = AuthenticationManager(Mock(), Mock())
+    # authenticate ouvre sa propre transaction
+    session.commit()
+    with patch.dict(os.environ, {"BCRYPT_ROUNDS": str(rounds)}):
+        return auth_manager.authenticate(email, password, session)
+
+
+def stored_hash(session, email):
+    session.expire_all()
+    return session.query(Employee.PasswordHash).filter_by(Email=email).scalar()
+
+
+def test_login_rehashes_with_configured_cost(sqlite_session, low_cost_employee):
+    authenticated, employee, role = authenticate(sqlite_session, low_cost_employee, "court", 5)
+
+    assert authenticated
+    password_hash = stored_hash(sqlite_session, low_cost_employee)
+    assert hash_rounds(password_hash) == 5
+    assert sqlite_session.query(Employee).filter_by(Email=low_cost_employee).one().verify_password("court")
+
+
+def test_same_cost_is_not_rehashed(sqlite_session, low_cost_employee):
+    before = stored_hash(sqlite_session, low_cost_employee)
+
+    assert authenticate(sqlite_session, low_cost_employee, "court", 4)[0]
+
+    assert stored_hash(sqlite_session, low_cost_employee) == before
+
+
+def test_failed_login_is_not_rehashed(sqlite_session, low_cost_employee):
+    before = stored_hash(sqlite_session, low_cost_employee)
+    failures = LOGIN_ATTEMPTS.value("failure")
+
+    assert authenticate(sqlite_session, low_cost_employee, "mauvais", 5) == (False, None, None)
+
+    assert stored_hash(sqlite_session, low_cost_employee) == before
+    assert LOGIN_ATTEMPTS.value("failure") == failures + 1
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.models.database import DatabaseConfig
+from app.models.role import Role
+from app.permissions.role_cache import RoleCache
+from app.tests.helpers import count_statements
+
+
+@pytest.fixture
+def role_id(sqlite_session):
+    role = Role(RoleName="Commercial", Can_ru_Customer=True)
+    sqlite_session.add(role)
+    sqlite_session.commit()
+    return role.Id
+
+
+def update_role(session, role_id, **values):
+    """Modifie un rôle comme RoleManage.update ( nouvelle révision écrite par l'ORM )."""
+    role = session.get(Role, role_id)
+    for key, value in values.items():
+        setattr(role, key, value)
+    session.commit()
+
+
+def test_check_without_change_no_statement(sqlite_engine, sqlite_session, role_id):
+    """Tant que le délai n'est pas écoulé et qu'aucun rôle n'est modifié, la vérification ne coûte aucune requête."""
+
+    role_cache = RoleCache(sqlite_session, sqlite_session.get(Role, role_id), ttl=60)
+    sqlite_session.commit()
+
+    statements = count_statements(sqlite_engine, lambda: [role_cache.check(sqlite_session) for _ in range(100)])
+
+    assert statements == 0
+    assert role_cache.role.Can_ru_Customer is True
+
+
+def test_check_after_local_change(sqlite_session, role_id):
+    """Une modification de rôle dans le processus est visible à la vérification suivante."""
+
+    role_cache = RoleCache(sqlite_session, sqlite_session.get(Role, role_id), ttl=60)
+    update_role(sqlite_session, role_id, Can_ru_Customer=False)
+    RoleCache.bump()
+
+    assert role_cache.check(sqlite_session) is True
+    assert role_cache.role.Can_ru_Customer is False
+
+
+def test_check_after_ttl(sqlite_session, role_id):
+    """Une modification faite par un autre processus est visible après le délai."""
+
+    role_cache = RoleCache(sqlite_session, sqlite_session.get(Role, role_id), ttl=60)
+    update_role(sqlite_session, role_id, Can_ru_Customer=False)
+
+    role_cache.check(sqlite_session)
+    assert role_cache.role.Can_ru_Customer is True
+
+    with patch("app.permissions.role_cache.time.monotonic", return_value=role_cache.checked_at + 61):
+        role_cache.check(sqlite_session)
+    assert role_cache.role.Can_ru_Customer is False
+
+
+def test_check_deleted_role(sqlite_session, role_id):
+
+    role_cache = RoleCache(sqlite_session, sqlite_session.get(Role, role_id), ttl=0)
+    sqlite_session.delete(sqlite_session.get(Role, role_id))
+    sqlite_session.commit()
+
+    assert role_cache.check(sqlite_session) is False
+
+
+def test_concurrent_updates_get_distinct_revisions(tmp_path):
+    """Deux modifications simultanées du même rôle n'écrivent pas la même révision : la seconde est refusée."""
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'roles.db'}")
+    DatabaseConfig.BASE.metadata.create_all(bind=engine)
+    session_local = sessionmaker(bind=engine)
+    with session_local() as session:
+        session.add(Role(RoleName="Commercial"))
+        session.commit()
+
+    first, second = session_local(), session_local()
+    first_role = first.query(Role).one()
+    second_role = second.query(Role).one()
+
+    first_role.Can_ru_Customer = True
+    first.commit()
+    second_role.Can_crud_Customer = True
+    with pytest.raises(StaleDataError):
+        second.commit()
+
+    second.rollback()
+    assert second.query(Role.Revision).scalar() == 2
+    first.close()
+    second.close()
+    engine.dispose()
@@ -0,0 +1,101 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.controllers.utils_manage import UtilsManage
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+from app.permissions.scopes import Scopes
+from app.tests.helpers import add_rows, count_statements
+
+
+def role(name, all_access=False):
+    """Retourne un rôle simulé avec ou sans accès total aux évènements, contrats et clients."""
+    return Mock(
+        RoleName=name,
+        Can_access_all_Event=all_access,
+        Can_access_all_Contract=all_access,
+        Can_access_all_Customer=all_access,
+    )
+
+
+@pytest.fixture
+def scoped_data(sqlite_session, base_data):
+    """
+    Ajoute trois lignes liées au commercial et au support de `base_data` et deux lignes liées à d'autres employés.
+
+    Returns:
+        tuple: (commercial_id, support_id)
+    """
+    commercial_id, support_id = base_data
+    add_rows(sqlite_session, commercial_id, support_id, 0, 3)
+    add_rows(sqlite_session, commercial_id + 100, support_id + 100, 3, 5)
+    return commercial_id, support_id
+
+
+@pytest.mark.parametrize(
+    "role_name, all_access, expected",
+    [
+        ("Gestion", True, {Event: 5, Contract: 5, Customer: 5}),
+        ("Commercial", False, {Event: 3, Contract: 3, Customer: 3}),
+        ("Support", False, {Event: 3, Contract: 0, Customer: 0}),
+        ("Autre", False, {Event: 0, Contract: 0, Customer: 0}),
+    ],
+)
+def test_scopes_query(sqlite_session, scoped_data, role_name, all_access, expected):
+    """Chaque rôle ne voit que les éléments de son périmètre."""
+
+    commercial_id, support_id = scoped_data
+    user_id = support_id if role_name == "Support" else commercial_id
+    scopes = Scopes(role(role_name, all_access), user_id)
+
+    for model, count in expected.items():
+        assert scopes.query(sqlite_session, model).count() == count
+
+
+def test_scopes_unknown_model(sqlite_session):
+    with pytest.raises(ValueError):
+        Scopes(role("Gestion", True), 1).criterion(UtilsManage)
+
+
+def test_valid_id_single_statement(sqlite_engine, sqlite_session, scoped_data):
+    """La vérification d'un identifiant autorisé ne coûte qu'une requête, quel que soit le périmètre."""
+
+    commercial_id, _ = scoped_data
+    scopes = Scopes(role("Commercial"), commercial_id)
+    utils = UtilsManage(Mock())
+    event_id = sqlite_session.query(Event.Id).filter(Event.Title == "event_1").scalar()
+    result = []
+
+    with patch.object(utils.view, "return_choice", return_value=str(event_id)):
+        statements = count_statements(
+            sqlite_engine,
+            lambda: result.append(
+                utils.valid_id(sqlite_session, Event, "message", scopes.query(sqlite_session, Event))
+            ),
+        )
+
+    assert statements == 1
+    assert result[0].Id == event_id
+
+
+def test_valid_id_out_of_scope(sqlite_session, scoped_data):
+    """Un identifiant existant hors du périmètre est refusé."""
+
+    commercial_id, _ = scoped_data
+    scopes = Scopes(role("Commercial"), commercial_id)
+    utils = UtilsManage(Mock())
+    event_id = sqlite_session.query(Event.Id).filter(Event.Title == "event_4").scalar()
+
+    with patch.object(utils.view, "return_choice", side_effect=[str(event_id), ""]), patch.object(
+        utils.view, "display_red_message"
+    ) as mock_display_red_message:
+        result = utils.valid_id(sqlite_session, Event, "message", scopes.query(sqlite_session, Event))
+
+    assert result is None
+    mock_display_red_message.assert_called_once_with("Opération non autorisée")
+
+
+if __name__ == "__main__":
+    pytest.main(["--cov=app/controllers/", "--cov-report=html", __file__])
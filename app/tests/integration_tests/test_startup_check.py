@@ -0,0 +1,78 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.dev.migrations import MIGRATIONS, MigrationManager
+from app.dev.startup_check import StartupCheck
+from app.models.database import DatabaseConfig
+from app.models.schema_version import SchemaVersion
+from app.tests.helpers import count_statements
+
+
+@pytest.fixture
+def session_config(tmp_path):
+    """
+    Fixture fournissant une configuration de base ( engine, BASE, db_session_local ) sur une base SQLite vide.
+
+    Yields:
+        Mock: La configuration de la base.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'epic_events.db'}")
+    yield Mock(engine=engine, BASE=DatabaseConfig.BASE, db_session_local=sessionmaker(bind=engine))
+    engine.dispose()
+
+
+@pytest.fixture
+def startup_check(session_config, tmp_path):
+    return StartupCheck(session_config, Mock(), tmp_path / "schema_check.json")
+
+
+def test_check_creates_schema_and_caches_revision(session_config, startup_check):
+    assert startup_check.run()
+
+    assert MigrationManager(session_config.engine, Mock()).current_version() == MIGRATIONS[-1][0]
+    cache = startup_check.load_cache()
+    assert [entry["revision"] for entry in cache.values()] == [MIGRATIONS[-1][0]]
+
+
+def test_cached_check_only_reads_revision(session_config, startup_check):
+    startup_check.run()
+
+    with patch("app.dev.startup_check.check_tables_exist") as mock_check_tables_exist:
+        statements = count_statements(session_config.engine, startup_check.run)
+
+    mock_check_tables_exist.assert_not_called()
+    # existence de SchemaVersion et lecture de la révision
+    assert statements <= 2
+
+
+def test_revision_change_invalidates_cache(session_config, startup_check):
+    startup_check.run()
+    with session_config.engine.begin() as connection:
+        connection.execute(delete(SchemaVersion).where(SchemaVersion.Version == MIGRATIONS[-1][0]))
+
+    with patch("app.dev.startup_check.check_tables_exist", return_value=(True, [])) as mock_check_tables_exist:
+        assert startup_check.run()
+
+    mock_check_tables_exist.assert_called()
+    assert MigrationManager(session_config.engine, Mock()).current_version() == MIGRATIONS[-1][0]
+
+
+def test_background_check_reports_connection_error(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'absent' / 'epic_events.db'}")
+    session_config = Mock(engine=engine, BASE=DatabaseConfig.BASE, db_session_local=sessionmaker(bind=engine))
+    logger = Mock()
+    startup_check = StartupCheck(session_config, logger, tmp_path / "schema_check.json")
+
+    startup_check.start()
+
+    assert startup_check.wait() is False
+    assert startup_check.error is not None
+    logger.error.assert_called_once()
+    assert startup_check.load_cache() == {}
+
+
+if __name__ == "__main__":
+    pytest.main(["--cov=app/dev/", "--cov-report=html", __file__])
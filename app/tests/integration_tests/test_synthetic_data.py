@@ -0,0 +1,85 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import func, select
+
+from app.dev.synthetic_data import SYNTHETIC_PASSWORD, SyntheticDataGenerator
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee
+from app.models.event import Event
+from app.models.role import Role
+
+COUNTS = {"employees": 30, "customers": 600, "contracts": 1000, "events": 500}
+
+
+def generate(session, engine, seed=0):
+    generator = SyntheticDataGenerator(session, engine, DatabaseConfig.BASE, Mock(), COUNTS, seed, chunk_size=250)
+    # hash peu coûteux et sans pool de processus pour les employés prédéfinis
+    with patch.dict(os.environ, {"BCRYPT_ROUNDS": "4", "BCRYPT_WORKERS": "1"}):
+        generator.generate()
+
+
+@pytest.fixture()
+def generated(sqlite_session, sqlite_engine):
+    generate(sqlite_session, sqlite_engine)
+    return sqlite_session
+
+
+def test_scale_covers_all_roles():
+    counts = SyntheticDataGenerator.scale(100)
+
+    assert counts == {"employees": 3, "customers": 29, "contracts": 40, "events": 30}
+
+
+def test_row_counts(generated):
+    # données prédéfinies de DatabaseInitializer ( 5 employés, 2 clients, 2 contrats ) conservées
+    assert generated.scalar(select(func.count(Employee.Id))) == COUNTS["employees"] + 5
+    assert generated.scalar(select(func.count(Customer.Id))) == COUNTS["customers"] + 2
+    assert generated.scalar(select(func.count(Contract.Id))) == COUNTS["contracts"] + 2
+    assert generated.scalar(select(func.count(Event.Id))) == COUNTS["events"]
+
+
+def test_same_seed_same_data(generated, sqlite_engine):
+    def snapshot():
+        return generated.execute(
+            select(Customer.CommercialId, Contract.Amount, Contract.ContractSigned)
+            .join(Contract.CustomerRel)
+            .order_by(Contract.Id)
+        ).all()
+
+    first = snapshot()
+    generate(generated, sqlite_engine)
+    assert snapshot() == first
+
+    generate(generated, sqlite_engine, seed=1)
+    assert snapshot() != first
+
+
+def test_distribution_is_skewed(generated):
+    commercial_role = generated.scalar(select(Role.Id).filter_by(RoleName="Commercial"))
+    commercials = generated.scalar(select(func.count(Employee.Id)).filter_by(RoleId=commercial_role))
+    owned = generated.scalars(
+        select(func.count(Customer.Id)).group_by(Customer.CommercialId).order_by(func.count(Customer.Id).desc())
+    ).all()
+    # un cinquième des commerciaux possède plus de la moitié des clients
+    assert sum(owned[: -(-commercials // 5)]) > sum(owned) / 2
+
+    signed = generated.scalar(select(func.count(Contract.Id)).filter_by(ContractSigned=True))
+    assert signed < COUNTS["contracts"] / 2
+
+    unsigned_events = generated.scalar(
+        select(func.count(Event.Id)).join(Event.ContractRel).where(Contract.ContractSigned.is_(False))
+    )
+    assert unsigned_events == 0
+    assert generated.scalar(select(func.count(Event.Id)).where(Event.EmployeeSupportId.is_(None))) > 0
+
+
+def test_generated_data_is_valid(generated):
+    assert generated.scalar(select(func.count(Contract.Id)).where(Contract.AmountOutstanding > Contract.Amount)) == 0
+    assert generated.scalar(select(func.count(Event.Id)).where(Event.DateEnd <= Event.DateStart)) == 0
+
+    employee = generated.scalars(select(Employee).filter(Employee.Email.like("support_s%"))).first()
+    assert employee.verify_password(SYNTHETIC_PASSWORD)
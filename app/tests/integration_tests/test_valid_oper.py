@@ -0,0 +1,201 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers.utils_manage import OperResult, UtilsManage
+from app.models.customer import Customer
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee
+from app.models.role import Role
+from app.utils.metrics import OPERATIONS
+
+
+@pytest.fixture
+def file_sessionmaker(tmp_path):
+    """
+    Fixture fournissant un sessionmaker sur une base SQLite fichier, partagée par plusieurs sessions.
+
+    Le délai d'attente d'un verrou est très court : une écriture bloquée par une autre session échoue aussitôt
+    ( "database is locked" ) au lieu d'attendre.
+
+    Yields:
+        sessionmaker: Le sessionmaker.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'epic_events.db'}", connect_args={"timeout": 0.1})
+    DatabaseConfig.BASE.metadata.create_all(bind=engine)
+
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with session_local() as session:
+        role = Role(RoleName="Commercial")
+        session.add(role)
+        session.flush()
+        commercial = Employee(
+            FirstName="commercial", LastName="c", Email="c@email.com", PasswordHash="Password123", RoleId=role.Id
+        )
+        session.add(commercial)
+        session.flush()
+        session.add(Customer(FirstName="customer", Email="customer@email.com", CommercialId=commercial.Id))
+        session.commit()
+
+    yield session_local
+    engine.dispose()
+
+
+def write_from_other_session(session_local):
+    """Crée un client depuis une autre session ( autre utilisateur )."""
+    with session_local() as session:
+        customer = session.query(Customer).filter_by(Email="customer@email.com").one()
+        session.add(Customer(FirstName="other", Email="other@email.com", CommercialId=customer.CommercialId))
+        session.commit()
+
+
+def update_from_other_session(session_local, delete=False):
+    """Modifie ou supprime le client depuis une autre session ( autre utilisateur )."""
+    with session_local() as session:
+        customer = session.query(Customer).filter_by(Email="customer@email.com").one()
+        if delete:
+            session.delete(customer)
+        else:
+            customer.Company = "Autre utilisateur"
+        session.commit()
+
+
+@pytest.mark.parametrize("oper", ["create", "update", "delete"])
+def test_confirmation_does_not_block_other_sessions(file_sessionmaker, oper):
+    """Pendant la confirmation d'une opération, une autre session peut écrire sans attendre."""
+
+    session = file_sessionmaker()
+    utils = UtilsManage(Mock())
+
+    if oper == "create":
+        commercial_id = session.query(Employee.Id).scalar()
+        instance = Customer(FirstName="new", Email="new@email.com", CommercialId=commercial_id)
+    else:
+        instance = session.query(Customer).filter_by(Email="customer@email.com").one()
+        if oper == "update":
+            instance.FirstName = "modifié"
+
+    def confirm(*args, **kwargs):
+        # l'autre utilisateur écrit pendant que la confirmation est attendue
+        write_from_other_session(file_sessionmaker)
+        return "oui"
+
+    with patch.object(utils.view, "return_choice", side_effect=confirm), patch.object(
+        utils.view, "display_red_message"
+    ) as mock_display_red_message, patch.object(utils.sentry, "sentry_event"):
+        utils.valid_oper(session, "customer", oper, instance)
+
+    session.close()
+    mock_display_red_message.assert_not_called()
+
+    with file_sessionmaker() as check:
+        emails = {customer.Email: customer for customer in check.query(Customer)}
+        assert "other@email.com" in emails
+        if oper == "create":
+            assert "new@email.com" in emails
+            assert emails["new@email.com"].CommercialRel.Email == "c@email.com"
+        elif oper == "update":
+            assert emails["customer@email.com"].FirstName == "modifié"
+        else:
+            assert "customer@email.com" not in emails
+
+
+def test_cancel_discards_changes(file_sessionmaker):
+    session = file_sessionmaker()
+    utils = UtilsManage(Mock())
+    customer = session.query(Customer).filter_by(Email="customer@email.com").one()
+    customer.FirstName = "modifié"
+    cancelled = OPERATIONS.value("customer", "update", "cancelled")
+
+    with patch.object(utils.view, "return_choice", return_value="non"), patch.object(
+        utils.view, "display_red_message"
+    ):
+        utils.valid_oper(session, "customer", "update", customer)
+
+    assert customer.FirstName == "customer"
+    assert OPERATIONS.value("customer", "update", "cancelled") == cancelled + 1
+    session.close()
+
+
+def test_concurrent_update_is_detected(file_sessionmaker):
+    """Une modification concurrente du même client n'est pas écrasée : le client est rechargé."""
+
+    session = file_sessionmaker()
+    utils = UtilsManage(Mock())
+    customer = session.query(Customer).filter_by(Email="customer@email.com").one()
+    customer.FirstName = "modifié"
+
+    def confirm(*args, **kwargs):
+        update_from_other_session(file_sessionmaker)
+        return "oui"
+
+    with patch.object(utils.view, "return_choice", side_effect=confirm), patch.object(
+        utils.view, "display_red_message"
+    ) as mock_display_red_message, patch.object(utils.sentry, "sentry_event"):
+        result = utils.valid_oper(session, "customer", "update", customer)
+
+    assert result is OperResult.STALE
+    mock_display_red_message.assert_called_once()
+    # valeurs rechargées : la modification de l'autre utilisateur est conservée
+    assert customer.FirstName == "customer"
+    assert customer.Company == "Autre utilisateur"
+    assert customer.Version == 2
+
+    # nouvelle saisie sur la version rechargée
+    customer.FirstName = "modifié"
+    with patch.object(utils.view, "return_choice", return_value="oui"), patch.object(utils.sentry, "sentry_event"):
+        assert utils.valid_oper(session, "customer", "update", customer) is OperResult.SUCCESS
+    session.close()
+
+    with file_sessionmaker() as check:
+        customer = check.query(Customer).filter_by(Email="customer@email.com").one()
+        assert (customer.FirstName, customer.Company, customer.Version) == ("modifié", "Autre utilisateur", 3)
+
+
+def test_concurrent_delete_is_detected(file_sessionmaker):
+    """La modification d'un client supprimé entre-temps par un autre utilisateur est refusée."""
+
+    session = file_sessionmaker()
+    utils = UtilsManage(Mock())
+    customer = session.query(Customer).filter_by(Email="customer@email.com").one()
+    customer.FirstName = "modifié"
+
+    def confirm(*args, **kwargs):
+        update_from_other_session(file_sessionmaker, delete=True)
+        return "oui"
+
+    with patch.object(utils.view, "return_choice", side_effect=confirm), patch.object(
+        utils.view, "display_red_message"
+    ) as mock_display_red_message, patch.object(utils.sentry, "sentry_event"):
+        result = utils.valid_oper(session, "customer", "update", customer)
+
+    assert result is OperResult.FAILED
+    mock_display_red_message.assert_called_once()
+    session.close()
+
+
+def test_concurrent_update_before_delete(file_sessionmaker):
+    """La suppression d'un client modifié entre-temps est refusée, avec un message propre à la suppression."""
+
+    session = file_sessionmaker()
+    utils = UtilsManage(Mock())
+    customer = session.query(Customer).filter_by(Email="customer@email.com").one()
+
+    def confirm(*args, **kwargs):
+        update_from_other_session(file_sessionmaker)
+        return "oui"
+
+    with patch.object(utils.view, "return_choice", side_effect=confirm), patch.object(
+        utils.view, "display_red_message"
+    ) as mock_display_red_message, patch.object(utils.sentry, "sentry_event"):
+        result = utils.valid_oper(session, "customer", "delete", customer)
+
+    assert result is OperResult.STALE
+    assert not result
+    assert "n'a pas été supprimé" in mock_display_red_message.call_args[0][0]
+    session.close()
+
+    with file_sessionmaker() as check:
+        assert check.query(Customer).filter_by(Email="customer@email.com").one().Company == "Autre utilisateur"
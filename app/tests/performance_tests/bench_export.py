@@ -0,0 +1,98 @@
+"""
+Benchmark de l'export en continu ( app/utils/export.py ) sur une base SQLite de lignes synthétiques.
+
+Mesure, pour chaque format, la durée de l'export des évènements, le débit, la taille du fichier
+et le pic de mémoire du processus : la mémoire ne doit pas croître avec le nombre de lignes.
+
+Usage ( depuis la racine du projet ) :
+    python -m app.tests.performance_tests.bench_export [nombre_de_lignes]
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+from unittest.mock import Mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.event  # noqa: F401  (enregistre tous les modèles dans la metadata)
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee
+from app.models.event import Event
+from app.models.role import Role
+from app.permissions.scopes import Scopes
+from app.utils.export import export_model
+
+# ( nom du fichier, format )
+OUTPUTS = [("events.csv", "csv"), ("events.csv.gz", "csv"), ("events.jsonl.gz", "jsonl")]
+
+BATCH_SIZE = 10000
+
+
+def populate(session, rows: int) -> None:
+    """Crée un commercial, un client, un contrat et `rows` évènements ( insertions groupées )."""
+
+    role = Role(RoleName="Commercial")
+    session.add(role)
+    session.flush()
+    commercial = Employee(FirstName="bench", Email="bench@email.com", PasswordHash="Password123", RoleId=role.Id)
+    customer = Customer(FirstName="bench", Email="customer@email.com", CommercialRel=commercial)
+    contract = Contract(Title="bench", CustomerRel=customer, ContractSigned=True)
+    session.add(contract)
+    session.flush()
+
+    for start in range(0, rows, BATCH_SIZE):
+        session.execute(
+            Event.__table__.insert(),
+            [
+                {
+                    "Title": f"event_{i}",
+                    "ContractId": contract.Id,
+                    "Notes": f"Notes de l'évènement {i}",
+                    "Location": "Lille",
+                    "Attendees": i % 500,
+                }
+                for i in range(start, min(start + BATCH_SIZE, rows))
+            ],
+        )
+    session.commit()
+
+
+def max_rss_mb() -> float:
+    """Pic de mémoire résidente du processus en Mo ( Linux : ru_maxrss en Ko )."""
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(rows: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        DatabaseConfig.BASE.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        populate(session, rows)
+        print(f"Base de {rows} évènements créée en {time.perf_counter() - start:.1f} s")
+        print(f"Mémoire avant export : {max_rss_mb():.0f} Mo\n")
+
+        scopes = Scopes(Mock(Can_access_all_Event=True), None)
+        print(f"{'fichier':<18} {'durée (s)':>10} {'lignes/s':>10} {'taille (Mo)':>12} {'pic mémoire (Mo)':>17}")
+        for name, fmt in OUTPUTS:
+            path = os.path.join(directory, name)
+            start = time.perf_counter()
+            count = export_model(session, Event, scopes, path, fmt)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"{name:<18} {elapsed:>10.2f} {count / elapsed:>10.0f} {size:>12.1f} {max_rss_mb():>17.0f}")
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
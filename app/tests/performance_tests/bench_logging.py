@@ -0,0 +1,70 @@
+"""
+Micro-benchmark de la latence d'un appel de log selon la configuration de LoggerConfig.
+
+Mesure le temps moyen d'un `logger.info` vu par l'appelant : en mode direct l'appel inclut l'écriture console,
+l'écriture fichier et le contrôle de rotation ; en mode file d'attente il se limite à la mise en file.
+
+Usage ( depuis la racine du projet ) :
+    python -m app.tests.performance_tests.bench_logging [nombre_d_appels]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from app.utils.logger_config import LoggerConfig
+
+CONFIGURATIONS = [
+    ("direct / text", False, "text"),
+    ("direct / jsonl", False, "jsonl"),
+    ("file d'attente / text", True, "text"),
+    ("file d'attente / jsonl", True, "jsonl"),
+]
+
+
+def bench(name: str, use_queue: bool, log_format: str, calls: int, log_file: str) -> float:
+    """
+    Mesure la latence moyenne d'un appel de log pour une configuration.
+
+    Returns:
+        float: La latence moyenne d'un appel en microsecondes.
+    """
+
+    logger_config = LoggerConfig(f"bench.{name}", log_file, use_queue=use_queue, log_format=log_format)
+    logger = logger_config.get_logger()
+    logger.propagate = False
+
+    start = time.perf_counter()
+    for i in range(calls):
+        logger.info("Connexion: user_%s@email.com", i)
+    elapsed = time.perf_counter() - start
+
+    logger_config.stop()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    return elapsed / calls * 1e6
+
+
+def main(calls: int = 10000) -> None:
+    # la sortie console des loggers est écartée pour ne mesurer que le coût des appels
+    stderr = sys.stderr
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        sys.stderr = devnull
+        try:
+            results = [
+                (name, bench(name, use_queue, log_format, calls, os.path.join(log_dir, f"bench_{index}.log")))
+                for index, (name, use_queue, log_format) in enumerate(CONFIGURATIONS)
+            ]
+        finally:
+            sys.stderr = stderr
+
+    print(f"Latence moyenne d'un logger.info ( {calls} appels )")
+    for name, latency in results:
+        print(f"  {name:<25} {latency:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
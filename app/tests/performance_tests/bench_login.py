@@ -0,0 +1,70 @@
+"""
+Benchmark de la latence de connexion selon le coût de bcrypt ( variable d'environnement BCRYPT_ROUNDS ).
+
+Pour chaque coût, un employé est créé sur une base SQLite en mémoire et `AuthenticationManager.authenticate`
+est mesuré : la vérification du mot de passe représente l'essentiel du temps et double à chaque incrément du coût.
+La dernière colonne mesure la première connexion après un changement de coût ( vérification + nouveau hash ).
+
+Usage ( depuis la racine du projet ) :
+    python -m app.tests.performance_tests.bench_login [nombre_de_connexions] [coûts séparés par des virgules]
+"""
+
+import os
+import statistics
+import sys
+import time
+from unittest.mock import Mock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.event  # noqa: F401  (enregistre tous les modèles dans la metadata)
+from app.controllers.authentication import AuthenticationManager
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee, hash_password
+from app.models.role import Role
+
+EMAIL = "bench@email.com"
+PASSWORD = "Password123"
+
+
+def login_ms(session, auth_manager) -> float:
+    """Mesure une connexion en millisecondes."""
+
+    start = time.perf_counter()
+    authenticated, _, _ = auth_manager.authenticate(EMAIL, PASSWORD, session)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert authenticated
+    session.close()
+    return elapsed
+
+
+def main(logins: int = 5, costs=(10, 11, 12, 13)) -> None:
+    engine = create_engine("sqlite://")
+    DatabaseConfig.BASE.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    role = Role(RoleName="Commercial")
+    session.add(role)
+    session.flush()
+    employee = Employee(Email=EMAIL, PasswordHash=hash_password(PASSWORD, rounds=4), RoleId=role.Id)
+    session.add(employee)
+    session.commit()
+
+    auth_manager = AuthenticationManager(Mock(), Mock())
+
+    print(f"{'coût':>5} {'médiane (ms)':>13} {'max (ms)':>9} {'changement de coût (ms)':>24}")
+    for cost in costs:
+        with patch.dict(os.environ, {"BCRYPT_ROUNDS": str(cost)}):
+            # première connexion : le hash du coût précédent est vérifié puis recalculé avec le nouveau coût
+            rehash = login_ms(session, auth_manager)
+            times = [login_ms(session, auth_manager) for _ in range(logins)]
+        print(f"{cost:>5} {statistics.median(times):>13.0f} {max(times):>9.0f} {rehash:>24.0f}")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+        [int(cost) for cost in sys.argv[2].split(",")] if len(sys.argv) > 2 else (10, 11, 12, 13),
+    )
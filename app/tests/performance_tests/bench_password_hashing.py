@@ -0,0 +1,54 @@
+"""
+Benchmark de la création groupée d'employés ( app/utils/password_hashing.py ).
+
+Compare le hachage un à un par le validateur du modèle ( `Employee(PasswordHash=...)` ) au hachage dans un pool
+de processus ( `build_employees` ). Le hachage un à un est mesuré sur un échantillon de comptes puis extrapolé :
+à environ 250 ms par mot de passe, 1 000 comptes prendraient plus de quatre minutes.
+
+Usage ( depuis la racine du projet ) :
+    python -m app.tests.performance_tests.bench_password_hashing [nombre_de_comptes] [nombre_de_processus]
+"""
+
+import os
+import sys
+import time
+
+from app.models.employee import Employee
+from app.utils.password_hashing import build_employees, default_workers
+
+# nombre de comptes de l'échantillon du hachage un à un
+SERIAL_SAMPLE = 20
+
+
+def users(count: int) -> list:
+    return [
+        {"FirstName": f"user_{i}", "Email": f"user_{i}@email.com", "PasswordHash": f"Password{i}", "RoleId": 1}
+        for i in range(count)
+    ]
+
+
+def main(accounts: int = 1000, workers: int = None) -> None:
+    workers = workers or default_workers()
+    print(f"{accounts} comptes, {os.cpu_count()} CPU, {workers} processus\n")
+
+    sample = users(min(SERIAL_SAMPLE, accounts))
+    start = time.perf_counter()
+    for user in sample:
+        Employee(**user)
+    per_account = (time.perf_counter() - start) / len(sample)
+    serial = per_account * accounts
+    print(f"un à un ( validateur )  : {serial:8.1f} s  ( {per_account * 1000:.0f} ms par compte, extrapolé )")
+
+    start = time.perf_counter()
+    employees = build_employees(users(accounts), workers)
+    parallel = time.perf_counter() - start
+    assert len(employees) == accounts
+    print(f"pool de processus       : {parallel:8.1f} s  ( {parallel / accounts * 1000:.0f} ms par compte )")
+    print(f"\naccélération : x{serial / parallel:.1f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else None,
+    )
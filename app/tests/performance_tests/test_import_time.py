@@ -0,0 +1,69 @@
+"""
+Audit du temps d'import au lancement de l'application ( `python -X importtime` ).
+
+Le test vérifie que les modules lourds inutiles avant l'écran de connexion ( SDK Sentry, jwt, bcrypt, contrôleurs
+des menus ) ne sont pas importés par `app.main` : ils sont chargés à leur première utilisation.
+
+Usage ( depuis la racine du projet ) pour afficher les modules les plus coûteux :
+    python -m app.tests.performance_tests.test_import_time [nombre_de_modules]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[3]
+
+# modules chargés à la première utilisation, après l'écran de connexion
+DEFERRED_MODULES = ["sentry_sdk", "jwt", "bcrypt", "app.controllers.menu_manage", "app.controllers.utils_manage"]
+
+
+def import_times(module: str = "app.main") -> dict:
+    """
+    Importe un module dans un nouvel interpréteur avec `-X importtime`.
+
+    Args:
+        module (str): Le module à importer.
+
+    Returns:
+        dict: { nom du module : ( temps propre, temps cumulé ) } en microsecondes.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, name = line[len("import time:") :].split("|")
+        if self_time.strip().isdigit():
+            times[name.strip()] = (int(self_time), int(cumulative))
+    return times
+
+
+@pytest.fixture(scope="module")
+def main_import_times():
+    return import_times("app.main")
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES)
+def test_module_not_imported_at_startup(main_import_times, module):
+    assert "app.main" in main_import_times
+    assert module not in main_import_times
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    times = import_times("app.main")
+    print(f"app.main : {times['app.main'][1] / 1000:.1f} ms\n")
+    print(f"{'cumulé (ms)':>12} {'propre (ms)':>12}  module")
+    for name, (self_time, cumulative) in sorted(times.items(), key=lambda item: item[1][1], reverse=True)[:count]:
+        print(f"{cumulative / 1000:>12.1f} {self_time / 1000:>12.1f}  {name}")
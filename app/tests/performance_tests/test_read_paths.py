@@ -0,0 +1,213 @@
+"""
+Benchmark des lectures des contrôleurs sur une base SQLite embarquée, pour chaque rôle et plusieurs volumes.
+
+Pour chaque volume ( BENCH_SIZES, par défaut 1000 et 10000 lignes ), une base SQLite fichier est peuplée par
+SyntheticDataGenerator. Chaque lecture est exécutée avec l'utilisateur prédéfini de chaque rôle ( commercial_1,
+support_1, gestion_1 ), dans une nouvelle session : nombre de requêtes SQL et durée médiane.
+
+Le test échoue si une lecture émet plus de requêtes que la référence enregistrée ( read_paths_baseline.json ). Les
+durées dépendent du poste : elles ne sont comparées que sur demande, le test échouant alors si la durée médiane
+dépasse BENCH_TIME_FACTOR fois la référence ( non définie ou 0 : durées non comparées, ex : BENCH_TIME_FACTOR=3 ).
+
+Usage ( depuis la racine du projet ) pour afficher le rapport ou enregistrer une nouvelle référence :
+    python -m app.tests.performance_tests.test_read_paths [--update-baseline]
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers.contract_manage import ContractManage
+from app.controllers.event_manage import EventManage
+from app.controllers.utils_manage import UtilsManage
+from app.dev.synthetic_data import SyntheticDataGenerator
+from app.models.database import DatabaseConfig
+from app.models.employee import Employee
+from app.models.event import Event
+from app.models.role import Role
+from app.permissions.scopes import Scopes
+from app.tests.helpers import count_statements
+
+BASELINE_PATH = Path(__file__).with_name("read_paths_baseline.json")
+DEFAULT_SIZES = (1000, 10000)
+# utilisateur prédéfini de chaque rôle ( DatabaseInitializer.USERS )
+ROLE_USERS = {
+    "Commercial": "commercial_1@email.com",
+    "Support": "support_1@email.com",
+    "Gestion": "gestion_1@email.com",
+}
+READ_PATHS = ("get_permissions_events", "get_permissions_contracts", "filter", "table_create", "valid_id")
+REPEAT = 5
+SEED = 0
+DEFAULT_TIME_FACTOR = 0.0
+# marge absolue des durées : les lectures de quelques millisecondes varient plus que leur durée
+TIME_SLACK_MS = 5.0
+
+
+def bench_sizes() -> list:
+    """Volumes mesurés ( variable d'environnement BENCH_SIZES, ex : "1000,10000,100000" )."""
+
+    sizes = os.environ.get("BENCH_SIZES", "")
+    return [int(size) for size in sizes.split(",")] if sizes else list(DEFAULT_SIZES)
+
+
+def build_database(path: Path, size: int) -> sessionmaker:
+    """
+    Crée une base SQLite fichier peuplée de `size` lignes générées.
+
+    Args:
+        path (Path): Le fichier de la base.
+        size (int): Le nombre total de lignes générées ( voir SyntheticDataGenerator.scale ).
+
+    Returns:
+        sessionmaker: Le sessionmaker de la base.
+    """
+
+    engine = create_engine(f"sqlite:///{path}")
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    generator = SyntheticDataGenerator(
+        session_local(), engine, DatabaseConfig.BASE, Mock(), SyntheticDataGenerator.scale(size), SEED
+    )
+    # hash peu coûteux des employés : les connexions ne sont pas mesurées
+    with patch.dict(os.environ, {"BCRYPT_ROUNDS": "4", "BCRYPT_WORKERS": "1"}):
+        generator.generate()
+    return session_local
+
+
+def read_path(session, role_name: str, path: str):
+    """
+    Prépare une lecture pour l'utilisateur prédéfini d'un rôle ( la préparation n'est pas mesurée ).
+
+    Args:
+        session (Session): La session de la mesure.
+        role_name (str): Le rôle ( Commercial, Support ou Gestion ).
+        path (str): La lecture ( voir READ_PATHS ).
+
+    Returns:
+        Callable: La lecture à mesurer.
+    """
+
+    employee = session.query(Employee).filter_by(Email=ROLE_USERS[role_name]).one()
+    role = session.get(Role, employee.RoleId)
+    utils = UtilsManage(employee)
+
+    if path == "get_permissions_events":
+        return EventManage(session, employee, role).get_permissions_events
+    if path == "get_permissions_contracts":
+        return ContractManage(session, employee, role).get_permissions_contracts
+    if path == "filter":
+        # première page de la liste des évènements ( voir UtilsManage.pages )
+        return lambda: utils.filter(session, "All", None, Event, limit=utils.page_size + 1)
+    if path == "table_create":
+        events = EventManage(session, employee, role).get_permissions_events()
+        return lambda: utils.table_create("event", events)
+    if path == "valid_id":
+        scoped_query = Scopes(role, employee.Id).query(session, Event)
+        event_id = scoped_query.with_entities(Event.Id).order_by(Event.Id.desc()).limit(1).scalar()
+        utils.view = Mock(return_choice=Mock(return_value=str(event_id)))
+        return lambda: utils.valid_id(session, Event, "évènement", Scopes(role, employee.Id).query(session, Event))
+    raise ValueError(f"Unknown read path: {path}")
+
+
+def measure(session_local: sessionmaker, role_name: str, path: str, repeat: int = REPEAT) -> dict:
+    """
+    Mesure une lecture : nombre de requêtes de la première exécution puis durée médiane des suivantes.
+
+    Chaque exécution a sa propre session : les éléments ne sont jamais déjà chargés.
+
+    Returns:
+        dict: { "statements": nombre de requêtes, "median_ms": durée médiane en millisecondes }.
+    """
+
+    engine = session_local.kw["bind"]
+    statements = None
+    times = []
+    for _ in range(repeat + 1):
+        with session_local() as session:
+            func = read_path(session, role_name, path)
+            if statements is None:
+                statements = count_statements(engine, func)
+                continue
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+    return {"statements": statements, "median_ms": round(statistics.median(times), 2)}
+
+
+def baseline_key(size: int, role_name: str, path: str) -> str:
+    return f"{size}/{role_name}/{path}"
+
+
+def load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def databases(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("read_paths")
+    return {size: build_database(directory / f"bench_{size}.db", size) for size in bench_sizes()}
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return load_baseline()
+
+
+@pytest.mark.parametrize("path", READ_PATHS)
+@pytest.mark.parametrize("role_name", list(ROLE_USERS))
+@pytest.mark.parametrize("size", bench_sizes())
+def test_read_path_regression(databases, baseline, size, role_name, path):
+    reference = baseline.get(baseline_key(size, role_name, path))
+    if reference is None:
+        pytest.skip(f"pas de référence pour {baseline_key(size, role_name, path)}")
+
+    time_factor = float(os.environ.get("BENCH_TIME_FACTOR", DEFAULT_TIME_FACTOR))
+    # durées non comparées : une seule exécution chronométrée
+    result = measure(databases[size], role_name, path, REPEAT if time_factor else 1)
+
+    assert result["statements"] <= reference["statements"], f"requêtes : {result} ( référence {reference} )"
+    if time_factor:
+        limit_ms = reference["median_ms"] * time_factor + TIME_SLACK_MS
+        assert result["median_ms"] <= limit_ms, f"durée : {result} ( référence {reference} )"
+
+
+def main(update_baseline: bool = False) -> None:
+    baseline = load_baseline()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(
+            f"{'lignes':>8} {'rôle':<11} {'lecture':<26} {'requêtes':>9} {'médiane (ms)':>13} {'référence (ms)':>15}"
+        )
+        for size in bench_sizes():
+            session_local = build_database(Path(directory) / f"bench_{size}.db", size)
+            for role_name in ROLE_USERS:
+                for path in READ_PATHS:
+                    key = baseline_key(size, role_name, path)
+                    results[key] = result = measure(session_local, role_name, path)
+                    reference = baseline.get(key, {}).get("median_ms", "-")
+                    print(
+                        f"{size:>8} {role_name:<11} {path:<26} {result['statements']:>9} "
+                        f"{result['median_ms']:>13.2f} {reference:>15}"
+                    )
+            session_local.kw["bind"].dispose()
+
+    if update_baseline:
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nRéférence enregistrée dans {BASELINE_PATH}")
+
+
+if __name__ == "__main__":
+    main("--update-baseline" in sys.argv[1:])
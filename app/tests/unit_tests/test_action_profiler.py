@@ -0,0 +1,52 @@
+import os
+import pstats
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.utils.action_profiler import ActionProfiler, profiling_enabled, slugify
+
+
+def slow_action():
+    return sum(range(1000))
+
+
+def test_profile_writes_one_file_per_action(tmp_path):
+    logger = Mock()
+    profiler = ActionProfiler(logger, tmp_path / "profiles")
+
+    with profiler.profile("Modifier un contrat"):
+        slow_action()
+    with profiler.profile("Liste des évènements"):
+        slow_action()
+
+    files = sorted(path.name for path in (tmp_path / "profiles").iterdir())
+    assert len(files) == 2
+    assert files[0].endswith("_modifier_un_contrat.prof")
+    assert files[1].endswith("_liste_des_evenements.prof")
+    stats = pstats.Stats(str(tmp_path / "profiles" / files[0]))
+    assert any(function[2] == "slow_action" for function in stats.stats)
+    assert logger.info.call_count == 2
+
+
+def test_profile_written_when_action_fails(tmp_path):
+    profiler = ActionProfiler(Mock(), tmp_path)
+
+    with pytest.raises(ValueError):
+        with profiler.profile("Créer un client"):
+            raise ValueError("erreur")
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_slugify():
+    assert slugify("Gestion des évènements") == "gestion_des_evenements"
+    assert slugify("???") == "action"
+
+
+def test_profiling_enabled():
+    with patch.dict(os.environ, {"PROFILE_ACTIONS": "false"}):
+        assert profiling_enabled(["--profile"])
+        assert not profiling_enabled([])
+    with patch.dict(os.environ, {"PROFILE_ACTIONS": "oui"}):
+        assert profiling_enabled([])
@@ -0,0 +1,89 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import jwt
+import pytest
+from dotenv import load_dotenv
+
+from app.controllers import authentication
+from app.controllers.authentication import AuthenticationManager
+from app.utils import token_manage_json
+
+# Charger les variables d'environnement pour les tests
+load_dotenv()
+
+
+class TestAuthenticationManager:
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        # crée un repertoire temporaire, supprimé aprés le bloc test
+        with tempfile.TemporaryDirectory() as tempdir:
+            self.auth_manager = AuthenticationManager(Mock(), Mock())
+            self.auth_manager.token_file_path = os.path.join(tempdir, "token.json")
+            self.mock_decode = patch("jwt.decode", wraps=jwt.decode).start()
+
+            yield
+
+            patch.stopall()
+
+    def test_verify_token_decoded_once(self):
+
+        # Arrang
+        self.auth_manager.generate_jwt_token(1)
+        self.mock_decode.reset_mock()
+
+        # Act
+        results = [self.auth_manager.verify_and_decode_jwt_token() for _ in range(100)]
+
+        # Assert
+        assert all(result["user_id"] == 1 for result in results)
+        self.mock_decode.assert_not_called()
+
+    def test_verify_token_file_changed(self):
+
+        # Arrang
+        self.auth_manager.generate_jwt_token(1)
+        self.auth_manager.verify_and_decode_jwt_token()
+
+        # Act
+        token_manage_json.delete_token(self.auth_manager.token_file_path)
+        result = self.auth_manager.verify_and_decode_jwt_token()
+
+        # Assert
+        assert result is None
+        assert self.auth_manager.token_cache is None
+
+    def test_verify_token_new_token(self):
+
+        # Arrang
+        self.auth_manager.generate_jwt_token(1)
+        token = jwt.encode(
+            {"user_id": 2, "exp": datetime.now() + timedelta(minutes=5)}, self.auth_manager.SECRET_KEY, "HS256"
+        )
+        token_manage_json.save_token_to_json(token, self.auth_manager.token_file_path)
+
+        # Act
+        result = self.auth_manager.verify_and_decode_jwt_token()
+
+        # Assert
+        assert result["user_id"] == 2
+
+    def test_verify_token_expired(self):
+
+        # Arrang
+        self.auth_manager.generate_jwt_token(1)
+        self.auth_manager.token_cache["expiry"] = datetime.now() - timedelta(seconds=1)
+        token = jwt.encode(
+            {"user_id": 1, "exp": datetime.now() - timedelta(minutes=5)}, self.auth_manager.SECRET_KEY, "HS256"
+        )
+        with patch.object(authentication, "load_token_from_json", return_value=token):
+
+            # Act
+            result = self.auth_manager.verify_and_decode_jwt_token()
+
+        # Assert
+        assert result is None
+        assert token_manage_json.load_token_from_json(self.auth_manager.token_file_path) == ""
@@ -100,6 +100,7 @@ class TestContractManage:
         self.mock_filter = patch.object(UtilsManage, "filter").start()
         self.mock_valid_oper = patch.object(UtilsManage, "valid_oper").start()
         self.mock_valid_id = patch.object(UtilsManage, "valid_id").start()
+        self.mock_has_rows = patch.object(UtilsManage, "has_rows").start()
         self.mock_str_to_bool = patch.object(UtilsManage, "str_to_bool").start()
         self.mock_get_permissions_contracts = patch.object(ContractManage, "get_permissions_contracts").start()
         self.mock_get_permissions_customers = patch.object(ContractManage, "get_permissions_customers").start()
@@ -128,7 +129,9 @@ class TestContractManage:
         self.contract_manage.list()
 
         # Assert
-        self.mock_filter.assert_called_once_with(self.session, "All", None, Contract)
+        self.mock_filter.assert_called_once_with(
+            self.session, "All", None, Contract, after_id=None, limit=self.contract_manage.utils.page_size + 1
+        )
         self.mock_table_create.assert_called_once_with("contract", mock_contracts)
         self.mock_display_table.assert_called_once_with(mock_table, "Liste des Contrats")
 
@@ -159,7 +162,7 @@ class TestContractManage:
         mock_filter1 = MagicMock()
         mock_filter2 = MagicMock()
 
-        self.session.query.return_value = mock_query
+        self.session.query.return_value.options.return_value = mock_query
         mock_query.join.return_value = mock_join
         mock_join.filter.return_value = mock_filter1
         mock_filter1.filter.return_value = mock_filter2
@@ -255,8 +258,6 @@ class TestContractManage:
         self.mock_return_choice.side_effect = ["contract_title", "1", "100", "50", "oui"]
 
         # Arrange
-        mock_contracts = [Contract(), Contract()]
-        self.mock_get_permissions_contracts.return_value = mock_contracts
         mock_customers = [Customer(), Customer()]
         self.mock_get_permissions_customers.return_value = mock_customers
         self.mock_valid_id.return_value = Mock()
@@ -269,15 +270,13 @@ class TestContractManage:
 
         # Assert
         self.contract_manage.get_permissions_customers.assert_called_once()
-        self.contract_manage.get_permissions_contracts.assert_called_once()
+        self.mock_has_rows.assert_called_once()
         self.mock_display_title_panel_color_fit.assert_called_with("Modification d'un contrat", "yellow", True)
         self.mock_valid_oper.assert_called()
 
     def test_update_with_no_customers(self):
 
         # Arrange
-        mock_contracts = [Contract(), Contract()]
-        self.mock_get_permissions_contracts.return_value = mock_contracts
         mock_customers = []
         self.mock_get_permissions_customers.return_value = mock_customers
 
@@ -286,15 +285,14 @@ class TestContractManage:
 
         # Assert
         self.contract_manage.get_permissions_customers.assert_called_once()
-        self.contract_manage.get_permissions_contracts.assert_called_once()
+        self.mock_has_rows.assert_not_called()
         self.mock_display_red_message.assert_called_once_with("Aucuns clients autorisés pour le contrat !")
         self.mock_valid_oper.assert_not_called()
 
     def test_update_with_no_contracts(self):
 
         # Arrange
-        mock_contracts = []
-        self.mock_get_permissions_contracts.return_value = mock_contracts
+        self.mock_has_rows.return_value = False
         mock_customers = [Customer()]
         self.mock_get_permissions_customers.return_value = mock_customers
 
@@ -303,15 +301,13 @@ class TestContractManage:
 
         # Assert
         self.contract_manage.get_permissions_customers.assert_called_once()
-        self.contract_manage.get_permissions_contracts.assert_called_once()
+        self.mock_has_rows.assert_called_once()
         self.mock_display_red_message.assert_called_once_with("Vous n'avez aucuns contrats à modifier !!!")
         self.mock_valid_oper.assert_not_called()
 
     def test_update_with_no_contract_id(self):
 
         # Arrange
-        mock_contracts = [Contract]
-        self.mock_get_permissions_contracts.return_value = mock_contracts
         mock_customers = [Customer()]
         self.mock_get_permissions_customers.return_value = mock_customers
         self.mock_valid_id.return_value = None
@@ -325,8 +321,6 @@ class TestContractManage:
     def test_update_with_no_confirmation(self):
 
         # Arrange
-        mock_contracts = [Contract]
-        self.mock_get_permissions_contracts.return_value = mock_contracts
         mock_customers = [Customer()]
         self.mock_get_permissions_customers.return_value = mock_customers
         self.mock_valid_id.return_value = Mock()
@@ -343,8 +337,6 @@ class TestContractManage:
     def test_delete_success(self):
 
         # Arrange
-        mock_contracts = [Contract]
-        self.mock_get_permissions_contracts.return_value = mock_contracts
         self.mock_valid_id.return_value = Mock()
 
         # Act
@@ -357,8 +349,6 @@ class TestContractManage:
     def test_delete_with_no_contract(self):
 
         # Arrange
-        mock_contracts = []
-        self.mock_get_permissions_contracts.return_value = mock_contracts
         self.mock_valid_id.return_value = None
 
         # Act
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from app.controllers.customer_manage import CustomerManage
-from app.controllers.utils_manage import UtilsManage
+from app.controllers.utils_manage import OperResult, UtilsManage
 from app.models.customer import Customer
 from app.models.employee import Employee
 from app.models.role import Role
@@ -67,7 +67,9 @@ class TestCustomerManage:
         self.customer_manage.list()
 
         # Assert
-        self.mock_filter.assert_called_once_with(self.session, "All", None, Customer)
+        self.mock_filter.assert_called_once_with(
+            self.session, "All", None, Customer, after_id=None, limit=self.customer_manage.utils.page_size + 1
+        )
         self.mock_table_create.assert_called_once_with("customer", mock_customers)
         self.mock_display_table.assert_called_once()
 
@@ -134,6 +136,21 @@ class TestCustomerManage:
         self.mock_return_choice.assert_called()
         self.mock_valid_oper.assert_called()
 
+    def test_update_stale_prompts_again(self):
+
+        # Arrang
+        self.mock_return_choice.side_effect = ["John", "Doe", "eamil@email.com", "123456789", "ABC Inc."] * 2
+        self.mock_valid_id.return_value = self.test_customer
+        self.mock_confirm_table_recap.return_value = True
+        self.mock_valid_oper.side_effect = [OperResult.STALE, OperResult.SUCCESS]
+
+        # Act
+        self.customer_manage.update()
+
+        # Assert
+        assert self.mock_return_choice.call_count == 10
+        assert self.mock_valid_oper.call_count == 2
+
     def test_update_with_no_customer(self):
 
         # Arrang
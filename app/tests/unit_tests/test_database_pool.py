@@ -0,0 +1,143 @@
+import os
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.models.database import DatabaseConfig
+from app.models.database_pool import MonitoredQueuePool, PoolMonitor
+
+
+@pytest.fixture
+def engine():
+    """Engine SQLite avec un pool d'une seule connexion, sans dépassement et un délai d'attente très court."""
+    engine = create_engine("sqlite://", poolclass=MonitoredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    yield engine
+    engine.dispose()
+
+
+class TestMonitoredQueuePool:
+    """Tests des statistiques du pool de connexions."""
+
+    def test_stats_count_checkouts(self, engine):
+        for _ in range(3):
+            with engine.connect():
+                pass
+
+        stats = engine.pool.stats()
+
+        assert stats["checkouts"] == 3
+        assert stats["checked_out"] == 0
+        assert stats["checked_in"] == 1
+        assert stats["wait_max_ms"] >= stats["wait_avg_ms"] >= 0
+        # statistiques d'attente remises à zéro après le relevé
+        assert engine.pool.stats()["checkouts"] == 0
+
+    def test_stats_count_timeouts(self, engine):
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+            stats = engine.pool.stats(reset=False)
+
+        assert stats["checked_out"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["checkouts"] == 1
+
+
+class TestPoolMonitor:
+    """Tests du relevé périodique des statistiques du pool."""
+
+    def test_log_stats_on_timer(self, engine):
+        logged = threading.Event()
+        logger = Mock()
+        logger.debug.side_effect = lambda message: logged.set()
+        pool_monitor = PoolMonitor(engine, logger, 0.01)
+
+        pool_monitor.start()
+        assert logged.wait(2)
+        pool_monitor.stop()
+
+        assert "checked_out=0" in logger.debug.call_args[0][0]
+        assert pool_monitor.thread is None
+
+    def test_disabled_with_zero_interval(self, engine):
+        pool_monitor = PoolMonitor(engine, Mock(), 0)
+
+        pool_monitor.start()
+
+        assert pool_monitor.thread is None
+
+
+def test_pool_options_from_env():
+    database_config = DatabaseConfig.__new__(DatabaseConfig)
+    env = {
+        "DB_POOL_SIZE": "2",
+        "DB_MAX_OVERFLOW": "3",
+        "DB_POOL_RECYCLE": "60",
+        "DB_POOL_PRE_PING": "false",
+        "DB_POOL_TIMEOUT": "5",
+    }
+
+    with patch.dict(os.environ, env):
+        options = database_config._pool_options()
+
+    assert options == {
+        "poolclass": MonitoredQueuePool,
+        "pool_size": 2,
+        "max_overflow": 3,
+        "pool_recycle": 60,
+        "pool_pre_ping": False,
+        "pool_timeout": 5.0,
+    }
+
+
+def test_lazy_engine_created_on_first_use():
+    with patch("app.models.database.create_engine") as mock_create_engine, patch.dict(
+        os.environ, {"DB_POOL_STATS_INTERVAL": "0"}
+    ), patch.object(DatabaseConfig, "_query_stats", return_value=None):
+        database_config = DatabaseConfig(Mock(), lazy=True)
+        mock_create_engine.assert_not_called()
+
+        database_config.db_session_local()
+
+    mock_create_engine.assert_called_once()
+    assert database_config.engine is mock_create_engine.return_value
+
+
+def test_pool_monitor_logs_to_dedicated_file():
+    with patch("app.models.database.create_engine"), patch(
+        "app.models.database.LoggerConfig"
+    ) as mock_logger_config, patch("app.models.database.PoolMonitor") as mock_pool_monitor, patch.object(
+        DatabaseConfig, "_query_stats", return_value=None
+    ):
+        DatabaseConfig(Mock(), lazy=True).engine
+
+    mock_logger_config.assert_called_with("epic_events.pool", "db_pool.log", console=False)
+    assert mock_pool_monitor.call_args[0][1] is mock_logger_config.return_value.get_logger.return_value
+
+
+def test_lazy_session_created_on_first_use():
+    with patch("app.models.database.create_engine") as mock_create_engine, patch(
+        "app.models.database.sessionmaker"
+    ) as mock_sessionmaker, patch.dict(os.environ, {"DB_POOL_STATS_INTERVAL": "0"}), patch.object(
+        DatabaseConfig, "_query_stats", return_value=None
+    ):
+        database_config = DatabaseConfig(Mock(), lazy=True)
+        session = database_config.lazy_session()
+        # écran de connexion quitté sans requête : ni engine ni session
+        session.close()
+        mock_create_engine.assert_not_called()
+
+        session.query("Employee")
+        session.query("Role")
+
+    mock_create_engine.assert_called_once()
+    # une seule session pour toutes les requêtes
+    mock_sessionmaker.return_value.assert_called_once()
+    assert mock_sessionmaker.return_value.return_value.query.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main(["--cov=app/models/", "--cov-report=html", __file__])
@@ -70,7 +70,9 @@ class TestEmployeeManage:
         self.employee_manage.list()
 
         # Assert
-        self.mock_filter.assert_called_once_with(self.session, "All", None, Employee)
+        self.mock_filter.assert_called_once_with(
+            self.session, "All", None, Employee, after_id=None, limit=self.employee_manage.utils.page_size + 1
+        )
         self.mock_table_create.assert_called_once_with("employee", mock_employees)
         self.mock_display_table.assert_called_once_with(mock_table, "Liste des Employés")
 
@@ -5,11 +5,13 @@ import pytest
 
 from app.controllers.event_manage import EventManage
 from app.controllers.utils_manage import UtilsManage
+from app.models.contract import Contract
 from app.models.customer import Customer
 from app.models.employee import Employee
 from app.models.event import Event
 from app.models.role import Role
 from app.permissions.permissions import Permissions
+from app.permissions.scopes import Scopes
 from app.views.views import View
 
 
@@ -44,6 +46,7 @@ class TestEventManage:
         self.mock_filter = patch.object(UtilsManage, "filter").start()
         self.mock_valid_oper = patch.object(UtilsManage, "valid_oper").start()
         self.mock_valid_id = patch.object(UtilsManage, "valid_id").start()
+        self.mock_has_rows = patch.object(UtilsManage, "has_rows").start()
         self.mock_permissions_role_name = patch.object(Permissions, "role_name").start()
         self.mock_permissions_all_event = patch.object(Permissions, "all_event").start()
         self.mock_permissions_all_contract = patch.object(Permissions, "all_contract").start()
@@ -201,8 +204,7 @@ class TestEventManage:
     def test_update_with_no_events(self):
 
         # Arrang
-        events = []
-        self.mock_get_permissions_events.return_value = events
+        self.mock_has_rows.return_value = False
 
         # Act
         self.event_manage.update()
@@ -262,8 +264,7 @@ class TestEventManage:
     def test_delete_with_no_events(self):
 
         # Arrang
-        events = []
-        self.mock_get_permissions_events.return_value = events
+        self.mock_has_rows.return_value = False
 
         # Act
         self.event_manage.delete()
@@ -289,96 +290,33 @@ class TestEventManage:
 
     def test_get_permissions_events(self):
 
-        # Arrang 1 avec permission all_event
+        # Arrang
         patch.stopall()
-        mock_filter = patch.object(UtilsManage, "filter").start()
-        mock_permissions_all_event = patch.object(Permissions, "all_event").start()
-        mock_permissions_role_name = patch.object(Permissions, "role_name").start()
-
-        mock_permissions_all_event.return_value = True
-        all_events = ["event 1", "event 2"]
-        mock_filter.return_value = all_events
-
-        # Act 1 avec permission all_event
-        result = self.event_manage.get_permissions_events()
-
-        # Assert 1 avec permission all_event
-        assert result == all_events
-
-        # Arrang 2 sans permissions all_event et role commercial
-        mock_permissions_all_event.return_value = False
-        mock_permissions_role_name.return_value = "Commercial"
-        all_events_query = ["event 1", "event 2", "event 3"]
-        self.session.query.return_value.join.return_value.join.return_value.filter.return_value.all.return_value = (
-            all_events_query
-        )
-
-        # Act 2 sans permissions all_event et role commercial
-        result = self.event_manage.get_permissions_events()
-
-        # Assert 2 sans permissions all_event et role commercial
-        assert result == all_events_query
-
-        # Arrang 3 sans permissions all_event et role support
-        mock_permissions_role_name.return_value = "support"
-        all_events_query = ["event 1"]
-        self.session.query.return_value.filter.return_value.all.return_value = all_events_query
-
-        # Act 3 sans permissions all_event et role support
-        result = self.event_manage.get_permissions_events()
-
-        # Assert 3 sans permissions all_event et role support
-        assert result == all_events_query
+        mock_scopes_query = patch.object(Scopes, "query").start()
+        events = ["event 1", "event 2"]
+        mock_scopes_query.return_value.options.return_value.all.return_value = events
 
-        # Arrang 4 sans permissions all_event et autre role
-        mock_permissions_role_name.return_value = "xxx"
-
-        # Act 4 sans permissions all_event et autre role
+        # Act
         result = self.event_manage.get_permissions_events()
 
-        # Assert 4 sans permissions all_event et autre role
-        assert result == []
+        # Assert
+        mock_scopes_query.assert_called_once_with(self.session, Event)
+        assert result == events
 
     def test_get_contracts_signed(self):
 
-        # Arrang 1 avec permission all_contract
+        # Arrang
         patch.stopall()
-        mock_filter = patch.object(UtilsManage, "filter").start()
-        mock_permissions_all_contract = patch.object(Permissions, "all_contract").start()
-        mock_permissions_role_name = patch.object(Permissions, "role_name").start()
-
-        mock_permissions_all_contract.return_value = True
-        all_contracts = ["contract 1", "contract 2"]
-        mock_filter.return_value = all_contracts
-
-        # Act 1 avec permission all_contract
-        result = self.event_manage.get_permissions_contracts_signed()
-
-        # Assert 1 avec permission all_contract
-        assert result == all_contracts
+        mock_scopes_query = patch.object(Scopes, "query").start()
+        contracts = ["contract 1", "contract 2"]
+        mock_scopes_query.return_value.filter.return_value.all.return_value = contracts
 
-        # Arrang 2 sans permissions all_contract et role commercial
-        mock_permissions_all_contract.return_value = False
-        mock_permissions_role_name.return_value = "Commercial"
-        all_contracts_query = ["contract 1", "contract 2", "contract 3"]
-        self.session.query.return_value.join.return_value.filter.return_value.filter.return_value.all.return_value = (
-            all_contracts_query
-        )
-
-        # Act 2 sans permissions all_contract et role commercial
-        result = self.event_manage.get_permissions_contracts_signed()
-
-        # Assert 2 sans permissions all_contract et role commercial
-        assert result == all_contracts_query
-
-        # Arrang 3 sans permissions all_contract et autre role
-        mock_permissions_role_name.return_value = "xxx"
-
-        # Act 3 sans permissions all_contract et autre role
+        # Act
         result = self.event_manage.get_permissions_contracts_signed()
 
-        # Assert 3 sans permissions all_contract et autre role
-        assert result == []
+        # Assert
+        mock_scopes_query.assert_called_once_with(self.session, Contract)
+        assert result == contracts
 
     def test_validation_date(self):
 
@@ -1,5 +1,7 @@
+import json
 import logging
 import sys
+from logging.handlers import QueueHandler
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -53,5 +55,66 @@ class TestLoggerConfig:
             mock_error.assert_called_once_with("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
 
 
+class TestLoggerConfigHandlers:
+    """
+    Tests des handlers ( mode direct, mode file d'attente, format JSON lines ) sur des loggers réels.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, tmp_path, request):
+        self.log_file = str(tmp_path / "test.log")
+        self.name = f"test_logger_config.{request.node.name}"
+
+        yield
+
+        logger = logging.getLogger(self.name)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+    def test_setup_is_idempotent(self):
+        LoggerConfig(self.name, self.log_file, use_queue=False)
+        logger = LoggerConfig(self.name, self.log_file, use_queue=False).get_logger()
+
+        assert len(logger.handlers) == 2
+
+    def test_queue_mode(self):
+        logger_config = LoggerConfig(self.name, self.log_file, use_queue=True)
+        logger = LoggerConfig(self.name, self.log_file, use_queue=True).get_logger()
+
+        logger.info("message en file")
+        logger_config.stop()
+
+        assert len(logger.handlers) == 1
+        assert isinstance(logger.handlers[0], QueueHandler)
+        with open(self.log_file, encoding="utf-8") as file:
+            assert "message en file" in file.read()
+
+    def test_without_console(self):
+        excepthook = sys.excepthook
+        logger = LoggerConfig(self.name, self.log_file, use_queue=False, console=False).get_logger()
+
+        assert len(logger.handlers) == 1
+        assert isinstance(logger.handlers[0], logging.FileHandler)
+        assert logger.propagate is False
+        assert sys.excepthook is excepthook
+
+    def test_jsonl_format(self):
+        logger = LoggerConfig(self.name, self.log_file, use_queue=False, log_format="jsonl").get_logger()
+
+        logger.warning("message %s", "json")
+        try:
+            raise ValueError("erreur")
+        except ValueError:
+            logger.exception("exception")
+
+        with open(self.log_file, encoding="utf-8") as file:
+            lines = [json.loads(line) for line in file]
+        assert lines[0]["message"] == "message json"
+        assert lines[0]["level"] == "WARNING"
+        assert lines[0]["logger"] == self.name
+        assert "ValueError: erreur" in lines[1]["exception"]
+
+
 if __name__ == "__main__":
     pytest.main(["-s", "--cov=app/utils/", "--cov-report=html", __file__])
@@ -79,6 +79,20 @@ class TestApplication:
         # Assert
         assert result == ("retry", None, None)
 
+    def test_authenticate_database_not_ready(self):
+        """Test de la fonction authenticate lorsque la vérification de la base a échoué ( démarrage rapide )"""
+        # Arrang
+        self.mock_return_choice.side_effect = ["test@email.com", "Password123"]
+        database_ready = Mock(return_value=False)
+
+        # Act
+        result = main.authenticate(self.view, self.auth_manager, self.session, database_ready)
+
+        # Assert
+        assert result == ("quit", None, None)
+        database_ready.assert_called_once()
+        self.mock_auth_authenticate.assert_not_called()
+
     def test_main_success(self):
 
         with patch("app.main.run_menu") as mock_run_menu, patch("app.main.authenticate") as mock_main_authenticate:
@@ -94,7 +108,7 @@ class TestApplication:
         # Assert
         self.mock_display_title_panel_color_fit.assert_called_with("Connexion Epic-Events", "magenta")
         mock_run_menu.assert_called_once_with(
-            self.view, self.auth_manager, self.session, "employee", "role", self.logger
+            self.view, self.auth_manager, self.session, "employee", "role", self.logger, None, None
         )
 
     def test_run_menu(self):
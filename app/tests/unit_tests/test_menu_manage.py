@@ -1,10 +1,19 @@
-from unittest.mock import Mock
+import sys
+from unittest.mock import MagicMock, Mock
 
 import pytest
 
 from app.controllers.menu_manage import MenuManage
 
 
+def stack_depth() -> int:
+    """Retourne le nombre de frames de la pile d'appels courante."""
+    frame, depth = sys._getframe(), 0
+    while frame is not None:
+        frame, depth = frame.f_back, depth + 1
+    return depth
+
+
 class TestMenuManage:
 
     @pytest.fixture(autouse=True)
@@ -57,99 +66,166 @@ class TestMenuManage:
     def test_menu_main(self):
         self.menu_manage.permissions.can_read_employee = Mock(return_value=True)
         self.menu_manage.permissions.can_read_role = Mock(return_value=True)
-        self.menu_manage.run_menu = Mock()
 
-        self.menu_manage.menu_main()
+        menu_items = self.menu_manage.menu_main()
 
-        assert self.menu_manage.run_menu.called
-        args, _ = self.menu_manage.run_menu.call_args
-        assert "Gestion des clients" in args[0][1]
-        assert "Gestion des contrats" in args[0][1]
-        assert "Gestion des évènements" in args[0][1]
-        assert "Gestion des employés" in args[0][1]
-        assert "Gestion des permissions" in args[0][1]
-        assert "Deconnexion" in args[0][1]
+        assert "Gestion des clients" in menu_items[1]
+        assert "Gestion des contrats" in menu_items[1]
+        assert "Gestion des évènements" in menu_items[1]
+        assert "Gestion des employés" in menu_items[1]
+        assert "Gestion des permissions" in menu_items[1]
+        assert "Deconnexion" in menu_items[1]
 
     def test_menu_customer(self):
         self.menu_manage.permissions.role_name = Mock(return_value="Commercial")
         self.menu_manage.permissions.can_update_customer = Mock(return_value=True)
         self.menu_manage.permissions.can_create_delete_customer = Mock(return_value=True)
-        self.menu_manage.run_menu = Mock()
 
-        self.menu_manage.menu_customer()
+        menu_items = self.menu_manage.menu_customer()
 
-        assert self.menu_manage.run_menu.called
-        args, _ = self.menu_manage.run_menu.call_args
-        assert "Liste des clients" in args[0][1]
-        assert "Liste de vos clients" in args[0][1]
-        assert "Modifier un client" in args[0][1]
-        assert "Créer un client" in args[0][1]
-        assert "Supprimer un client" in args[0][1]
+        assert "Liste des clients" in menu_items[1]
+        assert "Liste de vos clients" in menu_items[1]
+        assert "Modifier un client" in menu_items[1]
+        assert "Créer un client" in menu_items[1]
+        assert "Supprimer un client" in menu_items[1]
 
     def test_menu_contract(self):
         self.menu_manage.permissions.role_name = Mock(return_value="Commercial")
         self.menu_manage.permissions.can_update_contract = Mock(return_value=True)
         self.menu_manage.permissions.can_create_delete_contract = Mock(return_value=True)
-        self.menu_manage.run_menu = Mock()
 
-        self.menu_manage.menu_contract()
+        menu_items = self.menu_manage.menu_contract()
 
-        assert self.menu_manage.run_menu.called
-        args, _ = self.menu_manage.run_menu.call_args
-        assert "Liste des contrats" in args[0][1]
-        assert "Liste de vos contrats" in args[0][1]
-        assert "Liste de vos contrats non signés" in args[0][1]
-        assert "Liste de vos contrats non payés" in args[0][1]
-        assert "Modifier un contrat" in args[0][1]
-        assert "Créer un contrat" in args[0][1]
-        assert "Supprimer un contrat" in args[0][1]
+        assert "Liste des contrats" in menu_items[1]
+        assert "Liste de vos contrats" in menu_items[1]
+        assert "Liste de vos contrats non signés" in menu_items[1]
+        assert "Liste de vos contrats non payés" in menu_items[1]
+        assert "Modifier un contrat" in menu_items[1]
+        assert "Créer un contrat" in menu_items[1]
+        assert "Supprimer un contrat" in menu_items[1]
 
     def test_menu_event(self):
         self.menu_manage.permissions.role_name = Mock(return_value="Support")
         self.menu_manage.permissions.can_update_event = Mock(return_value=True)
         self.menu_manage.permissions.can_create_delete_event = Mock(return_value=True)
-        self.menu_manage.run_menu = Mock()
 
-        self.menu_manage.menu_event()
+        menu_items = self.menu_manage.menu_event()
 
-        assert self.menu_manage.run_menu.called
-        args, _ = self.menu_manage.run_menu.call_args
-        assert "Liste des évènements" in args[0][1]
-        assert "Liste des évènements sans support" in args[0][1]
-        assert "Liste de vos évènements" in args[0][1]
-        assert "Modifier un évènement" in args[0][1]
-        assert "Créer un évènement" in args[0][1]
-        assert "Supprimer un évènement" in args[0][1]
+        assert "Liste des évènements" in menu_items[1]
+        assert "Liste des évènements sans support" in menu_items[1]
+        assert "Liste de vos évènements" in menu_items[1]
+        assert "Modifier un évènement" in menu_items[1]
+        assert "Créer un évènement" in menu_items[1]
+        assert "Supprimer un évènement" in menu_items[1]
 
     def test_menu_employee(self):
         self.menu_manage.permissions.can_read_employee = Mock(return_value=True)
         self.menu_manage.permissions.can_update_employee = Mock(return_value=True)
         self.menu_manage.permissions.can_create_delete_employee = Mock(return_value=True)
-        self.menu_manage.run_menu = Mock()
 
-        self.menu_manage.menu_employee()
+        menu_items = self.menu_manage.menu_employee()
 
-        assert self.menu_manage.run_menu.called
-        args, _ = self.menu_manage.run_menu.call_args
-        assert "Liste des employés" in args[0][1]
-        assert "Modifier un employé" in args[0][1]
-        assert "Créer un employé" in args[0][1]
-        assert "Supprimer un employé" in args[0][1]
+        assert "Liste des employés" in menu_items[1]
+        assert "Modifier un employé" in menu_items[1]
+        assert "Créer un employé" in menu_items[1]
+        assert "Supprimer un employé" in menu_items[1]
 
     def test_menu_role(self):
         self.menu_manage.permissions.can_read_role = Mock(return_value=True)
         self.menu_manage.permissions.can_update_role = Mock(return_value=True)
         self.menu_manage.permissions.can_create_delete_role = Mock(return_value=True)
-        self.menu_manage.run_menu = Mock()
 
-        self.menu_manage.menu_role()
+        menu_items = self.menu_manage.menu_role()
+
+        assert "Liste des permissions" in menu_items[1]
+        assert "Modifier une permission" in menu_items[1]
+        assert "Créer une permission" in menu_items[1]
+        assert "Supprimer une permission" in menu_items[1]
+
+    def test_get_menu_built_once(self):
+        self.menu_manage.menu_customer = Mock(return_value=["Gestion des Clients : ", {}])
+        self.menu_manage.menu_builders["customer"] = self.menu_manage.menu_customer
+
+        menu_items = self.menu_manage.get_menu("customer")
+        self.menu_manage.get_menu("customer")
+
+        self.menu_manage.menu_customer.assert_called_once()
+        assert menu_items[1]["Retour au menu principal"] == "main"
+
+    def test_get_menu_rebuilt_on_role_revision(self):
+        self.menu_manage.get_menu("main")
+        self.menu_manage.menu_main = Mock(return_value=["Menu principal : ", {}])
+        self.menu_manage.menu_builders["main"] = self.menu_manage.menu_main
+
+        self.menu_manage.role_cache.revision = 2
+        self.menu_manage.get_menu("main")
+
+        self.menu_manage.menu_main.assert_called_once()
+
+    def test_run_menu_navigation_constant_stack(self):
+        """10 000 navigations menu principal <-> sous-menu sans croissance de la pile d'appels."""
+
+        depths = []
+
+        def display_menu(title, menu_list):
+            depths.append(stack_depth())
+            names = [name for _, name in menu_list]
+            if len(depths) > 10_000:
+                return str(names.index("Deconnexion") + 1)
+            if title == "Menu principal : ":
+                return str(names.index("Gestion des clients") + 1)
+            return str(names.index("Retour au menu principal") + 1)
+
+        self.view.display_menu.side_effect = display_menu
+        self.menu_manage.role_cache.check = Mock(return_value=True)
+
+        self.menu_manage.run_menu()
+
+        assert len(depths) == 10_001
+        assert len(set(depths)) == 1
+        assert self.menu_manage.is_logout
+        self.delete_token.assert_called_once()
+
+    def test_run_menu_session_expired(self):
+        self.verify_jwt.side_effect = [True, None]
+        self.view.display_menu.return_value = "1"
+        self.menu_manage.role_cache.check = Mock(return_value=True)
+
+        self.menu_manage.run_menu()
+
+        self.logger.info.assert_any_call("Session Expirée: john.doe@example.com")
+        assert self.menu_manage.is_logout
+
+    def test_run_menu_dispatch_action(self):
+        self.verify_jwt.side_effect = [True, True, None]
+        self.view.display_menu.side_effect = ["1", "1"]
+        self.menu_manage.role_cache.check = Mock(return_value=True)
+        self.menu_manage.dispatch = Mock()
+
+        self.menu_manage.run_menu()
+
+        self.menu_manage.dispatch.assert_called_once_with("Liste des clients", self.menu_manage.customer_manage.list)
+
+    def test_dispatch_with_query_stats(self):
+        self.menu_manage.query_stats = MagicMock()
+        action = Mock()
+
+        self.menu_manage.dispatch("Liste des clients", action)
+        self.menu_manage.logout()
+
+        self.menu_manage.query_stats.action.assert_called_once_with("Liste des clients")
+        action.assert_called_once_with()
+        self.menu_manage.query_stats.log_summary.assert_called_once_with()
+
+    def test_dispatch_with_profiler(self):
+        self.menu_manage.profiler = MagicMock()
+        action = Mock()
+
+        self.menu_manage.dispatch("Modifier un contrat", action)
 
-        assert self.menu_manage.run_menu.called
-        args, _ = self.menu_manage.run_menu.call_args
-        assert "Liste des permissions" in args[0][1]
-        assert "Modifier une permission" in args[0][1]
-        assert "Créer une permission" in args[0][1]
-        assert "Supprimer une permission" in args[0][1]
+        self.menu_manage.profiler.profile.assert_called_once_with("Modifier un contrat")
+        self.menu_manage.profiler.profile.return_value.__enter__.assert_called_once()
+        action.assert_called_once_with()
 
 
 if __name__ == "__main__":
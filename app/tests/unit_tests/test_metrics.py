@@ -0,0 +1,134 @@
+import math
+import urllib.request
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.models.database_pool import MonitoredQueuePool, pool_collector
+from app.utils.metrics import Counter, Histogram, MetricsRegistry, escape_label, format_value, start_exporter
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    yield registry
+    registry.stop()
+
+
+class TestFormat:
+    def test_format_value(self):
+        assert format_value(3.0) == "3"
+        assert format_value(0.25) == "0.25"
+        assert format_value(math.inf) == "+Inf"
+
+    def test_escape_label(self):
+        assert escape_label('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+class TestCounter:
+    def test_inc_by_labels(self):
+        counter = Counter("operations_total", "doc", ("model", "result"))
+        counter.inc("customer", "success")
+        counter.inc("customer", "success", amount=2)
+        counter.inc("contract", "cancelled")
+
+        assert counter.value("customer", "success") == 3
+        assert counter.value("event", "success") == 0
+        assert ("operations_total", '{model="customer",result="success"}', 3) in counter.samples()
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram("duration_seconds", "doc", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5):
+            histogram.observe(value)
+
+        samples = {name + labels: value for name, labels, value in histogram.samples()}
+
+        assert histogram.buckets[-1] == math.inf
+        assert samples['duration_seconds_bucket{le="0.1"}'] == 1
+        assert samples['duration_seconds_bucket{le="1"}'] == 3
+        assert samples['duration_seconds_bucket{le="+Inf"}'] == 4
+        assert samples["duration_seconds_count"] == 4
+        assert samples["duration_seconds_sum"] == pytest.approx(6.25)
+        assert histogram.count() == 4
+
+
+class TestMetricsRegistry:
+    def test_render_text_format(self, registry):
+        counter = registry.counter("logins_total", "Connexions.", ("result",))
+        counter.inc("success")
+        registry.add_collector(lambda: [("pool_size", "gauge", "Taille.", [({}, 5)])])
+
+        lines = registry.render().splitlines()
+
+        assert lines == [
+            "# HELP logins_total Connexions.",
+            "# TYPE logins_total counter",
+            'logins_total{result="success"} 1',
+            "# HELP pool_size Taille.",
+            "# TYPE pool_size gauge",
+            "pool_size 5",
+        ]
+
+    def test_write_textfile(self, registry, tmp_path):
+        registry.counter("logins_total", "Connexions.").inc()
+        path = tmp_path / "epic_events.prom"
+
+        registry.write_textfile(str(path))
+
+        assert "logins_total 1" in path.read_text(encoding="utf-8")
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_serve_metrics_endpoint(self, registry):
+        registry.counter("logins_total", "Connexions.").inc()
+        server = registry.serve(0)
+        port = server.server_address[1]
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+
+        assert "logins_total 1" in body
+        assert content_type.startswith("text/plain; version=0.0.4")
+
+    def test_start_exporter_disabled_by_default(self, registry):
+        logger = Mock()
+        with patch.dict("os.environ", {"METRICS_PORT": "0", "METRICS_TEXTFILE": ""}):
+            start_exporter(logger, registry)
+
+        assert registry.server is None
+        assert registry.flusher is None
+        logger.info.assert_not_called()
+
+    def test_start_exporter_invalid_port(self, registry):
+        logger = Mock()
+        with patch.dict("os.environ", {"METRICS_PORT": "abc"}):
+            start_exporter(logger, registry)
+
+        logger.error.assert_called_once()
+
+
+class TestPoolCollector:
+    def test_pool_metrics(self):
+        engine = create_engine("sqlite://", poolclass=MonitoredQueuePool, pool_size=2, max_overflow=0)
+        collect = pool_collector(engine)
+        with engine.connect():
+            values = {name: samples[0][1] for name, _, _, samples in collect()}
+        # le relevé des statistiques du journal ne remet pas à zéro les compteurs des métriques
+        engine.pool.stats()
+        with engine.connect():
+            pass
+        totals = {name: samples[0][1] for name, _, _, samples in collect()}
+        engine.dispose()
+
+        assert values["epic_events_db_pool_checked_out"] == 1
+        assert values["epic_events_db_pool_size"] == 2
+        assert totals["epic_events_db_pool_checked_out"] == 0
+        assert totals["epic_events_db_pool_checkouts_total"] == 2
+
+    def test_other_pool_has_no_metrics(self):
+        engine = create_engine("sqlite://")
+
+        assert pool_collector(engine)() == []
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.models.employee import Employee, HashedPassword
+from app.utils import password_hashing
+
+
+def user(i, password="Password123"):
+    return {"FirstName": f"user_{i}", "Email": f"User_{i}@email.com", "PasswordHash": password, "RoleId": 1}
+
+
+def test_hash_passwords_in_process_pool():
+    passwords = [f"Password{i}" for i in range(4)]
+
+    hashes = password_hashing.hash_passwords(passwords, workers=2)
+
+    assert all(isinstance(password_hash, HashedPassword) for password_hash in hashes)
+    employee = Employee(PasswordHash=hashes[2])
+    assert employee.verify_password("Password2")
+    assert not employee.verify_password("Password1")
+
+
+def test_hash_passwords_small_batch_is_serial():
+    with patch.object(password_hashing, "ProcessPoolExecutor") as mock_executor:
+        hashes = password_hashing.hash_passwords(["Password123"], workers=8)
+
+    mock_executor.assert_not_called()
+    assert len(hashes) == 1
+
+
+def test_build_employees_keeps_hashes():
+    with patch.object(
+        password_hashing,
+        "hash_passwords",
+        side_effect=lambda passwords, workers: [HashedPassword(f"hash_{password}") for password in passwords],
+    ) as mock_hash_passwords:
+        employees = password_hashing.build_employees([user(0), user(1, "Autre1234")])
+
+    mock_hash_passwords.assert_called_once_with(["Password123", "Autre1234"], None)
+    assert [employee.PasswordHash for employee in employees] == ["hash_Password123", "hash_Autre1234"]
+    assert employees[0].Email == "user_0@email.com"
+
+
+def test_build_employees_checks_passwords_first():
+    with patch.object(password_hashing, "hash_passwords") as mock_hash_passwords:
+        with pytest.raises(ValueError, match="User_1@email.com : Le mot de passe doit contenir au moins 8 caractères"):
+            password_hashing.build_employees([user(0), user(1, "Court1")])
+
+    mock_hash_passwords.assert_not_called()
+
+
+def test_plain_password_is_still_hashed():
+    employee = Employee(PasswordHash="Password123")
+
+    assert employee.PasswordHash.startswith("$2")
+    assert type(employee.PasswordHash) is str
+    assert employee.verify_password("Password123")
@@ -0,0 +1,84 @@
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.models.query_stats import NO_ACTION, QueryStats
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+class TestQueryStats:
+
+    def test_statements_attributed_to_action(self, engine):
+        query_stats = QueryStats()
+        query_stats.attach(engine)
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with query_stats.action("Liste des clients"):
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+            with query_stats.action("Liste des clients"):
+                connection.execute(text("SELECT 3"))
+
+        rows = {row["action"]: row for row in query_stats.summary()}
+        assert rows["Liste des clients"]["calls"] == 2
+        assert rows["Liste des clients"]["statements"] == 3
+        assert rows["Liste des clients"]["statements_per_call"] == 1.5
+        assert sum(rows["Liste des clients"]["buckets"]) == 3
+        assert rows[NO_ACTION]["statements"] == 1
+
+    def test_slow_queries_logged(self, engine):
+        slow_logger = Mock()
+        query_stats = QueryStats(slow_logger, slow_threshold_ms=0.000001)
+        query_stats.attach(engine)
+
+        with engine.connect() as connection, query_stats.action("Modifier un contrat"):
+            connection.execute(text("SELECT\n    1"))
+
+        message = slow_logger.warning.call_args[0][0]
+        assert message.endswith("[Modifier un contrat] SELECT 1")
+
+    def test_failed_statement_and_detach(self, engine):
+        query_stats = QueryStats()
+        query_stats.attach(engine)
+
+        with engine.connect() as connection:
+            with pytest.raises(Exception):
+                connection.execute(text("SELECT * FROM inconnue"))
+            assert connection.info["query_stats_start"] == []
+
+            query_stats.detach(engine)
+            connection.execute(text("SELECT 1"))
+
+        assert query_stats.summary() == []
+
+    def test_log_summary_resets(self, engine):
+        query_stats = QueryStats()
+        query_stats.attach(engine)
+        logger = Mock()
+        with engine.connect() as connection, query_stats.action("Liste des contrats"):
+            connection.execute(text("SELECT 1"))
+
+        query_stats.log_summary(logger)
+        query_stats.log_summary(logger)
+
+        logger.info.assert_called_once()
+        assert "Liste des contrats : 1 exécution(s), 1 requête(s)" in logger.info.call_args[0][0]
+
+    def test_log_summary_to_slow_logger(self, engine):
+        slow_logger = Mock()
+        query_stats = QueryStats(slow_logger)
+        query_stats.attach(engine)
+        with engine.connect() as connection, query_stats.action("Liste des contrats"):
+            connection.execute(text("SELECT 1"))
+
+        query_stats.log_summary()
+
+        assert "Liste des contrats" in slow_logger.info.call_args[0][0]
@@ -4,9 +4,10 @@ from unittest.mock import Mock, patch
 import pytest
 
 from app.controllers.role_manage import RoleManage
-from app.controllers.utils_manage import UtilsManage
+from app.controllers.utils_manage import OperResult, UtilsManage
 from app.models.employee import Employee
 from app.models.role import Role
+from app.permissions.role_cache import RoleCache
 from app.views.views import View
 
 
@@ -177,8 +178,10 @@ class TestRoleManage:
             "1",
             "1",
         ]
-        self.mock_valid_id.return_value = Mock()
+        self.mock_valid_id.return_value = Mock(Revision=1)
         self.mock_confirm_table_recap.return_value = True
+        self.mock_valid_oper.return_value = OperResult.SUCCESS
+        generation = RoleCache.generation
 
         # Act
         self.role_manage.update()
@@ -186,6 +189,18 @@ class TestRoleManage:
         # Assert
         self.mock_display_title_panel_color_fit.assert_called_with("Modification d'un role", "yellow", True)
         self.mock_valid_oper.called_once()
+        assert RoleCache.generation == generation + 1
+
+    @pytest.mark.parametrize("result", [OperResult.FAILED, OperResult.STALE])
+    def test_update_not_written_keeps_cache(self, result):
+        self.mock_return_choice.side_effect = [str(self.test_role.Id), "New"] + ["1"] * 16
+        self.mock_valid_id.return_value = Mock(Revision=1)
+        self.mock_valid_oper.return_value = result
+        generation = RoleCache.generation
+
+        self.role_manage.update()
+
+        assert RoleCache.generation == generation
 
     def test_update_cancelled_due_to_empty_id(self):
 
@@ -238,6 +253,8 @@ class TestRoleManage:
 
         # Arrang
         self.mock_valid_id.return_value = Mock()
+        self.mock_valid_oper.return_value = OperResult.SUCCESS
+        generation = RoleCache.generation
 
         # Act
         self.role_manage.delete()
@@ -245,6 +262,16 @@ class TestRoleManage:
         # Assert
         self.mock_display_title_panel_color_fit.assert_called_with("Suppression d'un role", "red")
         self.mock_valid_oper.called_once()
+        assert RoleCache.generation == generation + 1
+
+    def test_delete_cancelled_keeps_cache(self):
+        self.mock_valid_id.return_value = Mock()
+        self.mock_valid_oper.return_value = OperResult.FAILED
+        generation = RoleCache.generation
+
+        self.role_manage.delete()
+
+        assert RoleCache.generation == generation
 
     def test_delete_cancelled_due_to_empty_id(self):
 
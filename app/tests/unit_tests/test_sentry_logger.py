@@ -1,12 +1,14 @@
 import os
 import socket
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 from sentry_sdk import capture_event, configure_scope, init
 from sentry_sdk.integrations.logging import LoggingIntegration
 
-from app.utils.sentry_logger import SentryLogger
+from app.utils.sentry_logger import SentryLogger, resolve_ip_address
 
 
 class TestSentryLogger:
@@ -40,6 +42,7 @@ class TestSentryLogger:
             expected_enable_tracing = True
 
             # Act
+            SentryLogger.initialized = False
             self.sentry_logger.__init__()
 
             # Assert
@@ -61,27 +64,131 @@ class TestSentryLogger:
     def test_sentry_event(self):
 
         # Arrang
+        SentryLogger.device_tagged = False
         mock_scope = MagicMock()
-        self.mock_configure_scope.return_value.__enter__.return_value = mock_scope
-
         hostname = socket.gethostname()
-        ip_address = socket.gethostbyname(hostname)
 
         # Act
-        self.sentry_logger.sentry_event(
-            "user@example.com", "Ceci est un test pour un message d'erreur", "error", "TEST"
-        )
+        with patch("sentry_sdk.Scope.get_global_scope", return_value=mock_scope), patch(
+            "app.utils.sentry_logger.resolve_ip_address", return_value="10.0.0.1"
+        ) as mock_resolve:
+            self.sentry_logger.sentry_event(
+                "user@example.com", "Ceci est un test pour un message d'erreur", "error", "TEST"
+            )
+            self.sentry_logger.sentry_event("user@example.com", "Deuxième message")
+            SentryLogger.flush()
 
         # Assert
+        mock_resolve.assert_called_once_with(hostname)
         mock_scope.set_tag.assert_any_call("device", hostname)
-        mock_scope.set_user.assert_called_once_with({"email": "user@example.com"})
-        mock_scope.set_tag.assert_any_call("transaction", "TEST")
-        mock_scope.set_tag.assert_any_call("ip_address", ip_address)
-
-        self.mock_capture_event.assert_called_once_with(
-            {"message": "Ceci est un test pour un message d'erreur", "level": "error"}
+        mock_scope.set_tag.assert_any_call("ip_address", "10.0.0.1")
+        assert mock_scope.set_tag.call_count == 2
+        self.mock_configure_scope.assert_not_called()
+
+        self.mock_capture_event.assert_any_call(
+            {
+                "message": "Ceci est un test pour un message d'erreur",
+                "level": "error",
+                "user": {"email": "user@example.com"},
+                "tags": {"transaction": "TEST"},
+            }
+        )
+        self.mock_capture_event.assert_any_call(
+            {"message": "Deuxième message", "level": "info", "user": {"email": "user@example.com"}}
         )
 
+    def test_resolve_ip_address_timeout(self):
+
+        # Arrang
+        with patch("socket.gethostbyname", side_effect=lambda hostname: time.sleep(1)):
+
+            # Act
+            start = time.perf_counter()
+            result = resolve_ip_address("host", timeout=0.05)
+
+        # Assert
+        assert result is None
+        assert time.perf_counter() - start < 0.5
+
+    def test_resolve_ip_address_error(self):
+
+        with patch("socket.gethostbyname", side_effect=socket.gaierror):
+            assert resolve_ip_address("host") is None
+
+    def test_sentry_init_once(self):
+
+        # Arrang
+        with patch("sentry_sdk.init") as mock_init:
+            SentryLogger.initialized = False
+
+            # Act
+            SentryLogger()
+            SentryLogger()
+
+            # Assert
+            mock_init.assert_called_once()
+
+    def test_sentry_init_background(self):
+
+        # Arrang
+        with patch("sentry_sdk.init") as mock_init:
+            SentryLogger.initialized = False
+
+            # Act
+            SentryLogger.init_sdk_background()
+            SentryLogger()
+
+            # Assert
+            mock_init.assert_called_once()
+
+    def test_sentry_event_non_blocking(self):
+
+        # Arrang
+        release = threading.Event()
+        self.mock_capture_event.side_effect = lambda event: release.wait(5)
+
+        # Act
+        start = time.perf_counter()
+        self.sentry_logger.sentry_event("user@example.com", "message 1")
+        self.sentry_logger.sentry_event("user@example.com", "message 2")
+        elapsed = time.perf_counter() - start
+        release.set()
+        SentryLogger.flush()
+
+        # Assert
+        assert elapsed < 1
+        assert self.mock_capture_event.call_count == 2
+
+    def test_flush_registered_once(self):
+
+        # Arrang
+        SentryLogger.flush()
+        SentryLogger.flush_registered = False
+
+        # Act
+        with patch("app.utils.sentry_logger.atexit.register") as mock_register:
+            SentryLogger.start_worker()
+            SentryLogger.flush()
+            SentryLogger.start_worker()
+            SentryLogger.flush()
+
+        # Assert
+        mock_register.assert_called_once_with(SentryLogger.flush)
+
+    def test_sentry_event_concurrent_flush(self):
+
+        # Arrang
+        events = SentryLogger.start_worker()
+        SentryLogger.flush()
+
+        # Act : flush concurrent entre le démarrage du thread et l'ajout à la file
+        with patch.object(SentryLogger, "start_worker", return_value=events):
+            self.sentry_logger.sentry_event("user@example.com", "message")
+
+        # Assert
+        assert SentryLogger.events is None
+        assert events.get_nowait() == ("user@example.com", "message", "info", None)
+
 
 if __name__ == "__main__":
     pytest.main(["--cov=app/utils/", "--cov-report=html", __file__])
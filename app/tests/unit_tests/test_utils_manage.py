@@ -1,5 +1,6 @@
+import os
 from datetime import datetime
-from unittest.mock import Mock
+from unittest.mock import Mock, call, patch
 
 import pytest
 from rich.table import Table
@@ -359,5 +360,75 @@ def test_str_to_bool(utils_manage):
     assert utils_manage.str_to_bool("") == False
 
 
+def test_pages(utils_manage):
+
+    rows = [Mock(Id=1), Mock(Id=2), Mock(Id=3)]
+    fetch_page = Mock(side_effect=[rows, rows[2:]])
+
+    pages = utils_manage.pages(fetch_page, page_size=2)
+
+    # aucune page n'est récupérée avant d'être demandée
+    fetch_page.assert_not_called()
+
+    assert next(pages) == (rows[:2], True)
+    fetch_page.assert_called_once_with(after_id=None, limit=3)
+
+    assert next(pages) == (rows[2:], False)
+    assert fetch_page.call_args_list[1] == call(after_id=2, limit=3)
+
+    with pytest.raises(StopIteration):
+        next(pages)
+
+
+@pytest.mark.parametrize("value, expected", [("20", 20), ("1", 1), ("0", 50), ("-2", 50), ("abc", 50)])
+def test_page_size_from_env(value, expected):
+
+    with patch.dict(os.environ, {"PAGE_SIZE": value}):
+        utils_manage = UtilsManage(Mock())
+
+    assert utils_manage.page_size == expected
+
+
+def test_pages_invalid_page_size(utils_manage):
+
+    rows = [Mock(Id=1), Mock(Id=2)]
+    fetch_page = Mock(return_value=rows)
+
+    assert list(utils_manage.pages(fetch_page, page_size=0)) == [(rows, False)]
+    fetch_page.assert_called_once_with(after_id=None, limit=UtilsManage.DEFAULT_PAGE_SIZE + 1)
+
+
+def test_display_pager_stops_fetching_on_quit(utils_manage):
+
+    rows = [Mock(Id=i) for i in range(1, 4)]
+    fetch_page = Mock(side_effect=[rows, rows[2:]])
+    utils_manage.view.display_table = Mock()
+    utils_manage.view.console.input = Mock(return_value="q")
+    utils_manage.table_create = Mock(return_value="Table")
+    utils_manage.page_size = 2
+
+    utils_manage.display_list("event", fetch_page, "Liste")
+
+    fetch_page.assert_called_once()
+    utils_manage.table_create.assert_called_once_with("event", rows[:2])
+    utils_manage.view.display_table.assert_called_once_with("Table", "Liste - page 1")
+
+
+def test_display_pager_next_page(utils_manage):
+
+    rows = [Mock(Id=i) for i in range(1, 4)]
+    fetch_page = Mock(side_effect=[rows, rows[2:]])
+    utils_manage.view.display_table = Mock()
+    utils_manage.view.console.input = Mock(return_value="")
+    utils_manage.table_create = Mock(return_value="Table")
+    utils_manage.page_size = 2
+
+    utils_manage.display_list("event", fetch_page, "Liste")
+
+    assert fetch_page.call_count == 2
+    utils_manage.view.console.input.assert_called_once()
+    utils_manage.view.display_table.assert_called_with("Table", "Liste - page 2")
+
+
 if __name__ == "__main__":
     pytest.main(["--cov=app/controllers/", "--cov-report=html", __file__])
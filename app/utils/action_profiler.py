@@ -0,0 +1,76 @@
+import os
+import re
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# dossier des profils des actions de menu
+PROFILES_DIR = Path(__file__).parent.parent / "data" / "profiles"
+
+
+def profiling_enabled(argv=None) -> bool:
+    """
+    Indique si le profilage des actions de menu est demandé ( option --profile ou variable d'environnement
+    PROFILE_ACTIONS ).
+
+    Args:
+        argv (list, optional): Les arguments de la ligne de commande.
+
+    Returns:
+        bool: True si le profilage est activé.
+    """
+
+    if argv and "--profile" in argv:
+        return True
+    return os.environ.get("PROFILE_ACTIONS", "false").lower() in ("true", "1", "oui")
+
+
+def slugify(name: str) -> str:
+    """Convertit un nom d'action en nom de fichier ( "Modifier un contrat" : "modifier_un_contrat" )."""
+
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "action"
+
+
+class ActionProfiler:
+    """
+    Profile les actions de menu avec cProfile, un fichier .prof par exécution d'action.
+
+    Le profileur n'est créé qu'en mode profilage : sans lui `MenuManage.dispatch` appelle l'action directement,
+    sans aucun coût. Les fichiers sont lisibles avec `python -m pstats fichier.prof` ou snakeviz.
+
+    Attributs:
+        directory (Path): Le dossier des fichiers de profil.
+        logger (Logger): Objet logger pour enregistrer le chemin de chaque profil.
+    """
+
+    def __init__(self, logger, directory: Path = PROFILES_DIR):
+        self.logger = logger
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def profile(self, name: str):
+        """
+        Profile le bloc et enregistre le profil dans `directory`.
+
+        Args:
+            name (str): Le nom de l'action ( élément de menu choisi ).
+        """
+
+        import cProfile  # import différé : chargé seulement en mode profilage
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            path = self.directory / f"{datetime.now():%Y%m%d-%H%M%S-%f}_{slugify(name)}.prof"
+            try:
+                profiler.dump_stats(path)
+            except OSError as e:
+                self.logger.warning(f"Profil de l'action {name} non enregistré : {e}")
+            else:
+                self.logger.info(f"Profil de l'action {name} : {path}")
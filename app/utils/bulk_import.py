@@ -0,0 +1,386 @@
+import csv
+import gzip
+import io
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import Boolean, Integer, select, true
+from sqlalchemy.exc import IntegrityError
+
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.event import Event
+
+# nombre de lignes insérées par lot ( variable d'environnement IMPORT_CHUNK_SIZE )
+DEFAULT_IMPORT_CHUNK_SIZE = 1000
+# colonnes renseignées par la base, ignorées à l'import
+SERVER_COLUMNS = ("Id", "DateCreated", "DateLastUpdate", "Version")
+# valeurs vraies des colonnes booléennes ( comme UtilsManage.str_to_bool )
+TRUE_VALUES = ("true", "1", "oui")
+# tables référencées limitées au périmètre de l'utilisateur ( voir Scopes.criterion )
+SCOPED_MODELS = {Customer.__tablename__: Customer, Contract.__tablename__: Contract}
+
+
+def import_columns(model) -> List:
+    """
+    Retourne les colonnes d'un modèle renseignées par un import, dans l'ordre de la table.
+
+    Args:
+        model (Type): La classe du modèle.
+
+    Returns:
+        List[Column]: Les colonnes, sans l'Id, les dates de création / modification et la version.
+    """
+
+    return [column for column in model.__table__.columns if column.key not in SERVER_COLUMNS]
+
+
+def open_input(path: str, compress: Optional[bool] = None) -> TextIO:
+    """
+    Ouvre un fichier d'import en lecture, décompressé si demandé ou si son nom se termine par .gz.
+
+    Args:
+        path (str): Le chemin du fichier.
+        compress (bool, optional): Fichier compressé en gzip ( par défaut, selon l'extension du fichier ).
+
+    Returns:
+        TextIO: Le fichier ouvert en mode texte.
+    """
+
+    if compress is None:
+        compress = str(path).endswith(".gz")
+    if compress:
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+class ImportReport:
+    """
+    Compte rendu d'un import.
+
+    Attributs:
+        inserted (int): Le nombre de lignes insérées.
+        errors (List[Tuple[int, str]]): Les lignes rejetées : ( numéro de ligne du fichier, message d'erreur ).
+    """
+
+    def __init__(self):
+        self.inserted = 0
+        self.errors = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.errors.append((line, message))
+
+
+class BulkImporter:
+    """
+    Importe un fichier CSV de clients, contrats ou évènements.
+
+    Le fichier est lu et validé ligne par ligne, avec les validateurs des modèles ( `Customer.validate_email`,
+    `Contract.validate_amount`, `Event.check_dates`, `Event.check_attendees` ) : une ligne invalide est ajoutée
+    au compte rendu avec son erreur, sans interrompre l'import.
+
+    Les lignes valides sont insérées par lots : une requête executemany par lot ( COPY sur PostgreSQL ), suivie
+    d'une validation de la transaction. Un lot refusé par la base ( email ou titre déjà utilisé ... ) est
+    inséré à nouveau ligne par ligne pour ne rejeter que les lignes en erreur.
+
+    Le fichier a le format de l'export CSV ( ligne d'en-tête avec les noms des colonnes, une valeur vide
+    correspondant à NULL ), les dates des évènements étant au format jj-mm-aaaa comme dans les menus.
+
+    Avec le périmètre de l'utilisateur ( `scopes` ), les mêmes règles que dans les menus s'appliquent : les clients
+    et contrats référencés doivent appartenir à son périmètre, les évènements ne concernent que des contrats signés
+    et le support d'un évènement ne peut être affecté que par un rôle ayant ce droit.
+
+    Attributs:
+        session (Session): La session SQLAlchemy.
+        model (Type): La classe du modèle ( Customer, Contract ou Event ).
+        chunk_size (int): Le nombre de lignes insérées par lot.
+        defaults (dict): Les valeurs des colonnes absentes ou vides ( ex : { "CommercialId": 3 } ).
+        use_copy (bool): Insertion par COPY ( PostgreSQL seulement ).
+        scopes (Scopes): Le périmètre de l'utilisateur ( None : aucune restriction ).
+        overrides (dict): Les valeurs imposées, quelles que soient celles du fichier.
+        report (ImportReport): Le compte rendu de l'import.
+    """
+
+    def __init__(
+        self,
+        session,
+        model,
+        chunk_size: Optional[int] = None,
+        defaults: Optional[dict] = None,
+        use_copy=None,
+        scopes=None,
+        overrides: Optional[dict] = None,
+    ):
+        self.session = session
+        self.model = model
+        self.chunk_size = (
+            chunk_size
+            if chunk_size is not None
+            else int(os.environ.get("IMPORT_CHUNK_SIZE", DEFAULT_IMPORT_CHUNK_SIZE))
+        )
+        if self.chunk_size < 1:
+            raise ValueError("La taille des lots doit être positive.")
+        self.defaults = defaults or {}
+        self.columns = import_columns(model)
+        if use_copy is None:
+            use_copy = session.get_bind().dialect.name == "postgresql"
+        self.use_copy = use_copy
+        self.scopes = scopes
+        self.overrides = overrides or {}
+        self.report = ImportReport()
+
+    def run(self, stream: TextIO) -> ImportReport:
+        """
+        Importe un fichier CSV.
+
+        Args:
+            stream (TextIO): Le fichier ouvert en lecture ( voir `open_input` ).
+
+        Returns:
+            ImportReport: Le compte rendu de l'import.
+
+        Raises:
+            ValueError: Si la ligne d'en-tête contient des colonnes inconnues.
+        """
+
+        reader = csv.DictReader(stream)
+        self.check_header(reader.fieldnames or [])
+
+        for chunk in self.chunks(self.validate(reader)):
+            chunk = self.check_references(chunk)
+            if chunk:
+                self.insert(chunk)
+        return self.report
+
+    def check_header(self, fieldnames: List[str]) -> None:
+        """
+        Vérifie les colonnes de la ligne d'en-tête ( les colonnes renseignées par la base sont acceptées et ignorées ).
+
+        Raises:
+            ValueError: Si une colonne n'existe pas dans le modèle.
+        """
+
+        known = set(self.model.__table__.columns.keys())
+        unknown = [name for name in fieldnames if name not in known]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues : {', '.join(unknown)}")
+
+    def validate(self, reader: csv.DictReader) -> Iterator[Tuple[int, Dict]]:
+        """
+        Valide les lignes au fur et à mesure de leur lecture, les lignes invalides étant ajoutées au compte rendu.
+
+        Args:
+            reader (csv.DictReader): Le lecteur du fichier.
+
+        Yields:
+            Tuple[int, dict]: Le numéro de ligne du fichier et les valeurs de la ligne valide.
+        """
+
+        for row in reader:
+            try:
+                values = self.parse_row(row)
+            except ValueError as e:
+                self.report.add_error(reader.line_num, str(e))
+            else:
+                yield reader.line_num, values
+
+    def parse_row(self, row: Dict[str, str]) -> Dict:
+        """
+        Convertit et valide une ligne du fichier.
+
+        Les valeurs sont affectées à une instance du modèle non ajoutée à la session : les validateurs du modèle
+        ( @validates ) sont appliqués comme lors d'une création par les menus.
+
+        Args:
+            row (dict): Les valeurs texte de la ligne.
+
+        Returns:
+            dict: Les valeurs de toutes les colonnes importées, prêtes à être insérées.
+
+        Raises:
+            ValueError: Si une valeur est invalide, si une colonne obligatoire est vide ou si l'utilisateur n'a pas
+                le droit d'affecter le support d'un évènement.
+        """
+
+        instance = self.model()
+        values = {}
+
+        for column in self.columns:
+            key = column.key
+            value = (row.get(key) or "").strip() or None
+            if key in self.overrides:
+                value = self.overrides[key]
+
+            if value is None:
+                value = self.defaults.get(key)
+            elif isinstance(column.type, Boolean):
+                value = value.lower() in TRUE_VALUES
+            elif isinstance(column.type, Integer):
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise ValueError(f"{key} doit être un nombre valide.")
+
+            if value is None:
+                if not column.nullable:
+                    raise ValueError(f"{key} est obligatoire.")
+                # valeur par défaut du modèle ( toutes les lignes d'un lot ont les mêmes colonnes )
+                if column.default is not None and column.default.is_scalar:
+                    value = column.default.arg
+            else:
+                # validateurs du modèle ( dans l'ordre des colonnes : DateStart avant DateEnd )
+                setattr(instance, key, value)
+                value = getattr(instance, key)
+
+            values[key] = value
+
+        if values.get("AmountOutstanding") is not None:
+            # même vérification que la création d'un contrat par les menus
+            self.model.validate_amount(instance, "amount", values["Amount"] or 0)
+            self.model.validate_amount(instance, "amount_outstanding", values["AmountOutstanding"])
+
+        if (
+            self.scopes is not None
+            and values.get("EmployeeSupportId") is not None
+            and not self.scopes.permissions.can_access_support(self.scopes.role)
+        ):
+            raise ValueError("EmployeeSupportId : vous n'avez pas le droit d'affecter le support d'un évènement.")
+
+        return values
+
+    def chunks(self, rows: Iterable[Tuple[int, Dict]]) -> Iterator[List[Tuple[int, Dict]]]:
+        """Regroupe les lignes validées par lots de `chunk_size` lignes."""
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def check_references(self, chunk: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict]]:
+        """
+        Rejette les lignes d'un lot dont une clé étrangère ne correspond à aucun élément de la base, ou à un
+        élément hors du périmètre de l'utilisateur ( client ou contrat d'un autre commercial, contrat non signé
+        pour un évènement ).
+
+        Une seule requête par clé étrangère est faite pour tout le lot, deux avec un périmètre.
+
+        Args:
+            chunk (List[Tuple[int, dict]]): Le lot de lignes validées.
+
+        Returns:
+            List[Tuple[int, dict]]: Les lignes du lot dont les références existent et sont autorisées.
+        """
+
+        for column in self.columns:
+            for foreign_key in column.foreign_keys:
+                ids = {values[column.key] for _, values in chunk if values[column.key] is not None}
+                if not ids:
+                    continue
+                target = foreign_key.column
+                existing = set(self.session.scalars(select(target).where(target.in_(ids))))
+                allowed = self.allowed_references(target, existing)
+
+                valid = []
+                for line, values in chunk:
+                    value = values[column.key]
+                    if value is not None and value not in existing:
+                        self.report.add_error(line, f"{column.key} : aucun élément {target.table.name} d'Id {value}.")
+                    elif value is not None and value not in allowed:
+                        self.report.add_error(
+                            line, f"{column.key} : élément {target.table.name} d'Id {value} non autorisé."
+                        )
+                    else:
+                        valid.append((line, values))
+                chunk = valid
+        return chunk
+
+    def allowed_references(self, target, ids: set) -> set:
+        """
+        Retourne les identifiants référencés autorisés pour l'utilisateur.
+
+        Args:
+            target (Column): La colonne référencée ( clé primaire de la table cible ).
+            ids (set): Les identifiants existants.
+
+        Returns:
+            set: Les identifiants du périmètre de l'utilisateur ( tous sans périmètre ou pour une table non limitée ).
+        """
+
+        model = SCOPED_MODELS.get(target.table.name)
+        if self.scopes is None or model is None or not ids:
+            return ids
+
+        query = select(target).where(target.in_(ids))
+        criterion = self.scopes.criterion(model)
+        if criterion is not None:
+            query = query.where(criterion)
+        if self.model is Event and model is Contract:
+            # comme EventManage.get_permissions_contracts_signed
+            query = query.where(Contract.ContractSigned == true())
+        return set(self.session.scalars(query))
+
+    def insert(self, chunk: List[Tuple[int, Dict]]) -> None:
+        """
+        Insère un lot de lignes et valide la transaction.
+
+        Si la base refuse le lot ( contrainte d'unicité ... ), ses lignes sont insérées une à une dans des points
+        de sauvegarde : seules les lignes refusées sont ajoutées au compte rendu.
+
+        Args:
+            chunk (List[Tuple[int, dict]]): Le lot de lignes validées.
+        """
+
+        try:
+            with self.session.begin_nested():
+                self.write([values for _, values in chunk])
+        except IntegrityError:
+            for line, values in chunk:
+                try:
+                    with self.session.begin_nested():
+                        self.session.execute(self.model.__table__.insert(), [values])
+                except IntegrityError as e:
+                    self.report.add_error(line, str(e.orig).splitlines()[0])
+                else:
+                    self.report.inserted += 1
+        else:
+            self.report.inserted += len(chunk)
+        self.session.commit()
+
+    def write(self, rows: List[Dict]) -> None:
+        """Insère des lignes en une requête : COPY sur PostgreSQL, executemany sinon."""
+
+        if self.use_copy:
+            self.copy(rows)
+        else:
+            self.session.execute(self.model.__table__.insert(), rows)
+
+    def copy(self, rows: List[Dict]) -> None:
+        """
+        Insère des lignes avec COPY ... FROM STDIN ( psycopg2 ), les lignes étant transmises au format CSV.
+
+        Args:
+            rows (List[dict]): Les valeurs des lignes.
+        """
+
+        connection = self.session.connection()
+        quote = connection.dialect.identifier_preparer.quote
+        keys = [column.key for column in self.columns]
+
+        buffer = io.StringIO()
+        # valeur vide non entre guillemets : NULL
+        csv.writer(buffer).writerows([values[key] for key in keys] for values in rows)
+        buffer.seek(0)
+
+        statement = (
+            f"COPY {quote(self.model.__table__.name)} ({', '.join(quote(column.name) for column in self.columns)}) "
+            "FROM STDIN WITH (FORMAT csv)"
+        )
+        try:
+            with connection.connection.cursor() as cursor:
+                cursor.copy_expert(statement, buffer)
+        except connection.dialect.loaded_dbapi.IntegrityError as e:
+            raise IntegrityError(statement, None, e)
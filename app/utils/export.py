@@ -0,0 +1,162 @@
+import csv
+import gzip
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from sqlalchemy import select
+
+# formats d'écriture des lignes
+FORMATS = ("jsonl", "csv")
+# nombre de lignes lues par lot ( curseur côté serveur )
+CHUNK_SIZE = 1000
+
+
+def model_columns(model) -> List[str]:
+    """
+    Retourne les noms des colonnes d'un modèle, dans l'ordre de la table.
+
+    Args:
+        model (Type): La classe du modèle.
+
+    Returns:
+        List[str]: Les noms des attributs des colonnes.
+    """
+
+    return [column.key for column in model.__table__.columns]
+
+
+def model_select(model, *criteria):
+    """
+    Construit la requête des colonnes d'un modèle, triée par Id.
+
+    Les lignes lues sont de simples tuples : aucune instance n'est créée ni conservée par la session,
+    la mémoire utilisée ne dépend pas du nombre de lignes.
+
+    Args:
+        model (Type): La classe du modèle.
+        *criteria: Les critères de filtrage ( None est ignoré, voir `Scopes.criterion` ).
+
+    Returns:
+        Select: La requête.
+    """
+
+    statement = select(*model.__table__.columns)
+    for criterion in criteria:
+        if criterion is not None:
+            statement = statement.where(criterion)
+    return statement.order_by(model.Id)
+
+
+def stream_chunks(session, statement, chunk_size: int = CHUNK_SIZE) -> Iterator[List[tuple]]:
+    """
+    Exécute une requête avec un curseur côté serveur et retourne ses lignes lot par lot.
+
+    Args:
+        session (Session): La session SQLAlchemy.
+        statement (Select): La requête ( voir `model_select` ).
+        chunk_size (int, optional): Le nombre de lignes lues par lot. Par défaut CHUNK_SIZE.
+
+    Yields:
+        List[tuple]: Un lot de lignes, les valeurs étant dans l'ordre des colonnes de la requête.
+    """
+
+    result = session.execute(statement, execution_options={"stream_results": True, "yield_per": chunk_size})
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def open_output(path: str, compress: Optional[bool] = None) -> TextIO:
+    """
+    Ouvre un fichier d'export en écriture, compressé en gzip si demandé ou si son nom se termine par .gz.
+
+    Args:
+        path (str): Le chemin du fichier.
+        compress (bool, optional): Compression gzip ( par défaut, selon l'extension du fichier ).
+
+    Returns:
+        TextIO: Le fichier ouvert en mode texte.
+    """
+
+    if compress is None:
+        compress = str(path).endswith(".gz")
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def export_model(session, model, scopes, path: str, fmt: str = "csv", compress: Optional[bool] = None) -> int:
+    """
+    Exporte dans un fichier les éléments d'un modèle accessibles par l'utilisateur.
+
+    Les éléments sont limités au périmètre de l'utilisateur ( mêmes critères que `get_permissions_contracts`,
+    `get_permissions_events` ... ) et écrits au fur et à mesure de leur lecture, par lots.
+
+    Args:
+        session (Session): La session SQLAlchemy.
+        model (Type): La classe du modèle ( Customer, Contract ou Event ).
+        scopes (Scopes): Le périmètre de l'utilisateur.
+        path (str): Le chemin du fichier.
+        fmt (str, optional): "csv" ou "jsonl". Par défaut "csv".
+        compress (bool, optional): Compression gzip ( par défaut, selon l'extension du fichier ).
+
+    Returns:
+        int: Le nombre de lignes exportées.
+    """
+
+    chunks = stream_chunks(session, model_select(model, scopes.criterion(model)))
+    with open_output(path, compress) as stream:
+        return write_chunks(chunks, stream, model_columns(model), fmt)
+
+
+def json_default(value):
+    """Sérialise les valeurs non gérées par json : les dates sont écrites au format ISO 8601."""
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def write_chunks(chunks: Iterable[List[tuple]], stream: TextIO, columns: List[str], fmt: str = "jsonl") -> int:
+    """
+    Écrit des lots de lignes au fur et à mesure de leur lecture, en JSON lines ou en CSV ( avec une ligne d'en-tête ).
+
+    En CSV les valeurs sont écrites sous leur forme texte ( dates "aaaa-mm-jj hh:mm:ss", comme la sortie texte
+    de PostgreSQL ), une ligne vide correspondant à NULL.
+
+    Args:
+        chunks (Iterable[List[tuple]]): Les lots de lignes, les valeurs étant dans l'ordre des colonnes.
+        stream (TextIO): Le flux de sortie.
+        columns (List[str]): Les noms des colonnes.
+        fmt (str, optional): "jsonl" ou "csv". Par défaut "jsonl".
+
+    Returns:
+        int: Le nombre de lignes écrites.
+
+    Raises:
+        ValueError: Si le format n'est pas connu.
+    """
+
+    if fmt == "jsonl":
+
+        def write(chunk):
+            stream.writelines(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=json_default) + "\n" for row in chunk
+            )
+
+    elif fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        write = writer.writerows
+
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    count = 0
+    for chunk in chunks:
+        write(chunk)
+        count += len(chunk)
+    return count
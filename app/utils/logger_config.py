@@ -1,30 +1,94 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 import colorlog
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """Formatter écrivant chaque message de log sur une ligne JSON ( format JSON lines )."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
 class LoggerConfig:
     """Configuration de logger pour l'application"""
 
-    def __init__(self, name=__name__, log_file="epic_events.log", max_bytes=1000000, backup_count=3):
+    def __init__(
+        self,
+        name=__name__,
+        log_file="epic_events.log",
+        max_bytes=1000000,
+        backup_count=3,
+        use_queue=None,
+        log_format=None,
+        console=True,
+    ):
         """
         Initialise la configuration du logger.
 
+        La configuration est idempotente : si le logger a déjà été configuré ( LoggerConfig construit plusieurs fois ),
+        les handlers ne sont pas ajoutés une seconde fois.
+
+        En mode file d'attente, le logger n'a qu'un QueueHandler : les écritures console et fichier ( et la rotation )
+        sont faites par le thread d'un QueueListener, l'appel de log ne fait que placer le message dans la file. Les
+        messages console peuvent alors s'afficher après la suite des menus : le mode est réservé aux exécutions sans
+        saisie ( commande `epic-events`, tests de charge ).
+
         :param name: Nom du logger (par défaut, le nom du module actuel).
         :param log_file: Nom du fichier de log (par défaut, 'epic_events.log').
         :param max_bytes: Taille maximale du fichier de log avant rotation (par défaut, 1000000).
         :param backup_count: Nombre de fichiers de sauvegarde à conserver (par défaut, 3).
+        :param use_queue: Active le mode file d'attente (par défaut, variable d'environnement LOG_QUEUE, sinon False).
+        :param log_format: Format du fichier de log, 'text' ou 'jsonl'
+            (par défaut, variable d'environnement LOG_FORMAT, sinon 'text').
+        :param console: Affiche aussi les messages sur la console (par défaut, True). Sans console, le logger
+            n'écrit que dans son fichier : les messages ne sont pas transmis aux loggers parents et le gestionnaire
+            d'exceptions global n'est pas remplacé.
         """
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
+        self.listener = None
+
+        if use_queue is None:
+            use_queue = os.environ.get("LOG_QUEUE", "false").lower() in ("true", "1", "oui")
+        if log_format is None:
+            log_format = os.environ.get("LOG_FORMAT", "text")
+
+        if console:
+            # Ajouter un gestionnaire d'exceptions global
+            sys.excepthook = self.handle_exception
+        else:
+            self.logger.propagate = False
+
+        # Logger déjà configuré
+        if any(getattr(handler, "epic_events", False) for handler in self.logger.handlers):
+            return
 
         # Créer un formatter pour définir le format des messages de log
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%d-%m-%Y %H:%M:%S"
-        )
+        if log_format == "jsonl":
+            formatter = JsonLinesFormatter()
+        else:
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%d-%m-%Y %H:%M:%S"
+            )
 
         # Créer un formatter coloré pour les messages de log sur la console
         color_formatter = colorlog.ColoredFormatter(
@@ -50,12 +114,28 @@ class LoggerConfig:
         file_handler.setLevel(logging.DEBUG)  # Tous les messages de log seront écrits dans le fichier
         file_handler.setFormatter(formatter)  # Appliquer le formatter au handler
 
-        # Ajouter les handlers au logger
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
-
-        # Ajouter un gestionnaire d'exceptions global
-        sys.excepthook = self.handle_exception
+        handlers = [console_handler, file_handler] if console else [file_handler]
+
+        if use_queue:
+            # Les handlers sont exécutés par le thread du listener
+            log_queue = queue.SimpleQueue()
+            queue_handler = QueueHandler(log_queue)
+            queue_handler.epic_events = True
+            self.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            self.listener.start()
+            atexit.register(self.stop)
+            self.logger.addHandler(queue_handler)
+        else:
+            # Ajouter les handlers au logger
+            for handler in handlers:
+                handler.epic_events = True
+                self.logger.addHandler(handler)
+
+    def stop(self):
+        """Arrête le thread du mode file d'attente après l'écriture des messages en attente."""
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
 
     def handle_exception(self, exc_type, exc_value, exc_traceback):
         """Gestionnaire d'exceptions global qui enregistre toutes les exceptions non gérées."""
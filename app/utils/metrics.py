@@ -0,0 +1,325 @@
+"""
+Métriques de l'application au format texte de Prometheus.
+
+Les compteurs et histogrammes sont enregistrés en mémoire dans le registre REGISTRY ( quelques opérations sur un
+dictionnaire par mesure ). Ils peuvent être lus par Prometheus sur un point d'accès HTTP local ( METRICS_PORT ) ou
+écrits dans un fichier pour le collecteur textfile de node_exporter ( METRICS_TEXTFILE ).
+"""
+
+import atexit
+import math
+import os
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# bornes des histogrammes de durée, en secondes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+DEFAULT_FLUSH_INTERVAL = 15
+
+
+def format_value(value: float) -> str:
+    """Formate une valeur ( entiers sans décimales, infini "+Inf" )."""
+
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value) -> str:
+    """Échappe la valeur d'une étiquette ( barre oblique inverse, guillemet, saut de ligne )."""
+
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Formate les étiquettes d'un échantillon ( {model="customer",operation="create"} )."""
+
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """
+    Compteur par combinaison d'étiquettes.
+
+    Attributs:
+        name (str): Le nom de la métrique.
+        documentation (str): La description de la métrique ( ligne HELP ).
+        labelnames (tuple): Les noms des étiquettes.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        """Incrémente le compteur des étiquettes données ( valeurs dans l'ordre de `labelnames` )."""
+
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self.values.get(labels, 0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self.lock:
+            return [
+                (self.name, format_labels(self.labelnames, labels), value) for labels, value in self.values.items()
+            ]
+
+
+class Histogram:
+    """
+    Histogramme ( nombre d'observations par borne, somme et nombre ) par combinaison d'étiquettes.
+
+    Attributs:
+        name (str): Le nom de la métrique.
+        documentation (str): La description de la métrique ( ligne HELP ).
+        labelnames (tuple): Les noms des étiquettes.
+        buckets (tuple): Les bornes supérieures des classes, la dernière étant l'infini.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS)
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        # étiquettes : [ observations par classe, somme ]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        """Enregistre une observation pour les étiquettes données."""
+
+        index = next(index for index, bound in enumerate(self.buckets) if value <= bound)
+        with self.lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * len(self.buckets), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, *labels) -> int:
+        entry = self.values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        with self.lock:
+            for labels, (counts, total) in self.values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    bucket_labels = format_labels(self.labelnames + ("le",), labels + (format_value(bound),))
+                    samples.append((f"{self.name}_bucket", bucket_labels, cumulative))
+                samples.append((f"{self.name}_sum", format_labels(self.labelnames, labels), total))
+                samples.append((f"{self.name}_count", format_labels(self.labelnames, labels), cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques de l'application.
+
+    Les collecteurs sont des fonctions appelées à chaque lecture des métriques pour des valeurs instantanées
+    ( état du pool de connexions ... ). Ils retournent une liste de
+    ( nom, type, description, [ ( { étiquette: valeur }, valeur ) ] ).
+
+    Attributs:
+        metrics (list): Les compteurs et histogrammes.
+        collectors (list): Les collecteurs.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+        self.server = None
+        self.flusher = None
+        self.stopped = threading.Event()
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = None
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], list]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Retourne toutes les métriques au format texte de Prometheus ( version 0.0.4 ).
+
+        Returns:
+            str: Les lignes HELP, TYPE et les échantillons de chaque métrique.
+        """
+
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{name}{labels} {format_value(value)}" for name, labels, value in metric.samples())
+
+        for collector in self.collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(
+                    f"{name}{format_labels(labels.keys(), labels.values())} {format_value(value)}"
+                    for labels, value in samples
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Écrit les métriques dans un fichier ( collecteur textfile de node_exporter ).
+
+        Le fichier est écrit sous un nom temporaire puis renommé : il n'est jamais lu à moitié écrit.
+
+        Args:
+            path (str): Le chemin du fichier ( extension .prom ).
+        """
+
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """
+        Démarre le point d'accès HTTP des métriques ( GET /metrics ) dans un thread.
+
+        Args:
+            port (int): Le port ( 0 : port libre choisi par le système ).
+            host (str, optional): L'adresse d'écoute, locale par défaut.
+
+        Returns:
+            ThreadingHTTPServer: Le serveur ( `server_address` donne le port utilisé ).
+        """
+
+        # import différé : chargé seulement si le point d'accès est activé
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # pas d'écriture sur la console de l'application à chaque lecture
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+        return self.server
+
+    def start_textfile(self, path: str, interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """
+        Écrit les métriques dans un fichier toutes les `interval` secondes et à la fin du programme.
+
+        Args:
+            path (str): Le chemin du fichier.
+            interval (float, optional): Délai en secondes entre deux écritures.
+        """
+
+        def run():
+            while not self.stopped.wait(interval):
+                self.write_textfile(path)
+
+        self.flusher = threading.Thread(target=run, name="metrics-textfile", daemon=True)
+        self.flusher.start()
+        atexit.register(self.write_textfile, path)
+
+    def stop(self) -> None:
+        """Arrête le point d'accès HTTP et l'écriture périodique du fichier."""
+
+        self.stopped.set()
+        server, self.server = self.server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+def start_exporter(logger, registry: Optional[MetricsRegistry] = None) -> None:
+    """
+    Démarre l'export des métriques selon les variables d'environnement.
+
+    - METRICS_PORT : port du point d'accès HTTP local http://127.0.0.1:<port>/metrics ( 0 : désactivé ).
+    - METRICS_TEXTFILE : fichier écrit toutes les METRICS_FLUSH_INTERVAL secondes et à la fin du programme.
+
+    Args:
+        logger (Logger): Objet logger pour enregistrer les informations.
+        registry (MetricsRegistry, optional): Le registre ( par défaut, REGISTRY ).
+    """
+
+    registry = registry or REGISTRY
+    try:
+        port = int(os.environ.get("METRICS_PORT", 0))
+        if port:
+            registry.serve(port)
+            logger.info(f"Métriques disponibles sur http://127.0.0.1:{port}/metrics")
+
+        path = os.environ.get("METRICS_TEXTFILE", "")
+        if path:
+            registry.start_textfile(path, float(os.environ.get("METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)))
+            logger.info(f"Métriques écrites dans {path}")
+    except (OSError, ValueError) as e:
+        logger.error(f"Export des métriques impossible : {e}")
+
+
+# registre et métriques de l'application
+REGISTRY = MetricsRegistry()
+
+OPERATIONS = REGISTRY.counter(
+    "epic_events_operations_total",
+    "Créations, modifications et suppressions par modèle, opération et résultat.",
+    ("model", "operation", "result"),
+)
+OPERATION_DURATION = REGISTRY.histogram(
+    "epic_events_operation_duration_seconds",
+    "Durée de l'écriture en base d'une opération confirmée ( hors saisie ).",
+    ("model", "operation"),
+)
+LOGIN_ATTEMPTS = REGISTRY.counter(
+    "epic_events_login_attempts_total",
+    "Tentatives de connexion par résultat ( success, failure, error ).",
+    ("result",),
+)
+LOGIN_DURATION = REGISTRY.histogram(
+    "epic_events_login_duration_seconds", "Durée de l'authentification ( vérification du mot de passe comprise )."
+)
+TOKEN_VALIDATIONS = REGISTRY.counter(
+    "epic_events_token_validations_total",
+    "Vérifications du token JWT par résultat ( cached, valid, expired, invalid ).",
+    ("result",),
+)
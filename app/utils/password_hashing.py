@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+from app.models.employee import Employee, HashedPassword, check_password, hash_password
+
+# en dessous de ce nombre de mots de passe, le lancement des processus coûte plus qu'il ne rapporte
+MIN_PARALLEL_PASSWORDS = 4
+
+
+def default_workers() -> int:
+    """Nombre de processus de hachage ( variable d'environnement BCRYPT_WORKERS, par défaut le nombre de CPU )."""
+
+    return int(os.environ.get("BCRYPT_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def hash_passwords(passwords: List[str], workers: Optional[int] = None) -> List[HashedPassword]:
+    """
+    Hashe des mots de passe en parallèle dans un pool de processus.
+
+    bcrypt est volontairement coûteux en calcul ( environ 250 ms par mot de passe ) : les hashs d'une création
+    groupée sont répartis sur tous les CPU au lieu d'être calculés un à un par le validateur du modèle.
+
+    Args:
+        passwords (List[str]): Les mots de passe ( règles déjà vérifiées, voir `check_password` ).
+        workers (int, optional): Le nombre de processus ( par défaut, voir `default_workers` ).
+
+    Returns:
+        List[HashedPassword]: Les hashs, dans l'ordre des mots de passe.
+    """
+
+    workers = min(workers or default_workers(), len(passwords))
+    if workers <= 1 or len(passwords) < MIN_PARALLEL_PASSWORDS:
+        return [hash_password(password) for password in passwords]
+
+    # lots de mots de passe par processus : limite les échanges entre processus
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(hash_password, passwords, chunksize=chunksize))
+
+
+def build_employees(users: Iterable[dict], workers: Optional[int] = None) -> List[Employee]:
+    """
+    Construit des employés dont les mots de passe sont hashés en parallèle.
+
+    Les règles des mots de passe sont vérifiées avant tout calcul de hash : un mot de passe invalide
+    interrompt la création sans attendre le hachage des autres.
+
+    Args:
+        users (Iterable[dict]): Les attributs des employés, le mot de passe en clair dans "PasswordHash".
+        workers (int, optional): Le nombre de processus de hachage.
+
+    Returns:
+        List[Employee]: Les employés, non ajoutés à la session.
+
+    Raises:
+        ValueError: Si un mot de passe ne respecte pas les règles ( message préfixé par l'email de l'employé ).
+    """
+
+    users = list(users)
+    for user in users:
+        try:
+            check_password(user.get("PasswordHash"))
+        except ValueError as e:
+            raise ValueError(f"{user.get('Email')} : {e}")
+
+    hashes = hash_passwords([user["PasswordHash"] for user in users], workers)
+    return [Employee(**dict(user, PasswordHash=password_hash)) for user, password_hash in zip(users, hashes)]
@@ -1,37 +1,179 @@
+import atexit
 import logging
 import os
+import queue
 import socket
+import threading
 
-import sentry_sdk
 from dotenv import load_dotenv
-from sentry_sdk.integrations.logging import LoggingIntegration
+
+# nombre maximal d'événements en attente d'envoi ( les suivants sont ignorés )
+QUEUE_MAX_SIZE = 1000
+# durée maximale en secondes de la résolution de l'adresse IP du poste
+DEVICE_LOOKUP_TIMEOUT = 2.0
+
+
+def resolve_ip_address(hostname: str, timeout: float = DEVICE_LOOKUP_TIMEOUT):
+    """
+    Résout l'adresse IP d'un nom d'hôte, sans attendre plus de `timeout` secondes.
+
+    Args:
+        hostname (str): Le nom d'hôte.
+        timeout (float, optional): Durée maximale d'attente en secondes.
+
+    Returns:
+        str or None: L'adresse IP, None si la résolution échoue ou dépasse le délai.
+    """
+
+    result = []
+
+    def lookup():
+        try:
+            result.append(socket.gethostbyname(hostname))
+        except OSError:
+            pass
+
+    thread = threading.Thread(target=lookup, name="sentry-device-lookup", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return result[0] if result else None
 
 
 class SentryLogger:
     """
     Gestion des événements Sentry.
+
+    Le SDK Sentry est initialisé une seule fois par processus, quel que soit le nombre d'instances. Il n'est importé
+    qu'à son initialisation, qui peut être faite par un thread de fond au lancement ( `init_sdk_background` ).
+    Les événements sont placés dans une file et envoyés par un thread de fond : l'appelant n'attend pas
+    la capture de l'événement.
+
+    Attributs:
+        initialized (bool): Indique si le SDK Sentry est initialisé ( attribut de classe ).
+        events (Queue): File des événements en attente d'envoi ( attribut de classe ).
+        worker (Thread): Thread de fond envoyant les événements ( attribut de classe ).
+        device_tagged (bool): Indique si le poste ( nom et adresse IP ) est ajouté aux tags Sentry
+            ( attribut de classe ).
+        flush_registered (bool): Indique si `flush` est enregistré pour la fin du processus ( attribut de classe ).
     """
 
+    initialized = False
+    events = None
+    worker = None
+    device_tagged = False
+    flush_registered = False
+    lock = threading.Lock()
+
     def __init__(self):
         """
-        Initialise la configuration Sentry.
+        Initialise la configuration Sentry, si elle ne l'est pas déjà dans le processus.
+        """
+
+        self.init_sdk()
+
+    @classmethod
+    def init_sdk(cls) -> None:
+        """
+        Initialise le SDK Sentry une seule fois par processus.
+
+        Les taux d'échantillonnage des traces et du profilage sont lus dans les variables d'environnement
+        SENTRY_TRACES_SAMPLE_RATE et SENTRY_PROFILES_SAMPLE_RATE ( 1.0 par défaut ).
+        """
+
+        with cls.lock:
+            if cls.initialized:
+                return
+
+            # import différé : le SDK et ses intégrations ne sont pas chargés au lancement de l'application
+            import sentry_sdk
+            from sentry_sdk.integrations.logging import LoggingIntegration
+
+            load_dotenv()
+
+            sentry_sdk.init(
+                dsn=os.environ.get("SENTRY_DSN"),
+                environment=os.environ.get("ENVIRONMENT"),
+                traces_sample_rate=float(os.environ.get("SENTRY_TRACES_SAMPLE_RATE", 1.0)),
+                profiles_sample_rate=float(os.environ.get("SENTRY_PROFILES_SAMPLE_RATE", 1.0)),
+                enable_tracing=True,
+                integrations=[
+                    LoggingIntegration(
+                        level=logging.INFO,  # Capture les événements info et plus
+                        event_level=logging.WARNING,  # Envoie les erreurs comme des événements
+                    )
+                ],
+            )
+            cls.initialized = True
+
+    @classmethod
+    def init_sdk_background(cls) -> None:
+        """
+        Initialise le SDK Sentry dans un thread de fond, sans retarder l'affichage de l'écran de connexion.
+        Une instance créée pendant l'initialisation attend sa fin.
+        """
+
+        threading.Thread(target=cls.init_sdk, name="sentry-init", daemon=True).start()
+
+    @classmethod
+    def start_worker(cls) -> queue.Queue:
+        """
+        Démarre le thread de fond d'envoi des événements s'il n'est pas démarré.
+        Les événements en attente sont envoyés à la fin du processus ( voir `flush` ).
+
+        Returns:
+            Queue: La file des événements du thread de fond, lue sous le verrou : un `flush` concurrent
+                ne la remplace pas par None.
+        """
+
+        with cls.lock:
+            if cls.worker is not None and cls.worker.is_alive():
+                return cls.events
+
+            cls.events = queue.Queue(maxsize=QUEUE_MAX_SIZE)
+            cls.worker = threading.Thread(target=cls.run_worker, args=(cls.events,), name="sentry-events", daemon=True)
+            cls.worker.start()
+            if not cls.flush_registered:
+                atexit.register(cls.flush)
+                cls.flush_registered = True
+            return cls.events
+
+    @classmethod
+    def run_worker(cls, events: queue.Queue) -> None:
+        """
+        Boucle du thread de fond : envoie les événements de la file jusqu'à la réception de None.
+
+        Args:
+            events (Queue): La file des événements.
+        """
+
+        while True:
+            event = events.get()
+            try:
+                if event is None:
+                    return
+                cls.capture(*event)
+            except Exception:
+                # un échec d'envoi ne doit pas arrêter le thread
+                pass
+            finally:
+                events.task_done()
+
+    @classmethod
+    def flush(cls, timeout: float = 2.0) -> None:
+        """
+        Envoie les événements en attente et arrête le thread de fond.
+
+        Args:
+            timeout (float, optional): Durée maximale d'attente en secondes. Par défaut 2.0.
         """
 
-        load_dotenv()
+        with cls.lock:
+            worker, events = cls.worker, cls.events
+            cls.worker = cls.events = None
 
-        sentry_sdk.init(
-            dsn=os.environ.get("SENTRY_DSN"),
-            environment=os.environ.get("ENVIRONMENT"),
-            traces_sample_rate=1.0,  # Capture 100% des traces
-            profiles_sample_rate=1.0,  # Profilage à 100%
-            enable_tracing=True,
-            integrations=[
-                LoggingIntegration(
-                    level=logging.INFO,  # Capture les événements info et plus
-                    event_level=logging.WARNING,  # Envoie les erreurs comme des événements
-                )
-            ],
-        )
+        if worker is not None and worker.is_alive():
+            events.put(None)
+            worker.join(timeout)
 
     def sentry_event(
         self, user_connected_email: str, message: str, level: str = "info", transaction: str = None
@@ -39,6 +181,9 @@ class SentryLogger:
         """
         Envoie un événement à Sentry pour journaliser une action ou une information dans l'application.
 
+        L'événement est placé dans la file d'envoi et capturé par le thread de fond : la méthode retourne
+        immédiatement. Si la file est pleine, l'événement est ignoré.
+
         Args:
             user_connected_email (str): L'adresse e-mail de l'utilisateur connecté qui effectue l'action.
             message (str): Le message décrivant l'action ou l'information à journaliser.
@@ -47,27 +192,65 @@ class SentryLogger:
             level (str, optional): Le niveau de gravité de l'événement.
                 Les valeurs possibles sont 'info', 'warning', 'error' ou 'fatal'.
                 Par défaut, 'info'.
-            ip_address (str, optional): L'adresse IP de l'utilisateur.
-                Par défaut, None.
 
         Returns:
             None
         """
+
+        events = self.start_worker()
+        try:
+            events.put_nowait((user_connected_email, message, level, transaction))
+        except queue.Full:
+            pass
+
+    @classmethod
+    def tag_device(cls) -> None:
+        """
+        Ajoute le nom et l'adresse IP du poste aux tags du scope global Sentry, une seule fois par processus.
+
+        La résolution de l'adresse IP est faite au premier événement, par le thread de fond, avec un délai maximal :
+        en cas d'échec seul le nom du poste est ajouté.
+        """
+
+        if cls.device_tagged:
+            return
+
+        import sentry_sdk
+
         hostname = socket.gethostname()
-        ip_address = socket.gethostbyname(hostname)
+        ip_address = resolve_ip_address(hostname)
+
+        scope = sentry_sdk.Scope.get_global_scope()
+        scope.set_tag("device", hostname)
+        if ip_address:
+            scope.set_tag("ip_address", ip_address)
+        cls.device_tagged = True
+
+    @classmethod
+    def capture(cls, user_connected_email: str, message: str, level: str = "info", transaction: str = None) -> None:
+        """
+        Capture un événement Sentry ( exécuté par le thread de fond ).
+
+        L'utilisateur et la transaction sont portés par l'événement lui-même : le scope n'est pas modifié.
+
+        Args:
+            user_connected_email (str): L'adresse e-mail de l'utilisateur connecté qui effectue l'action.
+            message (str): Le message décrivant l'action ou l'information à journaliser.
+            level (str, optional): Le niveau de gravité de l'événement. Par défaut, 'info'.
+            transaction (str, optional): Le type de transaction associée à l'événement. Par défaut, None.
+        """
+
+        import sentry_sdk
 
-        with sentry_sdk.configure_scope() as scope:
-            scope.set_tag("device", hostname)
-            scope.set_user({"email": user_connected_email})
-            if transaction:
-                scope.set_tag("transaction", transaction)
-            if ip_address:
-                scope.set_tag("ip_address", ip_address)
+        cls.tag_device()
 
         event = {
             "message": f"{message}",
             "level": level,  # Niveau de gravité de l'événement
+            "user": {"email": user_connected_email},
         }
+        if transaction:
+            event["tags"] = {"transaction": transaction}
         sentry_sdk.capture_event(event)
 
 
@@ -75,3 +258,4 @@ class SentryLogger:
 if __name__ == "__main__":
     sentry_logger = SentryLogger()
     sentry_logger.sentry_event("user@example.com", "Ceci est un test pour un message d'erreur", "error", "TEST")
+    SentryLogger.flush()
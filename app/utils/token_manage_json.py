@@ -32,7 +32,7 @@ def load_token_from_json(file_path_arg=None):
 
     if not os.path.exists(file_path):
         token = ""
-        save_token_to_json(token)
+        save_token_to_json(token, file_path)
 
     with open(file_path, "r") as file:
         data = json.load(file)
@@ -80,6 +80,33 @@ class View:
         self.console.print("\n")
         self.console.print(panel)
 
+    def display_pager(self, pages, table_builder, title: str):
+        """
+        Affiche une liste page par page, la page suivante n'étant récupérée qu'à la demande de l'utilisateur.
+
+        Seule la page courante est conservée en mémoire : le générateur de pages n'est avancé qu'après
+        validation de l'utilisateur et il est fermé dès que l'utilisateur quitte le pager.
+
+        Args:
+            pages (Iterator[Tuple[list, bool]]): Générateur de pages et d'indicateurs de page suivante.
+            table_builder (Callable): Fonction construisant le tableau (rich Table) d'une page.
+            title (str): Le titre du panneau.
+
+        Returns:
+            None
+        """
+
+        for number, (page, has_more) in enumerate(pages, start=1):
+            page_title = f"{title} - page {number}" if has_more or number > 1 else title
+            self.display_table(table_builder(page), page_title)
+
+            if not has_more:
+                break
+
+            choice = self.console.input("[bold]\nEntrée : page suivante, q : quitter la liste [/bold]")
+            if choice.strip().lower() == "q":
+                break
+
     def display_green_message(self, message: str):
         """
         Affiche un message en vert dans la console.